@@ -1,53 +1,305 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 import asyncio
+import json
 
 from pydantic import BaseModel
-from app.models.job_models import JobSearchRequest, JobSearchResponse, JobListing
-from app.services.linkedin_service import search_linkedin_jobs
-from app.services.indeed_service import search_indeed_jobs
-from app.services.jsearch_service import search_jsearch_jobs
-from app.services.openai_service import filter_relevant_jobs
+from app.models.job_models import JobRecord, JobSearchRequest, JobSearchResponse, TokenUsage
+from app.services.providers import JobProvider, get_enabled_providers, source_weights
+from app.services.openai_service import score_jobs
+from app.services.prefilter import prefilter_jobs
+from app.services.dedup import DedupIndex, deduplicate_jobs
+from app.core.config import settings
+from app.core.metrics import count_jobs, stage
+from app.core.resilience import upstream_stats
+from app.services.score_cache import score_cache
+from app.services.provider_cache import provider_cache
+from app.services.job_index import get_job_index
+from app.services.search_sessions import SearchSession, make_cursor, parse_cursor, search_sessions
 
 router = APIRouter()
 
+async def _search_provider(provider: JobProvider, search_request: JobSearchRequest, deadline: float) -> Optional[List[JobRecord]]:
+    """
+    Run one provider search under its own deadline, capped by the request deadline.
+    Returns None if the provider missed its deadline or failed; the pending call is cancelled.
+    """
+    timeout = max(0.0, min(provider.config.timeout_seconds, deadline - asyncio.get_running_loop().time()))
+    try:
+        return await asyncio.wait_for(
+            provider.search(search_request.position, search_request.location, search_request=search_request),
+            timeout
+        )
+    except asyncio.TimeoutError:
+        print(f"{provider.source} search missed its deadline of {timeout:.1f}s")
+        return None
+    except Exception as e:
+        print(f"Error fetching {provider.source} jobs: {e}")
+        return None
+
+async def _search_live(search_request: JobSearchRequest, deadline: float) -> Tuple[List[JobRecord], List[str]]:
+    """Fetch jobs from all enabled sources concurrently; returns the jobs and the sources that failed"""
+    providers = get_enabled_providers()
+    jobs_results = await asyncio.gather(*[
+        _search_provider(provider, search_request, deadline) for provider in providers
+    ])
+    
+    all_jobs = []
+    missing_sources = []
+    for provider, jobs in zip(providers, jobs_results):
+        if jobs is None:
+            missing_sources.append(provider.source)
+            continue
+        all_jobs.extend(jobs)
+    return all_jobs, missing_sources
+
+async def _lookup_index(search_request: JobSearchRequest) -> Optional[List[JobRecord]]:
+    """Jobs from the local index if it holds a fresh copy of this search, otherwise None"""
+    if not settings.JOB_INDEX_ENABLED:
+        return None
+    with stage("index"):
+        return await get_job_index().lookup(search_request.position, search_request.location)
+
+async def _start_session(search_request: JobSearchRequest, deadline: float) -> SearchSession:
+    """Fetch, deduplicate and pre-filter jobs for a new search and keep them in a session"""
+    all_jobs = await _lookup_index(search_request)
+    from_index = all_jobs is not None
+    if from_index:
+        missing_sources = []
+    else:
+        # Fetch jobs from all enabled sources concurrently, each under its own deadline
+        all_jobs, missing_sources = await _search_live(search_request, deadline)
+    count_jobs("fetched", len(all_jobs))
+    
+    # Merge postings returned by more than one provider
+    with stage("dedup"):
+        unique_jobs = deduplicate_jobs(all_jobs)
+    count_jobs("dedup", len(unique_jobs), dropped=len(all_jobs) - len(unique_jobs))
+    
+    # A complete live search refreshes the index before scoring releases the descriptions;
+    # one with failed providers only adds its jobs
+    if settings.JOB_INDEX_ENABLED and not from_index:
+        with stage("index_write"):
+            if not missing_sources:
+                await get_job_index().record_search(search_request.position, search_request.location, unique_jobs)
+            else:
+                await get_job_index().add_jobs(unique_jobs)
+    
+    # Rank locally so pages are scored best match first; the session keeps more
+    # candidates than one page needs so later pages don't refetch
+    with stage("prefilter"):
+        candidates = prefilter_jobs(unique_jobs, search_request, top_k=settings.SEARCH_SESSION_MAX_CANDIDATES,
+                                    weights=source_weights())[:settings.SEARCH_SESSION_MAX_CANDIDATES]
+    count_jobs("prefilter", len(candidates), dropped=len(unique_jobs) - len(candidates))
+    return await search_sessions.create(search_request, candidates, missing_sources)
+
+async def _resume_session(search_request: JobSearchRequest) -> Tuple[SearchSession, int]:
+    """The session and offset a cursor points at"""
+    try:
+        session_id, offset = parse_cursor(search_request.cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session = await search_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Search session expired; start the search again without a cursor")
+    if not session.matches(search_request) or offset > len(session.served):
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this search")
+    return session, offset
+
 @router.post("/search", response_model=JobSearchResponse)
 async def search_jobs(search_request: JobSearchRequest):
     """
-    Search for jobs across multiple platforms based on the provided criteria
+    Search for jobs across multiple platforms based on the provided criteria.
+    Providers that miss their deadline are left out and named in `missing_sources`.
+    With the job index enabled, fresh searches are answered from the index instead.
+    Results come `limit` at a time; pass `next_cursor` back as `cursor` with the same
+    criteria for the next page, which is served from the search session without refetching.
     """
     try:
-        # Prepare search query from the request
-        position_query = search_request.position
-        location = search_request.location
-        
-        # Fetch jobs from all sources concurrently
-        linkedin_task = search_linkedin_jobs(position_query, location)
-        indeed_task = search_indeed_jobs(position_query, location)
-        jsearch_task = search_jsearch_jobs(position_query, location)
+        deadline = asyncio.get_running_loop().time() + settings.SEARCH_TIMEOUT_SECONDS
+        limit = min(search_request.limit or settings.SEARCH_DEFAULT_LIMIT, settings.SEARCH_MAX_LIMIT)
         
-        # Await all tasks
-        jobs_results = await asyncio.gather(
-            linkedin_task,
-            indeed_task,
-            jsearch_task
-        )
+        if search_request.cursor:
+            session, offset = await _resume_session(search_request)
+        else:
+            session, offset = await _start_session(search_request, deadline), 0
         
-        # Combine all job results
-        all_jobs = []
-        for jobs in jobs_results:
-            all_jobs.extend(jobs)
+        # Score only as many candidates as this page needs, within what is left of the budget
+        remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+        usage = TokenUsage()
+        with stage("scoring"):
+            page = await session.page(offset, limit, timeout=remaining, usage=usage)
+        await search_sessions.save(session)
+        count_jobs("limit", len(page))
         
-        # Filter for relevant jobs using OpenAI
-        relevant_jobs = await filter_relevant_jobs(all_jobs, search_request)
-        
-        # Limit to top results
-        top_results = relevant_jobs[:20]  # Limit to top 20 relevant jobs
+        next_offset = offset + len(page)
+        next_cursor = make_cursor(session.id, next_offset) if session.has_more(next_offset) else None
         
         # Convert to JobListing models
-        job_listings = [JobListing(**job) for job in top_results]
+        with stage("serialize"):
+            job_listings = [job.to_listing() for job in page]
+            response = JobSearchResponse(relevant_jobs=job_listings, missing_sources=session.missing_sources,
+                                         token_usage=usage, next_cursor=next_cursor)
         
-        return JobSearchResponse(relevant_jobs=job_listings)
+        return response
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching for jobs: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error searching for jobs: {str(e)}")
+
+async def _stream_search_events(search_request: JobSearchRequest) -> AsyncIterator[str]:
+    """
+    Yield NDJSON events for a search: one "provider" event as each source returns,
+    one "job" event per relevant job as its score arrives, and a final "results"
+    event with the top `limit` jobs in relevance order and any missing sources. A fresh
+    search in the job index is streamed as a single "Index" source.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.SEARCH_TIMEOUT_SECONDS
+
+    queue: asyncio.Queue = asyncio.Queue()
+    # All providers share one scoring concurrency cap for the request
+    semaphore = asyncio.Semaphore(max(1, settings.SCORING_MAX_CONCURRENCY))
+    missing_sources = []
+    usage = TokenUsage()
+    # Later sources can't be merged into jobs that were already streamed, so their duplicates are dropped
+    dedup_index = DedupIndex()
+    indexed_count = 0
+
+    async def fetch_and_score(provider: JobProvider):
+        nonlocal indexed_count
+        jobs = await _search_provider(provider, search_request, deadline)
+        if jobs is None:
+            missing_sources.append(provider.source)
+            await queue.put({"event": "provider", "source": provider.source, "jobs_found": 0, "missing": True})
+            return
+        if settings.JOB_INDEX_ENABLED:
+            with stage("index_write"):
+                await get_job_index().add_jobs(jobs)
+            indexed_count += len(jobs)
+        await score_source(provider.source, provider.name, jobs)
+
+    async def score_source(source: str, name: str, jobs: List[JobRecord]):
+        await queue.put({"event": "provider", "source": source, "jobs_found": len(jobs)})
+        count_jobs("fetched", len(jobs))
+        if settings.DEDUP_ENABLED:
+            with stage("dedup"):
+                unique_jobs = [job for job in jobs if dedup_index.add(job) is None]
+            count_jobs("dedup", len(unique_jobs), dropped=len(jobs) - len(unique_jobs))
+            jobs = unique_jobs
+        # Sources are pre-filtered one at a time here, each keeping up to PREFILTER_TOP_K
+        with stage("prefilter"):
+            candidates = prefilter_jobs(jobs, search_request, weights=weights)
+        count_jobs("prefilter", len(candidates), dropped=len(jobs) - len(candidates))
+        relevant = 0
+        try:
+            with stage("scoring", provider=name):
+                async for job, result in score_jobs(candidates, search_request, semaphore, usage):
+                    if result["is_relevant"]:
+                        relevant += 1
+                        await queue.put((job, result["relevance_score"]))
+        finally:
+            for job in candidates:
+                job.release_description()
+        count_jobs("scoring", relevant, dropped=len(candidates) - relevant)
+
+    weights = source_weights()
+    indexed_jobs = await _lookup_index(search_request)
+    if indexed_jobs is not None:
+        tasks = [asyncio.create_task(score_source("Index", "index", indexed_jobs))]
+    else:
+        tasks = [asyncio.create_task(fetch_and_score(provider)) for provider in get_enabled_providers()]
+
+    async def close_queue():
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Every provider answered, so the jobs added to the index make up a fresh copy of the search
+        if settings.JOB_INDEX_ENABLED and indexed_jobs is None and not missing_sources \
+                and not any(isinstance(result, BaseException) for result in results):
+            await get_job_index().mark_refreshed(search_request.position, search_request.location, indexed_count)
+        await queue.put(None)
+
+    closer = asyncio.create_task(close_queue())
+    relevant_jobs = []
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                print("Streaming search ran out of time; sending results so far")
+                break
+            if item is None:
+                break
+            if isinstance(item, dict):
+                yield json.dumps(item) + "\n"
+                continue
+
+            job, relevance_score = item
+            with stage("serialize"):
+                listing = jsonable_encoder(job.to_listing())
+            relevant_jobs.append((relevance_score, len(relevant_jobs), listing))
+            yield json.dumps({"event": "job", "relevance_score": relevance_score, "job": listing}) + "\n"
+
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                yield json.dumps({"event": "error", "detail": f"Error searching for jobs: {task.exception()}"}) + "\n"
+
+        # Highest score first, ties in arrival order
+        with stage("sort"):
+            relevant_jobs.sort(key=lambda item: (-item[0], item[1]))
+        limit = min(search_request.limit or settings.SEARCH_DEFAULT_LIMIT, settings.SEARCH_MAX_LIMIT)
+        top_results = [listing for _, _, listing in relevant_jobs[:limit]]
+        count_jobs("limit", len(top_results), dropped=len(relevant_jobs) - len(top_results))
+        yield json.dumps({
+            "event": "results",
+            "relevant_jobs": top_results,
+            "missing_sources": missing_sources,
+            "token_usage": usage.model_dump()
+        }) + "\n"
+    finally:
+        # The client may disconnect mid-stream; don't leave work running behind it
+        for task in tasks + [closer]:
+            task.cancel()
+
+@router.post("/search/stream")
+async def search_jobs_stream(search_request: JobSearchRequest):
+    """
+    Streaming variant of /search that emits newline-delimited JSON events as each
+    provider returns and each relevance score arrives, followed by the final top `limit`.
+    Every candidate is scored, so cursors are not supported here.
+    """
+    if search_request.cursor:
+        raise HTTPException(status_code=400, detail="Cursors are only supported by /search")
+    return StreamingResponse(_stream_search_events(search_request), media_type="application/x-ndjson")
+
+@router.get("/upstreams/stats")
+async def upstreams_stats():
+    """
+    Report call, retry and failure counters and the circuit breaker state per upstream API
+    """
+    return upstream_stats()
+
+@router.get("/index/stats")
+async def index_stats():
+    """
+    Report hit/miss counters and the number of jobs and fresh searches in the local job index
+    """
+    return await get_job_index().stats()
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Report hit/miss counters for the relevance score and provider response caches and
+    the search sessions, and for the embedding cache when embedding scoring is enabled
+    """
+    stats = {
+        "score_cache": score_cache.stats(),
+        "provider_cache": provider_cache.stats(),
+        "search_sessions": search_sessions.stats()
+    }
+    if settings.SCORING_MODE == "embedding":
+        from app.services.embedding_service import embedding_cache
+        stats["embedding_cache"] = embedding_cache.stats()
+    return stats
@@ -0,0 +1,63 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.resilience import upstream_stats
+from app.services.provider_cache import provider_cache
+from app.services.score_cache import score_cache
+
+router = APIRouter()
+
+def _cache_lines(caches: Dict[str, Dict[str, Any]]) -> List[str]:
+    lines = [
+        "# HELP job_finder_cache_hits_total Cache lookups answered from the cache",
+        "# TYPE job_finder_cache_hits_total counter"
+    ]
+    lines += [f'job_finder_cache_hits_total{{cache="{name}"}} {stats["hits"]}' for name, stats in caches.items()]
+    lines += [
+        "# HELP job_finder_cache_misses_total Cache lookups that went upstream",
+        "# TYPE job_finder_cache_misses_total counter"
+    ]
+    lines += [f'job_finder_cache_misses_total{{cache="{name}"}} {stats["misses"]}' for name, stats in caches.items()]
+    lines += [
+        "# HELP job_finder_cache_entries Entries currently held in memory",
+        "# TYPE job_finder_cache_entries gauge"
+    ]
+    lines += [f'job_finder_cache_entries{{cache="{name}"}} {stats["entries"]}' for name, stats in caches.items()]
+    return lines
+
+def _upstream_lines(upstreams: Dict[str, Dict[str, Any]]) -> List[str]:
+    lines = []
+    for field, kind, help_text in (
+        ("calls", "counter", "Upstream API calls, including retries"),
+        ("retries", "counter", "Upstream API calls that were retried"),
+        ("failures", "counter", "Upstream API calls that failed after retries"),
+        ("rejected", "counter", "Upstream API calls skipped because the circuit was open"),
+    ):
+        lines += [f"# HELP job_finder_upstream_{field}_total {help_text}", f"# TYPE job_finder_upstream_{field}_total {kind}"]
+        lines += [f'job_finder_upstream_{field}_total{{upstream="{name}"}} {stats[field]}' for name, stats in upstreams.items()]
+    lines += [
+        "# HELP job_finder_upstream_circuit_open Whether the upstream's circuit breaker is open (1) or not (0)",
+        "# TYPE job_finder_upstream_circuit_open gauge"
+    ]
+    lines += [
+        f'job_finder_upstream_circuit_open{{upstream="{name}"}} {int(stats["state"] == "open")}'
+        for name, stats in upstreams.items()
+    ]
+    return lines
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Stage timings, job and token counters, cache and upstream stats in the Prometheus text format
+    """
+    caches = {"score": score_cache.stats(), "provider": provider_cache.stats()}
+    if settings.SCORING_MODE == "embedding":
+        from app.services.embedding_service import embedding_cache
+        caches["embedding"] = embedding_cache.stats()
+
+    body = metrics.render() + "\n".join(_cache_lines(caches) + _upstream_lines(upstream_stats())) + "\n"
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
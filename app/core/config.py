@@ -1,4 +1,6 @@
 import os
+from typing import List
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,17 +14,210 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     RAPIDAPI_KEY: str = os.getenv("RAPIDAPI_KEY", "")
     
+    # Job providers searched on every request, in order (linkedin, indeed, jsearch, indeed_scraper)
+    ENABLED_PROVIDERS: str = os.getenv("ENABLED_PROVIDERS", "linkedin,indeed,jsearch")
+    
     # RapidAPI Host URLs
-    LINKEDIN_API_HOST: str = "linkedin-jobs-search.p.rapidapi.com"
-    INDEED_API_HOST: str = "indeed-api.p.rapidapi.com"
-    JSEARCH_API_HOST: str = "jsearch.p.rapidapi.com"
+    LINKEDIN_API_HOST: str = os.getenv("LINKEDIN_API_HOST", "linkedin-jobs-search.p.rapidapi.com")
+    INDEED_API_HOST: str = os.getenv("INDEED_API_HOST", "indeed-api.p.rapidapi.com")
+    JSEARCH_API_HOST: str = os.getenv("JSEARCH_API_HOST", "jsearch.p.rapidapi.com")
     
     # API Endpoints
-    LINKEDIN_API_URL: str = "https://linkedin-jobs-search.p.rapidapi.com/"
-    INDEED_API_URL: str = "https://indeed-api.p.rapidapi.com/search"
-    JSEARCH_API_URL: str = "https://jsearch.p.rapidapi.com/search"
+    LINKEDIN_API_URL: str = os.getenv("LINKEDIN_API_URL", "https://linkedin-jobs-search.p.rapidapi.com/")
+    INDEED_API_URL: str = os.getenv("INDEED_API_URL", "https://indeed-api.p.rapidapi.com/search")
+    JSEARCH_API_URL: str = os.getenv("JSEARCH_API_URL", "https://jsearch.p.rapidapi.com/search")
+    INDEED_SCRAPER_API_URL: str = os.getenv("INDEED_SCRAPER_API_URL", "https://pk.indeed.com")
+    
+    # Ranking weight per provider, applied to local pre-filter scores
+    LINKEDIN_WEIGHT: float = float(os.getenv("LINKEDIN_WEIGHT", "1.0"))
+    INDEED_WEIGHT: float = float(os.getenv("INDEED_WEIGHT", "1.0"))
+    JSEARCH_WEIGHT: float = float(os.getenv("JSEARCH_WEIGHT", "1.0"))
+    INDEED_SCRAPER_WEIGHT: float = float(os.getenv("INDEED_SCRAPER_WEIGHT", "1.0"))
+    
+    # Search deadlines in seconds
+    SEARCH_TIMEOUT_SECONDS: float = float(os.getenv("SEARCH_TIMEOUT_SECONDS", "30"))  # Overall budget per search request
+    PROVIDER_TIMEOUT_SECONDS: float = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "10"))  # Default per-provider deadline
+    LINKEDIN_TIMEOUT_SECONDS: float = float(os.getenv("LINKEDIN_TIMEOUT_SECONDS", str(PROVIDER_TIMEOUT_SECONDS)))
+    INDEED_TIMEOUT_SECONDS: float = float(os.getenv("INDEED_TIMEOUT_SECONDS", str(PROVIDER_TIMEOUT_SECONDS)))
+    JSEARCH_TIMEOUT_SECONDS: float = float(os.getenv("JSEARCH_TIMEOUT_SECONDS", str(PROVIDER_TIMEOUT_SECONDS)))
+    INDEED_SCRAPER_TIMEOUT_SECONDS: float = float(os.getenv("INDEED_SCRAPER_TIMEOUT_SECONDS", "60"))  # A browser is slow to start
+    
+    # Rate limits per upstream (calls per second and burst size, 0 per second for no limit)
+    RAPIDAPI_RATE_LIMIT_PER_SECOND: float = float(os.getenv("RAPIDAPI_RATE_LIMIT_PER_SECOND", "5"))
+    RAPIDAPI_RATE_LIMIT_BURST: float = float(os.getenv("RAPIDAPI_RATE_LIMIT_BURST", "10"))
+    LINKEDIN_RATE_LIMIT_PER_SECOND: float = float(os.getenv("LINKEDIN_RATE_LIMIT_PER_SECOND", str(RAPIDAPI_RATE_LIMIT_PER_SECOND)))
+    LINKEDIN_RATE_LIMIT_BURST: float = float(os.getenv("LINKEDIN_RATE_LIMIT_BURST", str(RAPIDAPI_RATE_LIMIT_BURST)))
+    INDEED_RATE_LIMIT_PER_SECOND: float = float(os.getenv("INDEED_RATE_LIMIT_PER_SECOND", str(RAPIDAPI_RATE_LIMIT_PER_SECOND)))
+    INDEED_RATE_LIMIT_BURST: float = float(os.getenv("INDEED_RATE_LIMIT_BURST", str(RAPIDAPI_RATE_LIMIT_BURST)))
+    JSEARCH_RATE_LIMIT_PER_SECOND: float = float(os.getenv("JSEARCH_RATE_LIMIT_PER_SECOND", str(RAPIDAPI_RATE_LIMIT_PER_SECOND)))
+    JSEARCH_RATE_LIMIT_BURST: float = float(os.getenv("JSEARCH_RATE_LIMIT_BURST", str(RAPIDAPI_RATE_LIMIT_BURST)))
+    INDEED_SCRAPER_RATE_LIMIT_PER_SECOND: float = float(os.getenv("INDEED_SCRAPER_RATE_LIMIT_PER_SECOND", "1"))  # Plain HTTP page fetches
+    INDEED_SCRAPER_RATE_LIMIT_BURST: float = float(os.getenv("INDEED_SCRAPER_RATE_LIMIT_BURST", "3"))
+    OPENAI_RATE_LIMIT_PER_SECOND: float = float(os.getenv("OPENAI_RATE_LIMIT_PER_SECOND", "20"))
+    OPENAI_RATE_LIMIT_BURST: float = float(os.getenv("OPENAI_RATE_LIMIT_BURST", "40"))
+    
+    # Retries with jittered exponential backoff, and circuit breakers for failing upstreams
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # Including the first call
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "8"))  # Longer Retry-After values are not waited out
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # Consecutive failures, 0 to disable
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+    
+    # Provider response cache (seconds a result page is reused, 0 disables)
+    LINKEDIN_CACHE_TTL_SECONDS: int = int(os.getenv("LINKEDIN_CACHE_TTL_SECONDS", "600"))
+    INDEED_CACHE_TTL_SECONDS: int = int(os.getenv("INDEED_CACHE_TTL_SECONDS", "600"))
+    JSEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("JSEARCH_CACHE_TTL_SECONDS", "600"))
+    INDEED_SCRAPER_CACHE_TTL_SECONDS: int = int(os.getenv("INDEED_SCRAPER_CACHE_TTL_SECONDS", "1800"))
+    PROVIDER_CACHE_MAX_ENTRIES: int = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "3000"))  # Pages, not searches
+    
+    # Indeed scraper worker pool
+    SCRAPER_CONCURRENCY: int = int(os.getenv("SCRAPER_CONCURRENCY", "4"))  # Pages scraped at once
+    SCRAPER_BROWSER_POOL_SIZE: int = int(os.getenv("SCRAPER_BROWSER_POOL_SIZE", "2"))  # Long-lived Chrome sessions
+    SCRAPER_BROWSER_WAIT_SECONDS: float = float(os.getenv("SCRAPER_BROWSER_WAIT_SECONDS", "60"))  # Longest wait for a free browser
+    SCRAPER_USE_HTTP: bool = os.getenv("SCRAPER_USE_HTTP", "true").lower() == "true"  # Try plain HTTP before a browser
+    SCRAPER_WARM_UP: bool = os.getenv("SCRAPER_WARM_UP", "true").lower() == "true"  # Start browsers at app startup
+    SCRAPER_SCROLL_PAUSE: float = float(os.getenv("SCRAPER_SCROLL_PAUSE", "0.5"))  # Seconds to wait after each scroll
+    SCRAPER_MAX_RESULTS: int = int(os.getenv("SCRAPER_MAX_RESULTS", "15"))  # Jobs kept per results page
+    
+    # Result pages fetched per provider search and how many are requested at once
+    PROVIDER_MAX_PAGES: int = int(os.getenv("PROVIDER_MAX_PAGES", "3"))
+    PROVIDER_PAGE_CONCURRENCY: int = int(os.getenv("PROVIDER_PAGE_CONCURRENCY", "2"))
+    LINKEDIN_MAX_PAGES: int = int(os.getenv("LINKEDIN_MAX_PAGES", str(PROVIDER_MAX_PAGES)))
+    INDEED_MAX_PAGES: int = int(os.getenv("INDEED_MAX_PAGES", str(PROVIDER_MAX_PAGES)))
+    JSEARCH_MAX_PAGES: int = int(os.getenv("JSEARCH_MAX_PAGES", str(PROVIDER_MAX_PAGES)))
+    LINKEDIN_PAGE_CONCURRENCY: int = int(os.getenv("LINKEDIN_PAGE_CONCURRENCY", str(PROVIDER_PAGE_CONCURRENCY)))
+    INDEED_PAGE_CONCURRENCY: int = int(os.getenv("INDEED_PAGE_CONCURRENCY", str(PROVIDER_PAGE_CONCURRENCY)))
+    JSEARCH_PAGE_CONCURRENCY: int = int(os.getenv("JSEARCH_PAGE_CONCURRENCY", str(PROVIDER_PAGE_CONCURRENCY)))
+    INDEED_SCRAPER_MAX_PAGES: int = int(os.getenv("INDEED_SCRAPER_MAX_PAGES", "1"))
+    INDEED_SCRAPER_PAGE_CONCURRENCY: int = int(os.getenv("INDEED_SCRAPER_PAGE_CONCURRENCY", "1"))
+    # Stop paging a provider once this many jobs pass the pre-filter threshold
+    PAGINATION_TARGET_CANDIDATES: int = int(os.getenv("PAGINATION_TARGET_CANDIDATES", os.getenv("PREFILTER_TOP_K", "30")))
+    
+    # Shared HTTP client for provider APIs
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # Seconds an idle connection is kept
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "15"))  # Read/write/pool timeout in seconds
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"  # Only used if the h2 package is installed
     
     # OpenAI Configuration
     OPENAI_MODEL: str = "gpt-4o"  # You can use gpt-3.5-turbo for lower cost
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")  # Empty means the official endpoint
+    
+    # Relevance scoring
+    SCORING_BATCH_SIZE: int = int(os.getenv("SCORING_BATCH_SIZE", "10"))  # Jobs per prompt
+    SCORING_MAX_CONCURRENCY: int = int(os.getenv("SCORING_MAX_CONCURRENCY", "4"))  # Batches in flight
+    PROMPT_COMPACTION_ENABLED: bool = os.getenv("PROMPT_COMPACTION_ENABLED", "true").lower() == "true"
+    PROMPT_DESCRIPTION_TOKEN_BUDGET: int = int(os.getenv("PROMPT_DESCRIPTION_TOKEN_BUDGET", "250"))  # Per job description
+    
+    # Embedding-based scoring, used instead of chat completions when SCORING_MODE is "embedding"
+    SCORING_MODE: str = os.getenv("SCORING_MODE", "chat").lower()  # chat or embedding
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "openai").lower()  # openai, or hashing for an offline fake
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))  # Texts per embeddings request
+    EMBEDDING_MIN_SIMILARITY: float = float(os.getenv("EMBEDDING_MIN_SIMILARITY", "0.3"))  # Cosine similarity needed to count as relevant
+    EMBEDDING_RERANK_TOP_N: int = int(os.getenv("EMBEDDING_RERANK_TOP_N", "0"))  # Top jobs rescored by the chat model, 0 to disable
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")  # Directory for the memory-mapped cache, empty to keep it in memory
+    EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))  # Vectors kept before the cache starts over
+    
+    # Cross-provider deduplication
+    DEDUP_ENABLED: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_MAX_DISTANCE: int = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))  # Max simhash bit difference for a fuzzy match (at most 3)
+    
+    # Local pre-filter run before LLM scoring
+    PREFILTER_ENABLED: bool = os.getenv("PREFILTER_ENABLED", "true").lower() == "true"
+    PREFILTER_TOP_K: int = int(os.getenv("PREFILTER_TOP_K", "30"))  # Max jobs sent to the LLM per search
+    PREFILTER_MIN_SCORE: float = float(os.getenv("PREFILTER_MIN_SCORE", "0"))  # Jobs at or below this are dropped
+    
+    # Salary and experience constraints checked before ranking; jobs with unknown values always pass
+    STRUCTURED_FILTER_ENABLED: bool = os.getenv("STRUCTURED_FILTER_ENABLED", "true").lower() == "true"
+    SALARY_FILTER_TOLERANCE: float = float(os.getenv("SALARY_FILTER_TOLERANCE", "0.1"))  # Share below the requested minimum still allowed
+    # Period assumed for salaries that name none (hour, day, week, month, year); empty skips comparing those
+    SALARY_DEFAULT_PERIOD: str = os.getenv("SALARY_DEFAULT_PERIOD", "")
+    EXPERIENCE_FILTER_TOLERANCE_YEARS: float = float(os.getenv("EXPERIENCE_FILTER_TOLERANCE_YEARS", "1"))  # Extra years a job may ask for
+    
+    # Instrumentation: Prometheus metrics at /metrics and an optional Server-Timing header
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+    
+    # Relevance score cache
+    SCORE_CACHE_ENABLED: bool = os.getenv("SCORE_CACHE_ENABLED", "true").lower() == "true"
+    SCORE_CACHE_MAX_ENTRIES: int = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "10000"))  # In-process LRU size
+    SCORE_CACHE_TTL_SECONDS: int = int(os.getenv("SCORE_CACHE_TTL_SECONDS", "86400"))
+    SCORE_CACHE_DB_PATH: str = os.getenv("SCORE_CACHE_DB_PATH", "")  # SQLite file for the on-disk tier, empty to disable
+
+    # State shared between workers: memory keeps caches, rate limits and search sessions in
+    # each process; sqlite shares them between the workers on one host, redis across hosts
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "memory").lower()
+    STATE_BACKEND_URL: str = os.getenv("STATE_BACKEND_URL", "redis://localhost:6379/0")
+    STATE_BACKEND_DB_PATH: str = os.getenv("STATE_BACKEND_DB_PATH", "shared_state.db")
+    STATE_KEY_PREFIX: str = os.getenv("STATE_KEY_PREFIX", "job_finder:")
+    
+    # Production server (python -m app.serve)
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", str(os.cpu_count() or 1)))
+    SERVER_LOG_LEVEL: str = os.getenv("SERVER_LOG_LEVEL", "info")
+    
+    # Paged search results: each search keeps its ranked candidates in a server-side
+    # session and only scores as many as the requested page needs
+    SEARCH_DEFAULT_LIMIT: int = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+    SEARCH_MAX_LIMIT: int = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+    SEARCH_SESSION_TTL_SECONDS: int = int(os.getenv("SEARCH_SESSION_TTL_SECONDS", "600"))
+    SEARCH_SESSION_MAX_ENTRIES: int = int(os.getenv("SEARCH_SESSION_MAX_ENTRIES", "200"))
+    SEARCH_SESSION_MAX_CANDIDATES: int = int(os.getenv("SEARCH_SESSION_MAX_CANDIDATES", "200"))  # Pre-filtered jobs kept for later pages
+
+    # Local job index (SQLite FTS5) filled by background ingestion and by live searches
+    JOB_INDEX_ENABLED: bool = os.getenv("JOB_INDEX_ENABLED", "false").lower() == "true"
+    JOB_INDEX_DB_PATH: str = os.getenv("JOB_INDEX_DB_PATH", "")  # SQLite file, empty to keep the index in memory
+    JOB_INDEX_STALE_SECONDS: int = int(os.getenv("JOB_INDEX_STALE_SECONDS", "3600"))  # Older searches are refreshed live
+    JOB_INDEX_MAX_RESULTS: int = int(os.getenv("JOB_INDEX_MAX_RESULTS", "200"))  # Index matches handed to the pre-filter
+    JOB_INDEX_RETENTION_SECONDS: int = int(os.getenv("JOB_INDEX_RETENTION_SECONDS", "604800"))  # Jobs unseen this long are purged
+    # Searches pulled in the background: every query in every location, separated by ";" since locations contain commas
+    INGESTION_QUERIES: str = os.getenv("INGESTION_QUERIES", "")
+    INGESTION_LOCATIONS: str = os.getenv("INGESTION_LOCATIONS", "")
+    INGESTION_INTERVAL_SECONDS: int = int(os.getenv("INGESTION_INTERVAL_SECONDS", "1800"))
+
+    def validate(self) -> List[str]:
+        """
+        Check settings that would otherwise only fail on first use, once at startup.
+        Raises ValueError listing every invalid value; returns warnings for missing
+        API keys, since those only break the features that need them.
+        """
+        errors = []
+        choices = {
+            "SCORING_MODE": ("chat", "embedding"),
+            "EMBEDDING_BACKEND": ("openai", "hashing"),
+            "STATE_BACKEND": ("memory", "sqlite", "redis"),
+            "SALARY_DEFAULT_PERIOD": ("", "hour", "day", "week", "month", "year")
+        }
+        for name, allowed in choices.items():
+            if getattr(self, name).lower() not in allowed:
+                errors.append(f"{name} must be one of {', '.join(repr(value) for value in allowed)}")
+        for name in ("SCORING_BATCH_SIZE", "SCORING_MAX_CONCURRENCY", "EMBEDDING_BATCH_SIZE", "PREFILTER_TOP_K",
+                     "PROVIDER_MAX_PAGES", "PROVIDER_PAGE_CONCURRENCY", "RETRY_MAX_ATTEMPTS", "HTTP_MAX_CONNECTIONS",
+                     "SEARCH_DEFAULT_LIMIT", "SEARCH_MAX_LIMIT", "INGESTION_INTERVAL_SECONDS",
+                     "EMBEDDING_CACHE_MAX_ENTRIES"):
+            if getattr(self, name) < 1:
+                errors.append(f"{name} must be at least 1")
+        if self.SEARCH_DEFAULT_LIMIT > self.SEARCH_MAX_LIMIT:
+            errors.append("SEARCH_DEFAULT_LIMIT must not exceed SEARCH_MAX_LIMIT")
+        if not 0 <= self.DEDUP_MAX_DISTANCE <= 3:
+            errors.append("DEDUP_MAX_DISTANCE must be between 0 and 3")
+        if not 0 <= self.SALARY_FILTER_TOLERANCE < 1:
+            errors.append("SALARY_FILTER_TOLERANCE must be at least 0 and below 1")
+        if errors:
+            raise ValueError("Invalid settings: " + "; ".join(errors))
+
+        warnings = []
+        uses_openai = (self.SCORING_MODE == "chat" or self.EMBEDDING_BACKEND == "openai"
+                       or self.EMBEDDING_RERANK_TOP_N > 0)
+        if uses_openai and not self.OPENAI_API_KEY and not self.OPENAI_BASE_URL:
+            warnings.append("OPENAI_API_KEY is not set, so relevance scoring will fail")
+        providers = {name.strip().lower() for name in self.ENABLED_PROVIDERS.split(",")}
+        if providers & {"linkedin", "indeed", "jsearch"} and not self.RAPIDAPI_KEY:
+            warnings.append("RAPIDAPI_KEY is not set, so the RapidAPI job providers will fail")
+        return warnings
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import importlib.util
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build a pooled, keep-alive client using the limits and timeouts from settings.
+    HTTP/2 is negotiated only when it is enabled and the h2 package is available.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+async def init_http_client():
+    """Create the app-lifetime client (called from the FastAPI lifespan)"""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+
+async def close_http_client():
+    """Close the app-lifetime client and release its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client. It is created lazily so services also work
+    outside the app lifespan (scripts, benchmarks).
+    """
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
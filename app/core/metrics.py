@@ -0,0 +1,145 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "job_finder_stage_seconds": ("histogram", "Time spent in each stage of a search"),
+    "job_finder_request_seconds": ("histogram", "Time to produce a response, by path"),
+    "job_finder_jobs_total": ("counter", "Jobs seen at each stage of a search"),
+    "job_finder_jobs_dropped_total": ("counter", "Jobs dropped at each stage of a search"),
+    "job_finder_llm_tokens_total": ("counter", "LLM tokens spent, by kind"),
+    "job_finder_llm_calls_total": ("counter", "LLM and embedding API calls, by kind"),
+    "job_finder_index_lookups_total": ("counter", "Searches answered from the local job index (hit) or live (miss)"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class RequestTrace:
+    """Stage durations and counts collected while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+
+    def server_timing(self) -> str:
+        """Render the stages as a Server-Timing header value"""
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+class MetricsRegistry:
+    """
+    Counters and histograms kept in process and rendered in the Prometheus text format
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}  # Bucket counts, then sum and count
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        if not settings.METRICS_ENABLED:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        if not settings.METRICS_ENABLED:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            values = self._histograms.setdefault(key, [0.0] * (len(DURATION_BUCKETS) + 2))
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    values[i] += 1
+            values[-2] += seconds
+            values[-1] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(values)) for key, values in self._histograms.items())
+
+        lines: List[str] = []
+        described = set()
+
+        def describe(name: str):
+            if name not in described:
+                described.add(name)
+                kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f"{name}{format_labels(labels)} {value:g}")
+
+        for (name, labels), values in histograms:
+            describe(name)
+            for bound, count in zip(DURATION_BUCKETS, values):
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', f'{bound:g}'),))} {count:g}")
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {values[-1]:g}")
+            lines.append(f"{name}_sum{format_labels(labels)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{format_labels(labels)} {values[-1]:g}")
+
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+metrics = MetricsRegistry()
+
+def start_trace() -> RequestTrace:
+    """Begin collecting stage timings for the current request"""
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+@contextmanager
+def stage(name: str, **labels: str) -> Iterator[None]:
+    """
+    Time a block as one stage of the current request. The duration is added to the
+    stage histogram and, as `name` plus any label values, to the request's Server-Timing.
+    Stages that run more than once per request (batches, pages) add up.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("job_finder_stage_seconds", elapsed, stage=name, **labels)
+        trace = _current_trace.get()
+        if trace is not None:
+            key = "-".join([name] + [str(value) for value in labels.values()])
+            trace.stages[key] = trace.stages.get(key, 0.0) + elapsed
+
+def count_jobs(stage_name: str, seen: int, dropped: int = 0):
+    """Record how many jobs reached a stage and how many it dropped"""
+    metrics.inc("job_finder_jobs_total", seen, stage=stage_name)
+    if dropped:
+        metrics.inc("job_finder_jobs_dropped_total", dropped, stage=stage_name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.counts[stage_name] = trace.counts.get(stage_name, 0) + seen
@@ -0,0 +1,253 @@
+import asyncio
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.core.config import settings
+from app.core.state_backend import get_state_backend, state_key
+
+T = TypeVar("T")
+
+# Status codes worth another attempt: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+class TokenBucket:
+    """
+    Async token bucket allowing `rate` calls per second on average with bursts
+    of up to `burst`. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        wait = self._paused_until - now
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens are reserved up front and may go negative; each caller waits off
+            # its own share of the debt, so callers are served in arrival order
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def pause(self, seconds: float):
+        """Hold every caller back for `seconds`, e.g. after a 429 with Retry-After"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket kept in the shared state backend, so every worker draws from one
+    limit per upstream. Falls back to a local bucket while the backend is unreachable.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float):
+        super().__init__(rate, burst)
+        self.key = state_key("bucket", name)
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return await super().acquire()
+        try:
+            wait = await get_state_backend().reserve_token(self.key, self.rate, self.burst)
+        except Exception as e:
+            print(f"Shared rate limit for {self.key} unavailable, limiting locally: {e}")
+            return await super().acquire()
+        # Also honour this worker's own pauses, in case sharing one failed
+        wait = max(wait, self._paused_until - time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def pause(self, seconds: float):
+        await super().pause(seconds)
+        if self.rate > 0:
+            try:
+                await get_state_backend().pause_tokens(self.key, self.rate, self.burst, seconds)
+            except Exception as e:
+                print(f"Could not share the pause for {self.key}: {e}")
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures so callers fail fast.
+    After `reset_seconds` one trial call is let through; its outcome closes
+    the circuit again or keeps it open for another period.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed" or self.failure_threshold <= 0:
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give up a half-open trial without an outcome, e.g. when the call was cancelled"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failure_threshold > 0 and (self._opened_at is not None or self.failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _is_connection_error(error: Exception) -> bool:
+    if isinstance(error, (httpx.TransportError, OSError, asyncio.TimeoutError)):
+        return True
+    # The OpenAI SDK is imported lazily; until it is, none of its errors can be raised
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(error, openai.APIConnectionError)
+
+def classify_error(error: Exception) -> Tuple[bool, Optional[float]]:
+    """
+    Decide whether a failed call is worth retrying and how long the upstream asked
+    us to wait. Works for httpx errors and the OpenAI SDK's errors, which both
+    carry the HTTP response.
+    """
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status_code is None:
+        # No response at all: connection failures and timeouts are transient, anything else is a bug
+        return _is_connection_error(error), None
+    headers = getattr(response, "headers", None) or {}
+    return status_code in RETRYABLE_STATUS_CODES, _parse_retry_after(headers.get("retry-after"))
+
+class Upstream:
+    """
+    Rate limit, retry and circuit breaker policy for one upstream API. Limits are
+    read from `<NAME>_RATE_LIMIT_PER_SECOND` and `<NAME>_RATE_LIMIT_BURST`, falling
+    back to the shared RETRY_* and CIRCUIT_* settings.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float):
+        self.name = name
+        self.bucket = SharedTokenBucket(name, rate, burst) if get_state_backend() else TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "Upstream":
+        prefix = name.upper()
+        return cls(
+            name,
+            rate=getattr(settings, f"{prefix}_RATE_LIMIT_PER_SECOND", 0),
+            burst=getattr(settings, f"{prefix}_RATE_LIMIT_BURST", 1)
+        )
+
+    def available(self) -> bool:
+        """Whether calls would currently be let through (doesn't use up a half-open trial)"""
+        return self.breaker.state != "open"
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `request` under the rate limit, retrying transient failures with jittered
+        exponential backoff (never sooner than a Retry-After header allows).
+        Raises CircuitOpenError without calling out while the circuit is open.
+        """
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open after repeated failures")
+
+        attempts = max(1, settings.RETRY_MAX_ATTEMPTS)
+        for attempt in range(attempts):
+            await self.bucket.acquire()
+            self.calls += 1
+            try:
+                result = await request()
+            except asyncio.CancelledError:
+                # Cancelled by a caller's deadline; says nothing about the upstream's health
+                self.breaker.release_trial()
+                raise
+            except Exception as e:
+                retryable, retry_after = classify_error(e)
+                if retry_after is not None:
+                    await self.bucket.pause(min(retry_after, settings.RETRY_MAX_DELAY))
+                last_attempt = attempt == attempts - 1
+                if not retryable or last_attempt or (retry_after or 0) > settings.RETRY_MAX_DELAY:
+                    self.failures += 1
+                    if retryable:
+                        self.breaker.record_failure()
+                    else:
+                        # A bad request or a bug in the caller says nothing about the upstream's
+                        # health either way, so it neither closes the circuit nor counts against it
+                        self.breaker.release_trial()
+                    raise
+                delay = random.uniform(0, min(settings.RETRY_MAX_DELAY, settings.RETRY_BASE_DELAY * 2 ** attempt))
+                self.retries += 1
+                print(f"{self.name} call failed ({str(e).splitlines()[0] if str(e) else type(e).__name__}); retrying in {max(delay, retry_after or 0):.2f}s")
+                # Any Retry-After pause is enforced by the bucket on the next acquire
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "consecutive_failures": self.breaker.failures
+        }
+
+_upstreams: Dict[str, Upstream] = {}
+
+def get_upstream(name: str) -> Upstream:
+    """Return the shared policy for an upstream, created from settings on first use"""
+    if name not in _upstreams:
+        _upstreams[name] = Upstream.from_settings(name)
+    return _upstreams[name]
+
+def upstream_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: upstream.stats() for name, upstream in _upstreams.items()}
@@ -0,0 +1,212 @@
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+
+# Token buckets are kept as a single "theoretical arrival time" per key (the generic
+# cell rate algorithm): each call pushes it one interval further, and a call has to
+# wait once it runs more than `burst` intervals ahead of now
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local pause = tonumber(ARGV[4])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or ARGV[1]), now)
+local wait = 0
+if pause > 0 then
+    tat = math.max(tat, now + pause + tolerance - interval)
+else
+    tat = tat + interval
+    wait = math.max(0, tat - tolerance - now)
+end
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+return tostring(wait)
+"""
+
+def _advance_bucket(tat: Optional[float], now: float, rate: float, burst: float,
+                    pause: float = 0.0) -> Tuple[float, float]:
+    """Python twin of _GCRA_SCRIPT: the new arrival time and how long the caller waits"""
+    interval = 1.0 / rate
+    tolerance = max(1.0, burst) * interval
+    tat = max(tat if tat is not None else now, now)
+    if pause > 0:
+        return max(tat, now + pause + tolerance - interval), 0.0
+    tat += interval
+    return tat, max(0.0, tat - tolerance - now)
+
+class SQLiteStateBackend:
+    """
+    Shared state in a SQLite file, for several workers on one host or for trying the
+    shared mode locally without Redis. Blocking calls run in a thread so workers
+    waiting on each other's write locks don't stall the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tat REAL)")
+
+    def _transaction(self, statements):
+        """Run `statements(db)` inside one write transaction and return its result"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._db)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            return result
+
+    def _get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            rows = dict(self._db.execute(
+                f"SELECT key, value FROM kv WHERE key IN ({', '.join('?' * len(keys))}) AND expires_at > ?",
+                (*keys, time.time())
+            ).fetchall())
+        return [rows.get(key) for key in keys]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await asyncio.to_thread(self._get_many, keys) if keys else []
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_many([key]))[0]
+
+    def _set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        expires_at = time.time() + ttl_seconds
+
+        def statements(db):
+            db.executemany(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()]
+            )
+            self._writes += 1
+            # Purge expired rows every so often instead of on every write
+            if self._writes % 500 == 0:
+                db.execute("DELETE FROM kv WHERE expires_at <= ?", (time.time(),))
+
+        self._transaction(statements)
+
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        if items:
+            await asyncio.to_thread(self._set_many, items, ttl_seconds)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        await self.set_many({key: value}, ttl_seconds)
+
+    def _update_bucket(self, key: str, rate: float, burst: float, pause: float) -> float:
+        def statements(db):
+            row = db.execute("SELECT tat FROM buckets WHERE key = ?", (key,)).fetchone()
+            tat, wait = _advance_bucket(row[0] if row else None, time.time(), rate, burst, pause)
+            db.execute("INSERT OR REPLACE INTO buckets (key, tat) VALUES (?, ?)", (key, tat))
+            return wait
+
+        return self._transaction(statements)
+
+    async def reserve_token(self, key: str, rate: float, burst: float) -> float:
+        return await asyncio.to_thread(self._update_bucket, key, rate, burst, 0.0)
+
+    async def pause_tokens(self, key: str, rate: float, burst: float, seconds: float):
+        await asyncio.to_thread(self._update_bucket, key, rate, burst, seconds)
+
+    def _try_lock(self, key: str, ttl_seconds: float) -> bool:
+        def statements(db):
+            now = time.time()
+            held = db.execute("SELECT 1 FROM kv WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            if held:
+                return False
+            db.execute("INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                       (key, b"1", now + ttl_seconds))
+            return True
+
+        return self._transaction(statements)
+
+    async def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        return await asyncio.to_thread(self._try_lock, key, ttl_seconds)
+
+    async def close(self):
+        with self._lock:
+            self._db.close()
+
+class RedisStateBackend:
+    """Shared state in Redis, for workers spread over several hosts"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("STATE_BACKEND=redis needs the redis package (pip install redis)")
+        self._redis = redis.from_url(url)
+        self._gcra = self._redis.register_script(_GCRA_SCRIPT)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self._redis.mget(keys) if keys else []
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        if not items:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, px=max(1, math.ceil(ttl_seconds * 1000)))
+            await pipe.execute()
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        await self.set_many({key: value}, ttl_seconds)
+
+    async def _update_bucket(self, key: str, rate: float, burst: float, pause: float) -> float:
+        interval = 1.0 / rate
+        wait = await self._gcra(keys=[key], args=[repr(time.time()), repr(interval),
+                                                  repr(max(1.0, burst) * interval), repr(pause)])
+        return float(wait)
+
+    async def reserve_token(self, key: str, rate: float, burst: float) -> float:
+        return await self._update_bucket(key, rate, burst, 0.0)
+
+    async def pause_tokens(self, key: str, rate: float, burst: float, seconds: float):
+        await self._update_bucket(key, rate, burst, seconds)
+
+    async def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        return bool(await self._redis.set(key, b"1", nx=True, px=max(1, math.ceil(ttl_seconds * 1000))))
+
+    async def close(self):
+        await self._redis.aclose()
+
+StateBackend = Union[SQLiteStateBackend, RedisStateBackend]
+
+_backend: Optional[StateBackend] = None
+
+def get_state_backend() -> Optional[StateBackend]:
+    """
+    The configured shared state backend, created on first use, or None with
+    STATE_BACKEND=memory, in which case every worker keeps its own state
+    """
+    global _backend
+    if _backend is None and settings.STATE_BACKEND != "memory":
+        if settings.STATE_BACKEND == "redis":
+            _backend = RedisStateBackend(settings.STATE_BACKEND_URL)
+        elif settings.STATE_BACKEND == "sqlite":
+            _backend = SQLiteStateBackend(settings.STATE_BACKEND_DB_PATH)
+        else:
+            raise ValueError(f"Unknown STATE_BACKEND: {settings.STATE_BACKEND}")
+    return _backend
+
+def state_key(*parts: str) -> str:
+    """Namespaced key, so several deployments can share one Redis"""
+    return settings.STATE_KEY_PREFIX + ":".join(parts)
+
+async def close_state_backend():
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
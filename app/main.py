@@ -1,13 +1,38 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.api.endpoints import jobs
+from app.core.http_client import init_http_client, close_http_client
+from app.core.metrics import metrics, start_trace
+from app.core.state_backend import close_state_backend
+from app.services.providers import start_providers, close_providers
+from app.services.ingestion import start_ingestion, stop_ingestion
+from app.api.endpoints import jobs, metrics as metrics_endpoint
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Refuse to start on invalid settings instead of failing on the first search
+    for warning in settings.validate():
+        print(warning)
+    # Share one pooled HTTP client across all provider services
+    await init_http_client()
+    await start_providers()
+    # Keep the local job index filled with the configured popular searches
+    await start_ingestion()
+    yield
+    await stop_ingestion()
+    await close_providers()
+    await close_http_client()
+    await close_state_backend()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS
@@ -19,8 +44,25 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Time every request and, if enabled, report its stages in a Server-Timing header.
+    Streaming responses only include the stages finished before the first byte.
+    """
+    trace = start_trace()
+    response = await call_next(request)
+    # Label by route template, so unknown URLs and path parameters can't add new series
+    route = request.scope.get("route")
+    metrics.observe("job_finder_request_seconds", time.perf_counter() - trace.started,
+                    path=getattr(route, "path", "unmatched"))
+    if settings.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = trace.server_timing()
+    return response
+
 # Include routers
 app.include_router(jobs.router, prefix=f"{settings.API_V1_STR}/jobs", tags=["jobs"])
+app.include_router(metrics_endpoint.router, tags=["metrics"])
 
 @app.get("/")
 async def root():
@@ -31,5 +73,6 @@ async def root():
     }
 
 if __name__ == "__main__":
+    # Development server; use `python -m app.serve` for production
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
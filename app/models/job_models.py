@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List, Optional
+import sys
+from dataclasses import dataclass, fields
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 
 class JobSearchRequest(BaseModel):
     position: str
@@ -8,6 +10,8 @@ class JobSearchRequest(BaseModel):
     jobNature: str
     location: str
     skills: str
+    limit: Optional[int] = Field(None, ge=1)  # Jobs per page, SEARCH_DEFAULT_LIMIT if unset
+    cursor: Optional[str] = None  # next_cursor of a previous response, to continue that search
 
 class JobListing(BaseModel):
     job_title: str
@@ -19,5 +23,80 @@ class JobListing(BaseModel):
     apply_link: str
     source: str  # LinkedIn, Indeed, or other source
 
+class TokenUsage(BaseModel):
+    requests: int = 0  # Chat completions sent
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    description_tokens_saved: int = 0  # Estimated tokens trimmed from descriptions by compaction
+
 class JobSearchResponse(BaseModel):
-    relevant_jobs: List[JobListing]
\ No newline at end of file
+    relevant_jobs: List[JobListing]
+    missing_sources: List[str] = []  # Providers that missed their deadline or failed
+    token_usage: Optional[TokenUsage] = None  # LLM tokens spent on this search
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page; None once results run out
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    Internal job representation used from provider normalization through scoring.
+    Fields are already normalized strings, so the record converts to a JobListing
+    without revalidation. `raw_description` is only needed until the job is scored.
+    """
+    job_title: str
+    company: str
+    experience: str
+    jobNature: str
+    location: str
+    salary: str
+    apply_link: str
+    source: str
+    raw_description: str = ""
+    relevance_score: Optional[float] = None
+    # Parsed from `salary` and `experience` at ingest; None when unknown
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None  # hour, day, week, month or year
+    experience_min_years: Optional[float] = None
+    experience_max_years: Optional[float] = None
+
+    def release_description(self):
+        """Drop the description once it is no longer needed"""
+        self.raw_description = ""
+
+    def to_listing(self) -> JobListing:
+        return JobListing.model_construct(
+            job_title=self.job_title,
+            company=self.company,
+            experience=self.experience,
+            jobNature=self.jobNature,
+            location=self.location,
+            salary=self.salary,
+            apply_link=self.apply_link,
+            source=self.source
+        )
+
+JOB_RECORD_FIELDS = tuple(field.name for field in fields(JobRecord))
+
+def dump_jobs(jobs: List[JobRecord]) -> List[Dict[str, Any]]:
+    """
+    JobRecords as JSON-friendly rows keyed by field name, for state shared between
+    workers. Unset optional fields are left out to keep the rows small.
+    """
+    return [{field: value for field in JOB_RECORD_FIELDS if (value := getattr(job, field)) is not None}
+            for job in jobs]
+
+def load_jobs(rows: List[Dict[str, Any]]) -> List[JobRecord]:
+    """
+    Inverse of dump_jobs; source and jobNature are interned again like normalize_job does.
+    Rows written before a field was added or removed still load: missing fields take
+    their defaults and unknown ones are ignored.
+    """
+    jobs = []
+    for row in rows:
+        job = JobRecord(**{field: value for field, value in row.items() if field in JOB_RECORD_FIELDS})
+        job.source = sys.intern(job.source)
+        job.jobNature = sys.intern(job.jobNature)
+        jobs.append(job)
+    return jobs
@@ -0,0 +1,37 @@
+"""
+Production entry point: serves app.main:app with SERVER_WORKERS uvicorn worker
+processes (one per core by default) and no auto-reload.
+
+    SERVER_WORKERS=4 STATE_BACKEND=redis STATE_BACKEND_URL=redis://cache:6379/0 python -m app.serve
+"""
+import uvicorn
+
+from app.core.config import settings
+
+def check_worker_settings(workers: int):
+    """Warn about settings that don't hold up once state is split across processes"""
+    if workers <= 1:
+        return
+    if settings.STATE_BACKEND == "memory":
+        print(f"Running {workers} workers with STATE_BACKEND=memory: caches, rate limits and search "
+              "sessions are per worker, so hit rates drop and cursors only work on the worker that made them")
+    if settings.JOB_INDEX_ENABLED and not settings.JOB_INDEX_DB_PATH:
+        print("The job index is kept in memory, so each worker ingests and indexes separately; "
+              "set JOB_INDEX_DB_PATH to share one index file")
+
+def main():
+    # Checked here too so bad settings are reported once, not by every worker
+    settings.validate()
+    workers = max(1, settings.SERVER_WORKERS)
+    check_worker_settings(workers)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        log_level=settings.SERVER_LOG_LEVEL,
+        proxy_headers=True
+    )
+
+if __name__ == "__main__":
+    main()
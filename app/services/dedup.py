@@ -0,0 +1,166 @@
+import dataclasses
+import hashlib
+import re
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.core.config import settings
+from app.models.job_models import JobRecord
+
+# Query parameters that only track where a click came from, plus every utm_* one. Parameters
+# like Indeed's vjk identify the posting itself and must stay.
+TRACKING_PARAMS = {"refid", "trackingid", "trk", "gclid", "fbclid"}
+
+# Values providers use when a field is missing
+PLACEHOLDERS = {"", "n/a", "not specified", "none", "null"}
+
+# Fields a duplicate can fill in; source and apply link stay with the first occurrence
+MERGED_FIELDS = tuple(
+    field.name for field in dataclasses.fields(JobRecord)
+    if field.name not in ("source", "apply_link", "relevance_score")
+)
+
+SIMHASH_BITS = 64
+BAND_BITS = 16  # 4 bands: any two hashes within 3 bits of each other share at least one band
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+def normalize_link(link: str) -> str:
+    """Canonical form of an apply link: lowercase host, no fragment, tracking or trailing slash"""
+    link = (link or "").strip()
+    if not link or link.lower() in PLACEHOLDERS:
+        return ""
+    parts = urlsplit(link)
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit(("https", parts.netloc.lower().removeprefix("www."), parts.path.rstrip("/"), query, ""))
+
+def _words(text: Any) -> List[str]:
+    return _WORD_RE.findall(str(text or "").lower())
+
+def simhash(job: JobRecord) -> int:
+    """64-bit simhash over title, company and location words (title bigrams included)"""
+    title = _words(job.job_title)
+    features = [(word, 2) for word in title]
+    features += [(f"{a} {b}", 2) for a, b in zip(title, title[1:])]
+    features += [(f"company:{word}", 2) for word in _words(job.company)]
+    features += [(f"location:{word}", 1) for word in _words(job.location)]
+
+    weights = [0] * SIMHASH_BITS
+    for feature, weight in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def _is_placeholder(value: Any) -> bool:
+    return str(value if value is not None else "").strip().lower() in PLACEHOLDERS
+
+def merge_jobs(primary: JobRecord, duplicate: JobRecord):
+    """
+    Fill `primary` with richer fields from `duplicate`: missing values are taken
+    over, and the longer description wins. Source and apply link stay with `primary`.
+    """
+    for field in MERGED_FIELDS:
+        value = getattr(duplicate, field)
+        current = getattr(primary, field)
+        if _is_placeholder(current) and not _is_placeholder(value):
+            setattr(primary, field, value)
+        elif field == "raw_description" and len(value) > len(current):
+            setattr(primary, field, value)
+
+def _location_key(location: Any) -> str:
+    """The city part of a location ("Lahore, Punjab, Pakistan" -> "lahore"), or "" if unknown"""
+    if _is_placeholder(location):
+        return ""
+    return " ".join(_words(str(location).split(",")[0]))
+
+class DedupIndex:
+    """
+    Incremental duplicate finder. Jobs match on their normalized apply link, or on
+    a simhash of title/company/location within DEDUP_MAX_DISTANCE bits. Fuzzy matches
+    also need the same company and city, since the simhash barely moves with location
+    and one company often posts the same title in several cities.
+    Jobs missing a title or company only match by link, since their fingerprints would
+    all look alike.
+    """
+
+    def __init__(self, max_distance: Optional[int] = None):
+        self.max_distance = settings.DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self._links: Dict[str, JobRecord] = {}
+        self._bands: Dict[tuple, List[tuple]] = {}
+
+    def find(self, job: JobRecord) -> Optional[JobRecord]:
+        """Return a previously added job that duplicates `job`, if any"""
+        return self._lookup(*self._keys(job))
+
+    def add(self, job: JobRecord) -> Optional[JobRecord]:
+        """
+        Index `job` unless it duplicates a job already indexed; in that case
+        the existing job is returned and `job` is not indexed
+        """
+        link, fingerprint, company, location = self._keys(job)
+        existing = self._lookup(link, fingerprint, company, location)
+        if existing is not None:
+            return existing
+
+        if link:
+            self._links[link] = job
+        if fingerprint is None:
+            return None
+        for band_key in self._band_keys(fingerprint):
+            self._bands.setdefault(band_key, []).append((fingerprint, company, location, job))
+        return None
+
+    @staticmethod
+    def _keys(job: JobRecord) -> tuple:
+        fuzzy = not _is_placeholder(job.job_title) and not _is_placeholder(job.company)
+        return (normalize_link(job.apply_link), simhash(job) if fuzzy else None, " ".join(_words(job.company)),
+                _location_key(job.location))
+
+    def _lookup(self, link: str, fingerprint: Optional[int], company: str, location: str) -> Optional[JobRecord]:
+        if link and link in self._links:
+            return self._links[link]
+        if fingerprint is None:
+            return None
+
+        for band_key in self._band_keys(fingerprint):
+            for other_fingerprint, other_company, other_location, other in self._bands.get(band_key, []):
+                if company != other_company:
+                    continue
+                # A posting without a location may still be the same job as one with it
+                if location and other_location and location != other_location:
+                    continue
+                if bin(fingerprint ^ other_fingerprint).count("1") <= self.max_distance:
+                    return other
+        return None
+
+    @staticmethod
+    def _band_keys(fingerprint: int) -> List[tuple]:
+        mask = (1 << BAND_BITS) - 1
+        return [(band, fingerprint >> (band * BAND_BITS) & mask) for band in range(SIMHASH_BITS // BAND_BITS)]
+
+def deduplicate_jobs(jobs: List[JobRecord]) -> List[JobRecord]:
+    """
+    Collapse postings returned by more than one provider into a single job,
+    keeping the first occurrence and merging in richer fields from the others
+    """
+    if not settings.DEDUP_ENABLED:
+        return jobs
+
+    index = DedupIndex()
+    unique_jobs = []
+    for job in jobs:
+        existing = index.add(job)
+        if existing is None:
+            unique_jobs.append(job)
+        else:
+            merge_jobs(existing, job)
+    return unique_jobs
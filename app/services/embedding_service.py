@@ -0,0 +1,354 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, so run a single worker there
+    fcntl = None
+
+from app.core.config import settings
+from app.core.metrics import metrics, stage
+from app.core.resilience import get_upstream
+from app.models.job_models import JobRecord, JobSearchRequest, TokenUsage
+from app.services.openai_service import get_openai_client, build_criteria_string, record_usage, _score_batch
+from app.services.prefilter import tokenize
+from app.services.prompt_compaction import compact_description
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so dot products are cosine similarities"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+def hashing_embeddings(texts: List[str], dimensions: int = 256) -> np.ndarray:
+    """
+    Deterministic bag-of-words embeddings using the hashing trick. Texts that
+    share words get similar vectors, which is all offline scoring needs.
+    """
+    matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            column = int.from_bytes(digest[:4], "little") % dimensions
+            matrix[row, column] += 1.0 if digest[4] & 1 else -1.0
+    return normalize_rows(matrix)
+
+class OpenAIEmbeddingBackend:
+    """Embeddings from the OpenAI-compatible endpoint used for chat scoring"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def embed(self, texts: List[str], usage: Optional[TokenUsage] = None) -> np.ndarray:
+        metrics.inc("job_finder_llm_calls_total", kind="embedding")
+        with stage("embedding_call"):
+            response = await get_upstream("openai").call(
+                lambda: get_openai_client().embeddings.create(model=self.model, input=texts)
+            )
+        record_usage(usage, response)
+        data = sorted(response.data, key=lambda item: item.index)
+        return normalize_rows(np.array([item.embedding for item in data], dtype=np.float32))
+
+class HashingEmbeddingBackend:
+    """Local fake backend for running without network access or an API key"""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    async def embed(self, texts: List[str], usage: Optional[TokenUsage] = None) -> np.ndarray:
+        return hashing_embeddings(texts, self.dimensions)
+
+_backend = None
+
+def get_embedding_backend():
+    """
+    Return the embedding backend selected by EMBEDDING_BACKEND, creating it on first use
+    """
+    global _backend
+    if _backend is None:
+        if settings.EMBEDDING_BACKEND == "hashing":
+            _backend = HashingEmbeddingBackend()
+        else:
+            _backend = OpenAIEmbeddingBackend(settings.EMBEDDING_MODEL)
+    return _backend
+
+def make_embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x1f{text}".encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """
+    Embedding vectors keyed by model and text. With a directory, vectors live in a
+    memory-mapped float32 file next to an append-only list of keys, so previously
+    seen postings survive restarts without being read into memory up front. Several
+    worker processes can share the directory: writes hold a file lock and each
+    process picks up rows the others appended before writing or after a miss.
+    Once `max_entries` vectors are stored the cache starts over, which bounds the
+    files and the key map. File I/O and waiting on the lock run in a worker thread.
+    """
+
+    def __init__(self, path: str = "", max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._rows: Dict[str, int] = {}
+        self._dimensions = 0
+        self._generation = 0  # Bumped in meta.json each time the files start over
+        self._vectors: Optional[np.ndarray] = None  # Capacity rows x dimensions; rows past len(_rows) are unused
+        self._keys_offset = 0  # Bytes of keys.txt already read into _rows
+        self._lock = threading.Lock()  # Guards the in-process state across worker threads
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            with self._locked():
+                self._sync()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _locked(self):
+        """Hold this process's lock and the cache directory's lock, shared by every process using it"""
+        with self._lock:
+            if fcntl is None or not self.path:
+                yield
+                return
+            with open(self._file("lock"), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _forget(self, dimensions: int, generation: int):
+        self._rows = {}
+        self._vectors = None
+        self._dimensions = dimensions
+        self._generation = generation
+        self._keys_offset = 0
+
+    def _sync(self):
+        """Read the rows appended to the files since the last look; call with the lock held"""
+        if not os.path.exists(self._file("meta.json")):
+            return
+        with open(self._file("meta.json")) as f:
+            meta = json.load(f)
+        dimensions, generation = meta["dimensions"], meta.get("generation", 0)
+        if dimensions != self._dimensions or generation != self._generation:
+            # Another process switched models or filled the cache and started the files over
+            self._forget(dimensions, generation)
+        keys_size = os.path.getsize(self._file("keys.txt")) if os.path.exists(self._file("keys.txt")) else 0
+        if not keys_size or not os.path.exists(self._file("vectors.f32")):
+            return
+
+        capacity = os.path.getsize(self._file("vectors.f32")) // (4 * self._dimensions)
+        if self._vectors is None or capacity > self._vectors.shape[0]:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+",
+                                      shape=(capacity, self._dimensions))
+        with open(self._file("keys.txt"), "rb") as f:
+            f.seek(self._keys_offset)
+            appended = f.read()
+        appended = appended[:appended.rfind(b"\n") + 1]
+        self._keys_offset += len(appended)
+        for key in appended.decode("utf-8").splitlines():
+            # Vectors are written before their keys, so any key past the file is incomplete
+            if len(self._rows) < capacity:
+                self._rows[key] = len(self._rows)
+
+    def _reset(self, dimensions: int):
+        """Start over empty, on disk too; call with the lock held"""
+        self._forget(dimensions, self._generation + 1)
+        if self.path:
+            for name in ("vectors.f32", "keys.txt"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            with open(self._file("meta.json"), "w") as f:
+                json.dump({"dimensions": dimensions, "generation": self._generation}, f)
+
+    def _ensure_capacity(self, rows: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = min(max(rows, capacity * 2, 1024), max(rows, self.max_entries))
+
+        if not self.path:
+            grown = np.zeros((new_capacity, self._dimensions), dtype=np.float32)
+            if self._vectors is not None:
+                grown[:capacity] = self._vectors
+            self._vectors = grown
+            return
+
+        if self._vectors is not None:
+            self._vectors.flush()
+        with open(self._file("vectors.f32"), "a+b") as f:
+            f.truncate(new_capacity * self._dimensions * 4)
+        self._vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+",
+                                  shape=(new_capacity, self._dimensions))
+
+    async def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector for each key, or None where there is none"""
+        if self.path:
+            return await asyncio.to_thread(self._get_many, keys)
+        return self._get_many(keys)
+
+    def _get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        if self.path and any(key not in self._rows for key in keys):
+            # Other workers may have embedded these since the last look
+            with self._locked():
+                self._sync()
+        vectors = []
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    vectors.append(None)
+                else:
+                    self.hits += 1
+                    # A copy, since the cache may start over and reuse the row
+                    vectors.append(np.array(self._vectors[row]))
+        return vectors
+
+    async def put_many(self, keys: List[str], vectors: np.ndarray):
+        if self.path:
+            await asyncio.to_thread(self._put_many, keys, vectors)
+        else:
+            self._put_many(keys, vectors)
+
+    def _put_many(self, keys: List[str], vectors: np.ndarray):
+        with self._locked():
+            if self.path:
+                # Append after whatever other workers wrote, not over it
+                self._sync()
+            self._append(keys, vectors)
+
+    def _append(self, keys: List[str], vectors: np.ndarray):
+        if self._dimensions != vectors.shape[1]:
+            # A different embedding model; the old vectors can't be compared with new ones
+            self._reset(vectors.shape[1])
+
+        new_keys, new_rows = {}, []
+        for key, vector in zip(keys, vectors):
+            if key not in self._rows and key not in new_keys and len(new_keys) < self.max_entries:
+                new_keys[key] = len(new_rows)
+                new_rows.append(vector)
+        if not new_keys:
+            return
+        if len(self._rows) + len(new_keys) > self.max_entries:
+            self._reset(self._dimensions)
+
+        start = len(self._rows)
+        self._ensure_capacity(start + len(new_keys))
+        self._vectors[start:start + len(new_keys)] = np.vstack(new_rows)
+        if self.path:
+            self._vectors.flush()
+            appended = "".join(f"{key}\n" for key in new_keys).encode("utf-8")
+            with open(self._file("keys.txt"), "ab") as f:
+                f.write(appended)
+            self._keys_offset += len(appended)
+        for offset, key in enumerate(new_keys):
+            self._rows[key] = start + offset
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._rows),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.path)
+        }
+
+embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_PATH, settings.EMBEDDING_CACHE_MAX_ENTRIES)
+
+def build_query_text(search_criteria: JobSearchRequest) -> str:
+    return (
+        f"{search_criteria.position}. {search_criteria.experience} experience. "
+        f"Skills: {search_criteria.skills}. {search_criteria.jobNature}. {search_criteria.location}."
+    )
+
+def build_job_text(job: JobRecord) -> str:
+    description = job.raw_description
+    if settings.PROMPT_COMPACTION_ENABLED:
+        # No search terms here, so the same posting always embeds the same text and hits the cache
+        description = compact_description(description, settings.PROMPT_DESCRIPTION_TOKEN_BUDGET, set())
+    return f"{job.job_title}. {job.company}. {job.location}. {job.jobNature}. {description}"
+
+async def embed_texts(texts: List[str], semaphore: asyncio.Semaphore,
+                      usage: Optional[TokenUsage] = None) -> np.ndarray:
+    """
+    Embed texts as one unit-length row each, sending only cache misses to the backend
+    in requests of up to EMBEDDING_BATCH_SIZE texts
+    """
+    backend = get_embedding_backend()
+    keys = [make_embedding_key(backend.model, text) for text in texts]
+    vectors = await embedding_cache.get_many(keys)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+    if missing:
+        batch_size = max(1, settings.EMBEDDING_BATCH_SIZE)
+        chunks = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+
+        async def embed_chunk(chunk):
+            async with semaphore:
+                return await backend.embed([texts[i] for i in chunk], usage)
+
+        embedded = np.vstack(await asyncio.gather(*[embed_chunk(chunk) for chunk in chunks]))
+        await embedding_cache.put_many([keys[i] for i in missing], embedded)
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+
+    return np.vstack(vectors)
+
+async def score_jobs(jobs: List[JobRecord], search_criteria: JobSearchRequest,
+                     semaphore: Optional[asyncio.Semaphore] = None,
+                     usage: Optional[TokenUsage] = None) -> AsyncIterator[Tuple[JobRecord, Dict[str, Any]]]:
+    """
+    Score jobs by cosine similarity between the search and each job, computed in one
+    matrix product, and yield `(job, result)` pairs like openai_service.score_jobs.
+    The EMBEDDING_RERANK_TOP_N most similar jobs are rescored by the chat model and
+    come last. Jobs without a description are skipped.
+    """
+    candidates = [job for job in jobs if job.raw_description]
+    if not candidates:
+        return
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.SCORING_MAX_CONCURRENCY))
+
+    vectors = await embed_texts(
+        [build_query_text(search_criteria)] + [build_job_text(job) for job in candidates], semaphore, usage
+    )
+    with stage("similarity"):
+        similarities = vectors[1:] @ vectors[0]
+
+    results = [
+        {"relevance_score": round(float(similarity) * 100, 1),
+         "is_relevant": bool(similarity >= settings.EMBEDDING_MIN_SIMILARITY)}
+        for similarity in similarities
+    ]
+
+    rerank = [int(i) for i in np.argsort(-similarities, kind="stable")[:max(0, settings.EMBEDDING_RERANK_TOP_N)]]
+    reranked = set(rerank)
+    for i, job in enumerate(candidates):
+        if i not in reranked:
+            yield job, results[i]
+
+    if rerank:
+        chat_results = await _score_batch(
+            [candidates[i] for i in rerank], build_criteria_string(search_criteria), semaphore, usage
+        )
+        for i, result in zip(rerank, chat_results):
+            # Keep the similarity score if the chat model couldn't score the job
+            yield candidates[i], results[i] if result.get("error") else result
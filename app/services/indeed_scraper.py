@@ -0,0 +1,446 @@
+import asyncio
+import queue
+import threading
+import time
+import random
+from typing import List, Dict, Any, Optional
+from lxml import etree, html as lxml_html
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urljoin, urlencode
+import warnings
+
+from app.core.config import settings
+from app.core.metrics import stage
+from app.core.http_client import get_http_client
+from app.models.job_models import JobRecord
+from app.services.providers import JobProvider, register_provider
+from app.services.structured_fields import experience_phrase
+
+# Suppress unnecessary warnings
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+]
+
+# ChromeDriverManager().install() checks versions over the network, so it runs once per process
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def _get_driver_path() -> str:
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+def setup_driver():
+    """Configure and return a Chrome WebDriver with automatic version matching"""
+    options = Options()
+    
+    # Anti-detection settings
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    
+    # Headless mode settings
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--log-level=3")  # Suppress logging
+    
+    # Random user agent
+    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
+    
+    try:
+        # Automatic driver management with version matching
+        service = Service(_get_driver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+        
+        # Remove navigator.webdriver flag
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        return driver
+    except Exception as e:
+        print(f"Failed to setup driver: {str(e)}")
+        return None
+
+def build_search_url(job_title, location, start=0, base_url="https://pk.indeed.com"):
+    """Indeed results URL for a query; `start` is the result offset (10 per page)"""
+    params = {"q": job_title, "l": location}
+    if start:
+        params["start"] = start
+    return f"{base_url}/jobs?" + urlencode(params)
+
+# Job cards on current and legacy result page layouts, compiled once
+_CURRENT_CARDS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' job_seen_beacon ')]")
+_LEGACY_CARDS = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' jobsearch-SerpJobCard ')]")
+
+# (tag, class) -> the card fields that element provides, with a priority (lower wins)
+# so the preferred selector is used even if a fallback appears earlier in the card
+CARD_FIELD_RULES = {
+    ("h2", "jobTitle"): [("job_title", 0)],
+    ("a", "jobtitle"): [("job_title", 1), ("apply_link", 1)],
+    ("span", "companyName"): [("company", 0)],
+    ("span", "company"): [("company", 1)],
+    ("div", "companyLocation"): [("location", 0)],
+    ("span", "location"): [("location", 1)],
+    ("div", "salary-snippet-container"): [("salary", 0)],
+    ("span", "salaryText"): [("salary", 1)],
+    ("div", "job-snippet"): [("snippet", 0)],
+    ("div", "summary"): [("snippet", 1)],
+    ("a", "jcs-JobTitle"): [("apply_link", 0)],
+    ("span", "remote"): [("remote", 0)]
+}
+_RULE_CLASSES = {css_class for _, css_class in CARD_FIELD_RULES}
+
+def parse_job_cards(html, base_url, max_results=10):
+    """Extract up to `max_results` jobs from a results page, parsing it once with lxml"""
+    if not html:
+        return []
+    document = lxml_html.document_fromstring(html)
+    job_cards = _CURRENT_CARDS(document) or _LEGACY_CARDS(document)
+    
+    jobs = []
+    for card in job_cards[:max_results]:
+        job = extract_job_data(card, base_url)
+        if job:
+            jobs.append(job)
+    return jobs
+
+def scrape_indeed_jobs(job_title, location, max_results=10, start=0, base_url="https://pk.indeed.com", driver=None):
+    """
+    Scrape one Indeed results page with a browser. A `driver` passed in is
+    reused and left open, and errors are raised so its owner can discard it;
+    otherwise a new one is started and quit afterwards.
+    """
+    jobs = []
+    
+    own_driver = driver is None
+    try:
+        if own_driver:
+            driver = setup_driver()
+        if not driver:
+            return []
+        
+        search_url = build_search_url(job_title, location, start, base_url)
+        print(f"Navigating to Indeed: {search_url}")
+        
+        driver.get(search_url)
+        
+        # Wait for job cards to load with longer timeout
+        try:
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".job_seen_beacon, .jobsearch-SerpJobCard"))
+            )
+        except TimeoutException:
+            # A page past the last results has no cards; the browser itself is fine
+            print("No job cards found on the page")
+            return []
+        
+        # Scroll to load more jobs
+        for _ in range(2):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(settings.SCRAPER_SCROLL_PAUSE * random.uniform(1, 1.5))
+        
+        # Parse the page
+        jobs = parse_job_cards(driver.page_source, base_url, max_results)
+        print(f"Scraped {len(jobs)} job listings")
+        
+    except Exception as e:
+        print(f"Error during scraping: {str(e)}")
+        if not own_driver:
+            raise
+    finally:
+        if own_driver and driver:
+            driver.quit()
+    
+    return jobs
+
+async def fetch_indeed_html(search_url, request=None):
+    """
+    Fetch a results page over plain HTTP, through `request` (a provider's rate-limited,
+    retried JobProvider.request) when given. Returns None when Indeed answers with
+    an error or a page without job cards (e.g. a bot check), so the caller can
+    fall back to a browser.
+    """
+    headers = {
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Language": "en-US,en;q=0.9"
+    }
+    try:
+        if request is not None:
+            response = await request("GET", search_url, headers=headers, follow_redirects=True)
+        else:
+            response = await get_http_client().get(search_url, headers=headers, follow_redirects=True)
+        if response.status_code != 200:
+            return None
+        html = response.text
+        if "job_seen_beacon" not in html and "jobsearch-SerpJobCard" not in html:
+            return None
+        return html
+    except Exception as e:
+        print(f"HTTP fetch of Indeed page failed: {e}")
+        return None
+
+class DriverPool:
+    """
+    Long-lived, warmed Chrome sessions shared by scrape calls. At most `size`
+    browsers exist; callers block in `acquire` until one is free, for up to
+    `wait_seconds`.
+    """
+
+    def __init__(self, size, wait_seconds=60.0):
+        self.size = max(1, size)
+        self.wait_seconds = wait_seconds
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """A free browser, a newly launched one, or None if none could be had in time"""
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                driver = setup_driver()
+                if driver is None:
+                    with self._lock:
+                        self._created -= 1
+                return driver
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                # Wake up now and then: a failed launch frees a slot without releasing a browser
+                return self._idle.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+    def release(self, driver, broken=False):
+        if broken:
+            # A crashed session is replaced on the next acquire
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(driver)
+
+    def warm_up(self):
+        """Start every browser up front so the first requests don't pay for it"""
+        drivers = [self.acquire() for _ in range(self.size)]
+        for driver in drivers:
+            if driver is not None:
+                self.release(driver)
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+
+class ScraperWorkerPool:
+    """
+    Async queue of page scrapes served by SCRAPER_CONCURRENCY workers. Each page is
+    fetched over plain HTTP first when SCRAPER_USE_HTTP is on, and only falls back to
+    a pooled browser (SCRAPER_BROWSER_POOL_SIZE sessions) when that doesn't work.
+    `request`, when given, sends the HTTP fetches under a provider's rate limit,
+    retry and circuit breaker policy.
+    """
+
+    def __init__(self, concurrency, browser_pool_size, use_http=True, request=None, browser_wait_seconds=60.0):
+        self.concurrency = max(1, concurrency)
+        self.use_http = use_http
+        self.request = request
+        self.drivers = DriverPool(browser_pool_size, browser_wait_seconds)
+        self.http_pages = 0
+        self.browser_pages = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._browser_slots = asyncio.Semaphore(self.drivers.size)
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def submit(self, job_title, location, start=0, base_url="https://pk.indeed.com", max_results=10):
+        """Queue one results page and wait for its jobs"""
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, job_title, location, start, base_url, max_results))
+        return await future
+
+    async def _worker(self):
+        while True:
+            future, job_title, location, start, base_url, max_results = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    jobs = await self._scrape(job_title, location, start, base_url, max_results)
+                    if not future.cancelled():
+                        future.set_result(jobs)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _scrape(self, job_title, location, start, base_url, max_results):
+        search_url = build_search_url(job_title, location, start, base_url)
+        if self.use_http:
+            html = await fetch_indeed_html(search_url, self.request)
+            if html is not None:
+                self.http_pages += 1
+                # Parsing is CPU-bound, so keep it off the event loop
+                return await asyncio.to_thread(parse_job_cards, html, base_url, max_results)
+
+        # Only as many threads wait on browsers as there are browsers
+        async with self._browser_slots:
+            self.browser_pages += 1
+            return await asyncio.to_thread(self._scrape_with_browser, job_title, location, start, base_url, max_results)
+
+    def _scrape_with_browser(self, job_title, location, start, base_url, max_results):
+        driver = self.drivers.acquire()
+        if driver is None:
+            raise RuntimeError("No browser was free or could be started to scrape Indeed")
+        broken = False
+        try:
+            return scrape_indeed_jobs(job_title, location, max_results, start, base_url, driver=driver)
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.drivers.release(driver, broken=broken)
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+        await asyncio.to_thread(self.drivers.close)
+
+def extract_job_data(card, base_url):
+    """Extract job details from a single job card in one pass over its elements"""
+    found = {}
+    remote = False
+    
+    try:
+        for element in card.iter(tag=etree.Element):
+            css_classes = element.get("class")
+            if not css_classes:
+                continue
+            for css_class in css_classes.split():
+                if css_class not in _RULE_CLASSES:
+                    continue
+                for field, priority in CARD_FIELD_RULES.get((element.tag, css_class), ()):
+                    if field == "remote":
+                        remote = remote or "remote" in element.text_content().lower()
+                    elif field not in found or priority < found[field][0]:
+                        found[field] = (priority, element)
+        
+        def text(field):
+            return found[field][1].text_content().strip() if field in found else "N/A"
+        
+        job = {
+            "job_title": text("job_title"),
+            "company": text("company"),
+            "location": text("location"),
+            "salary": text("salary"),
+            # Job nature (remote/onsite)
+            "jobNature": "remote" if remote else "onsite"
+        }
+        
+        # Experience (extracted from snippet)
+        snippet = found["snippet"][1].text_content() if "snippet" in found else ""
+        job["experience"] = extract_experience(snippet)
+        
+        # The snippet is all the description a results page has
+        job["raw_description"] = snippet.strip()
+        
+        # Apply link
+        href = found["apply_link"][1].get("href") if "apply_link" in found else None
+        job["apply_link"] = urljoin(base_url, href) if href else "N/A"
+            
+    except Exception as e:
+        print(f"Error parsing job card: {str(e)}")
+        return None
+    
+    return job
+
+def extract_experience(text):
+    """Extract the experience requirement, like "3+ years of experience", from a snippet"""
+    return experience_phrase(text) or "N/A"
+
+@register_provider
+class IndeedScraperProvider(JobProvider):
+    """
+    Scrape Indeed search results with a headless browser. Disabled unless
+    "indeed_scraper" is listed in ENABLED_PROVIDERS.
+    """
+    name = "indeed_scraper"
+    # Not "Indeed", so results and INDEED_SCRAPER_WEIGHT stay apart from the Indeed API's
+    source = "Indeed Scraper"
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.workers = ScraperWorkerPool(
+            concurrency=settings.SCRAPER_CONCURRENCY,
+            browser_pool_size=settings.SCRAPER_BROWSER_POOL_SIZE,
+            use_http=settings.SCRAPER_USE_HTTP,
+            request=self.request,
+            browser_wait_seconds=settings.SCRAPER_BROWSER_WAIT_SECONDS
+        )
+        self._warm_up: Optional[asyncio.Task] = None
+
+    async def fetch_page(self, query: str, location: str, page: int = 1) -> List[JobRecord]:
+        jobs = await self.workers.submit(
+            query, location, start=(page - 1) * 10, base_url=self.config.url, max_results=settings.SCRAPER_MAX_RESULTS
+        )
+        with stage("normalize", provider=self.name):
+            return [
+                self.make_job(**{field: (None if value == "N/A" else value) for field, value in job.items()})
+                for job in jobs
+            ]
+
+    async def start(self):
+        if settings.SCRAPER_WARM_UP:
+            # Browsers take seconds to launch, so they warm up without holding up startup
+            self._warm_up = asyncio.create_task(asyncio.to_thread(self.workers.drivers.warm_up))
+
+    async def close(self):
+        if self._warm_up is not None:
+            # The browsers launch in a thread that can't be cancelled, so wait for them;
+            # otherwise they would start after the pool is closed and never be quit
+            try:
+                await self._warm_up
+            except Exception as e:
+                print(f"Browser warm-up failed: {e}")
+            self._warm_up = None
+        await self.workers.close()
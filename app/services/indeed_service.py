@@ -1,58 +1,57 @@
-import httpx
 from typing import List, Dict, Any
 from app.core.config import settings
+from app.core.metrics import stage
+from app.models.job_models import JobRecord
+from app.services.providers import JobProvider, register_provider
 
-async def search_indeed_jobs(query: str, location: str) -> List[Dict[Any, Any]]:
+@register_provider
+class IndeedProvider(JobProvider):
     """
     Search for jobs on Indeed using RapidAPI's Indeed API
     """
-    url = settings.INDEED_API_URL
-    
-    headers = {
-        "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
-        "X-RapidAPI-Host": settings.INDEED_API_HOST
-    }
-    
-    # Convert the search criteria to Indeed API format
-    params = {
-        "query": query,
-        "location": location,
-        "page": "1",
-        "sort_by": "relevance"
-    }
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
+    name = "indeed"
+    source = "Indeed"
+
+    async def fetch_page(self, query: str, location: str, page: int = 1) -> List[JobRecord]:
+        url = self.config.url
+        
+        headers = {
+            "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
+            "X-RapidAPI-Host": self.config.host
+        }
+        
+        # Convert the search criteria to Indeed API format
+        params = {
+            "query": query,
+            "location": location,
+            "page": str(page),
+            "sort_by": "relevance"
+        }
+        
+        # Errors propagate so the whole search fails instead of looking like a last page
+        response = await self.request("GET", url, params=params, headers=headers)
+        
+        with stage("normalize", provider=self.name):
             data = response.json()
             raw_jobs = data.get("hits", [])
-            
+        
             # Normalize the job data to our standard format
             normalized_jobs = []
             for job in raw_jobs:
                 # Extract job details
                 job_detail = job.get("hit", {})
-                
+            
                 # Extract relevant information
-                normalized_job = {
-                    "job_title": job_detail.get("title", ""),
-                    "company": job_detail.get("company", {}).get("name", ""),
-                    "experience": job_detail.get("experience", "Not specified"),
-                    "jobNature": job_detail.get("workType", "Not specified"),
-                    "location": job_detail.get("location", {}).get("displayName", ""),
-                    "salary": job_detail.get("compensation", "Not specified"),
-                    "apply_link": job_detail.get("viewJobLink", ""),
-                    "source": "Indeed",
-                    "raw_description": job_detail.get("description", "")
-                }
+                normalized_job = self.make_job(
+                    job_title=job_detail.get("title"),
+                    company=job_detail.get("company", {}).get("name"),
+                    experience=job_detail.get("experience"),
+                    jobNature=job_detail.get("workType"),
+                    location=job_detail.get("location", {}).get("displayName"),
+                    salary=job_detail.get("compensation"),
+                    apply_link=job_detail.get("viewJobLink"),
+                    raw_description=job_detail.get("description")
+                )
                 normalized_jobs.append(normalized_job)
-                
-            return normalized_jobs
-    except httpx.HTTPStatusError as e:
-        print(f"HTTP error occurred with Indeed API: {e}")
-        return []
-    except Exception as e:
-        print(f"Error fetching Indeed jobs: {e}")
-        return []
\ No newline at end of file
+            
+        return normalized_jobs
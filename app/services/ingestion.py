@@ -0,0 +1,91 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import count_jobs, stage
+from app.core.state_backend import get_state_backend, state_key
+from app.services.dedup import deduplicate_jobs
+from app.services.job_index import get_job_index
+from app.services.providers import get_enabled_providers
+
+_task: Optional[asyncio.Task] = None
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(";") if part.strip()]
+
+def ingestion_searches() -> List[Tuple[str, str]]:
+    """Every configured query paired with every configured location (or no location)"""
+    locations = _split(settings.INGESTION_LOCATIONS) or [""]
+    return [(query, location) for query in _split(settings.INGESTION_QUERIES) for location in locations]
+
+async def ingest_search(query: str, location: str) -> int:
+    """
+    Pull one search from every enabled provider into the job index. The search is only
+    marked fresh if all providers answered; otherwise user searches keep going live.
+    """
+    providers = get_enabled_providers()
+    results = await asyncio.gather(*[
+        asyncio.wait_for(provider.search(query, location), provider.config.timeout_seconds)
+        for provider in providers
+    ], return_exceptions=True)
+
+    jobs = []
+    failed = []
+    for provider, result in zip(providers, results):
+        if isinstance(result, BaseException):
+            print(f"Ingestion of '{query}' in '{location}' from {provider.source} failed: {result!r}")
+            failed.append(provider.source)
+            continue
+        jobs.extend(result)
+
+    unique_jobs = deduplicate_jobs(jobs)
+    count_jobs("ingested", len(unique_jobs), dropped=len(jobs) - len(unique_jobs))
+    if failed:
+        await get_job_index().add_jobs(unique_jobs)
+    else:
+        await get_job_index().record_search(query, location, unique_jobs)
+    return len(unique_jobs)
+
+async def ingest_all():
+    """Run every configured search once, then purge jobs past their retention"""
+    for query, location in ingestion_searches():
+        with stage("ingestion"):
+            await ingest_search(query, location)
+    removed = await get_job_index().purge()
+    if removed:
+        print(f"Purged {removed} jobs from the job index")
+
+async def _is_ingestion_leader() -> bool:
+    """
+    With a shared backend and an on-disk index every worker sees the same index,
+    so only the worker holding the lock for this interval ingests
+    """
+    backend = get_state_backend()
+    if backend is None or not settings.JOB_INDEX_DB_PATH:
+        return True
+    return await backend.try_lock(state_key("lock", "ingestion"), settings.INGESTION_INTERVAL_SECONDS * 0.9)
+
+async def _run_forever():
+    while True:
+        try:
+            if await _is_ingestion_leader():
+                await ingest_all()
+        except Exception as e:
+            print(f"Job ingestion failed: {e}")
+        await asyncio.sleep(settings.INGESTION_INTERVAL_SECONDS)
+
+async def start_ingestion():
+    """Start periodic ingestion in the background (called from the FastAPI lifespan)"""
+    global _task
+    if settings.JOB_INDEX_ENABLED and ingestion_searches() and _task is None:
+        _task = asyncio.create_task(_run_forever())
+
+async def stop_ingestion():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,231 @@
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.job_models import JobRecord
+from app.services.dedup import normalize_link
+from app.services.prefilter import TITLE_WEIGHT, tokenize
+from app.services.structured_fields import parse_job_fields
+
+# JobRecord fields stored per job, and the subset indexed for full-text search
+STORED_FIELDS = ("job_title", "company", "experience", "jobNature", "location", "salary",
+                 "apply_link", "source", "raw_description")
+SEARCHED_FIELDS = ("job_title", "jobNature", "location", "raw_description")
+
+def _normalize(value: str) -> str:
+    return " ".join((value or "").lower().split())
+
+def make_job_key(job: JobRecord) -> str:
+    """Identify a posting by its apply link, or by title, company and location without one"""
+    return normalize_link(job.apply_link) or "|".join(
+        _normalize(value) for value in (job.job_title, job.company, job.location)
+    )
+
+def _match_terms(tokens: List[str]) -> str:
+    # Quoted so FTS5 treats tokens like c++ or node.js as plain phrases
+    return " OR ".join('"' + token.replace('"', '""') + '"' for token in dict.fromkeys(tokens))
+
+def build_match_query(query: str, location: str) -> str:
+    """
+    FTS5 query matching any query word in the title or description and, if a location
+    is given, its city (the part before the first comma) or "remote"
+    """
+    match = "{job_title raw_description} : (" + _match_terms(tokenize(query)) + ")"
+    city_tokens = tokenize(location.split(",")[0])
+    if city_tokens:
+        match += " AND {location jobNature} : (" + _match_terms(city_tokens + ["remote"]) + ")"
+    return match
+
+class JobIndex:
+    """
+    Normalized jobs in a SQLite FTS5 index, along with when each search was last run
+    against the live providers. Searches run within `stale_seconds` are answered from
+    the index; jobs not seen for `retention_seconds` are purged. The public methods run
+    their queries in a worker thread so the event loop never waits on SQLite.
+    """
+
+    def __init__(self, db_path: str, stale_seconds: int, retention_seconds: int):
+        self.stale_seconds = stale_seconds
+        self.retention_seconds = retention_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False, timeout=10)
+        if db_path:
+            # Several workers may share the file; readers shouldn't wait on the ingesting writer
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY, job_key TEXT UNIQUE, {", ".join(STORED_FIELDS)}, last_seen REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                {", ".join(SEARCHED_FIELDS)}, content='jobs', content_rowid='id'
+            );
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT, location TEXT, refreshed_at REAL, job_count INTEGER, PRIMARY KEY (query, location)
+            );
+        """)
+        self._db.commit()
+
+    def _unindex(self, row: Tuple[Any, ...]):
+        """Remove a job's old text from the FTS index; `row` is its id then SEARCHED_FIELDS"""
+        self._db.execute(
+            f"INSERT INTO jobs_fts (jobs_fts, rowid, {', '.join(SEARCHED_FIELDS)}) VALUES ('delete', ?, ?, ?, ?, ?)",
+            row
+        )
+
+    def _add_jobs(self, jobs: List[JobRecord]):
+        now = time.time()
+        with self._lock:
+            for job in jobs:
+                key = make_job_key(job)
+                values = tuple(getattr(job, field) for field in STORED_FIELDS)
+                old = self._db.execute(
+                    f"SELECT id, {', '.join(SEARCHED_FIELDS)} FROM jobs WHERE job_key = ?", (key,)
+                ).fetchone()
+                if old is None:
+                    job_id = self._db.execute(
+                        f"INSERT INTO jobs (job_key, {', '.join(STORED_FIELDS)}, last_seen) "
+                        f"VALUES (?, {', '.join('?' * len(STORED_FIELDS))}, ?)",
+                        (key,) + values + (now,)
+                    ).lastrowid
+                else:
+                    job_id = old[0]
+                    self._unindex(old)
+                    self._db.execute(
+                        f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in STORED_FIELDS)}, last_seen = ? "
+                        "WHERE id = ?",
+                        values + (now, job_id)
+                    )
+                self._db.execute(
+                    f"INSERT INTO jobs_fts (rowid, {', '.join(SEARCHED_FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+                    (job_id,) + tuple(getattr(job, field) for field in SEARCHED_FIELDS)
+                )
+            self._db.commit()
+
+    async def add_jobs(self, jobs: List[JobRecord]):
+        """Insert or refresh jobs, keyed by make_job_key"""
+        if jobs:
+            await asyncio.to_thread(self._add_jobs, jobs)
+
+    def _mark_refreshed(self, query: str, location: str, job_count: int):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO searches (query, location, refreshed_at, job_count) VALUES (?, ?, ?, ?)",
+                (_normalize(query), _normalize(location), time.time(), job_count)
+            )
+            self._db.commit()
+
+    async def mark_refreshed(self, query: str, location: str, job_count: int):
+        """Record that a search was just run against every live provider"""
+        await asyncio.to_thread(self._mark_refreshed, query, location, job_count)
+
+    def _record_search(self, query: str, location: str, jobs: List[JobRecord]):
+        self._add_jobs(jobs)
+        self._mark_refreshed(query, location, len(jobs))
+
+    async def record_search(self, query: str, location: str, jobs: List[JobRecord]):
+        """Store the jobs a complete live search returned and mark the search fresh"""
+        await asyncio.to_thread(self._record_search, query, location, jobs)
+
+    def _is_fresh(self, query: str, location: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT refreshed_at FROM searches WHERE query = ? AND location = ?",
+                (_normalize(query), _normalize(location))
+            ).fetchone()
+        return row is not None and row[0] > time.time() - self.stale_seconds
+
+    def _search(self, query: str, location: str, limit: int) -> List[JobRecord]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join('jobs.' + field for field in STORED_FIELDS)} FROM jobs_fts "
+                "JOIN jobs ON jobs.id = jobs_fts.rowid "
+                "WHERE jobs_fts MATCH ? AND jobs.last_seen > ? "
+                f"ORDER BY bm25(jobs_fts, {TITLE_WEIGHT}, 0, 0, 1) LIMIT ?",
+                (build_match_query(query, location), time.time() - self.retention_seconds, limit)
+            ).fetchall()
+        jobs = []
+        for row in rows:
+            job = JobRecord(**dict(zip(STORED_FIELDS, row)))
+            job.source = sys.intern(job.source)
+            job.jobNature = sys.intern(job.jobNature)
+            jobs.append(parse_job_fields(job))
+        return jobs
+
+    async def search(self, query: str, location: str, limit: Optional[int] = None) -> List[JobRecord]:
+        """Best full-text matches for a search, ranked by BM25 with the title weighted up"""
+        if not tokenize(query):
+            return []
+        limit = settings.JOB_INDEX_MAX_RESULTS if limit is None else limit
+        return await asyncio.to_thread(self._search, query, location, limit)
+
+    async def is_fresh(self, query: str, location: str) -> bool:
+        return await asyncio.to_thread(self._is_fresh, query, location)
+
+    async def lookup(self, query: str, location: str) -> Optional[List[JobRecord]]:
+        """Indexed jobs for a search if it is fresh, otherwise None so the caller goes live"""
+        if not await self.is_fresh(query, location):
+            self.misses += 1
+            metrics.inc("job_finder_index_lookups_total", result="miss")
+            return None
+        self.hits += 1
+        metrics.inc("job_finder_index_lookups_total", result="hit")
+        return await self.search(query, location)
+
+    def _purge(self) -> int:
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, {', '.join(SEARCHED_FIELDS)} FROM jobs WHERE last_seen <= ?", (cutoff,)
+            ).fetchall()
+            for row in rows:
+                self._unindex(row)
+            self._db.execute("DELETE FROM jobs WHERE last_seen <= ?", (cutoff,))
+            self._db.execute("DELETE FROM searches WHERE refreshed_at <= ?", (cutoff,))
+            self._db.commit()
+        return len(rows)
+
+    async def purge(self) -> int:
+        """Drop jobs past their retention period and return how many were removed"""
+        return await asyncio.to_thread(self._purge)
+
+    def _counts(self) -> Tuple[int, int, int]:
+        with self._lock:
+            job_count = self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            search_count, fresh_count = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(refreshed_at > ?), 0) FROM searches",
+                (time.time() - self.stale_seconds,)
+            ).fetchone()
+        return job_count, search_count, fresh_count
+
+    async def stats(self) -> Dict[str, Any]:
+        job_count, search_count, fresh_count = await asyncio.to_thread(self._counts)
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "jobs": job_count,
+            "searches": search_count,
+            "fresh_searches": fresh_count
+        }
+
+_index: Optional[JobIndex] = None
+
+def get_job_index() -> JobIndex:
+    """The shared job index, opened on first use so nothing is created while it is disabled"""
+    global _index
+    if _index is None:
+        _index = JobIndex(
+            db_path=settings.JOB_INDEX_DB_PATH,
+            stale_seconds=settings.JOB_INDEX_STALE_SECONDS,
+            retention_seconds=settings.JOB_INDEX_RETENTION_SECONDS
+        )
+    return _index
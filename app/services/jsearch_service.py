@@ -1,66 +1,68 @@
-import httpx
 from typing import List, Dict, Any
 from app.core.config import settings
+from app.core.metrics import stage
+from app.models.job_models import JobRecord
+from app.services.providers import JobProvider, register_provider
 
-async def search_jsearch_jobs(query: str, location: str) -> List[Dict[Any, Any]]:
+@register_provider
+class JSearchProvider(JobProvider):
     """
     Search for jobs using JSearch API (covers multiple sources including Glassdoor, ZipRecruiter, etc.)
     """
-    url = settings.JSEARCH_API_URL
-    
-    headers = {
-        "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
-        "X-RapidAPI-Host": settings.JSEARCH_API_HOST
-    }
-    
-    # Convert the search criteria to JSearch API format
-    params = {
-        "query": f"{query} in {location}",
-        "page": "1",
-        "num_pages": "1"
-    }
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
+    name = "jsearch"
+    source = "JSearch"
+
+    async def fetch_page(self, query: str, location: str, page: int = 1) -> List[JobRecord]:
+        url = self.config.url
+        
+        headers = {
+            "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
+            "X-RapidAPI-Host": self.config.host
+        }
+        
+        # Convert the search criteria to JSearch API format
+        params = {
+            "query": f"{query} in {location}",
+            "page": str(page),
+            "num_pages": "1"
+        }
+        
+        # Errors propagate so the whole search fails instead of looking like a last page
+        response = await self.request("GET", url, params=params, headers=headers)
+        
+        with stage("normalize", provider=self.name):
             data = response.json()
             raw_jobs = data.get("data", [])
-            
+        
             # Normalize the job data to our standard format
             normalized_jobs = []
             for job in raw_jobs:
-                # Extract job nature
-                job_nature = "Not specified"
-                if job.get("job_employment_type"):
-                    job_nature = job.get("job_employment_type")
-                
                 # Extract salary information
-                salary = "Not specified"
+                salary = None
                 if job.get("job_min_salary") and job.get("job_max_salary"):
-                    salary = f"{job.get('job_min_salary')} - {job.get('job_max_salary')} {job.get('job_salary_currency', '')}"
+                    amount = f"{job.get('job_min_salary')} - {job.get('job_max_salary')}"
                 elif job.get("job_salary_period") and job.get("job_salary"):
-                    salary = f"{job.get('job_salary')} {job.get('job_salary_currency', '')} {job.get('job_salary_period')}"
+                    amount = str(job.get("job_salary"))
+                else:
+                    amount = None
+                if amount:
+                    # Keep the currency and period so the salary parser can read them back
+                    salary = " ".join(part for part in (amount, job.get("job_salary_currency"), job.get("job_salary_period")) if part)
                 
+                # JSearch gives experience as a bare number of months
+                months = (job.get("job_required_experience") or {}).get("required_experience_in_months")
+            
                 # Extract relevant information
-                normalized_job = {
-                    "job_title": job.get("job_title", ""),
-                    "company": job.get("employer_name", ""),
-                    "experience": job.get("job_required_experience", {}).get("required_experience_in_months", "Not specified"),
-                    "jobNature": job_nature,
-                    "location": job.get("job_city", "") + ", " + job.get("job_country", ""),
-                    "salary": salary,
-                    "apply_link": job.get("job_apply_link", ""),
-                    "source": "JSearch",
-                    "raw_description": job.get("job_description", "")
-                }
+                normalized_job = self.make_job(
+                    job_title=job.get("job_title"),
+                    company=job.get("employer_name"),
+                    experience=f"{months} months" if months else None,
+                    jobNature=job.get("job_employment_type"),
+                    location=", ".join(part for part in (job.get("job_city"), job.get("job_country")) if part),
+                    salary=salary,
+                    apply_link=job.get("job_apply_link"),
+                    raw_description=job.get("job_description")
+                )
                 normalized_jobs.append(normalized_job)
-                
-            return normalized_jobs
-    except httpx.HTTPStatusError as e:
-        print(f"HTTP error occurred with JSearch API: {e}")
-        return []
-    except Exception as e:
-        print(f"Error fetching JSearch jobs: {e}")
-        return []
\ No newline at end of file
+            
+        return normalized_jobs
@@ -1,22 +1,60 @@
-import openai
-from typing import List, Dict, Any
+import asyncio
+import json
+import re
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, AsyncIterator, Tuple
+
 from app.core.config import settings
-from app.models.job_models import JobSearchRequest
+from app.core.metrics import metrics, stage
+from app.core.resilience import get_upstream
+from app.models.job_models import JobRecord, JobSearchRequest, TokenUsage
+from app.services.prefilter import tokenize
+from app.services.prompt_compaction import compact_description, estimate_tokens
+from app.services.score_cache import score_cache, make_score_key
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Everything that is the same for every call goes in the system message, ahead of
+# the listings. OpenAI only caches prompts whose shared prefix reaches 1024 tokens,
+# which this one doesn't, so cached_prompt_tokens normally stays at 0.
+SYSTEM_PROMPT = """You are a job matching assistant that analyzes job listings for relevance to search criteria.
+
+Task: Analyze if each job listing in the user message is relevant to the given search criteria.
 
-# Configure OpenAI API key
-openai.api_key = settings.OPENAI_API_KEY
+Instructions:
+1. Analyze if each job matches the position, experience level, and skills required.
+2. Check if the job location matches or is remote if that was specified.
+3. Determine if the job nature (onsite/remote/hybrid) aligns with the criteria.
+4. Provide a relevance score from 0 to 100 for each job, where:
+   - 0-30: Not relevant
+   - 31-70: Somewhat relevant
+   - 71-100: Highly relevant
 
-async def filter_relevant_jobs(jobs: List[Dict[Any, Any]], search_criteria: JobSearchRequest) -> List[Dict[Any, Any]]:
+Please respond with ONLY a JSON object in this format, with one entry per Job ID:
+{"results": [{"id": <job id>, "relevance_score": <score>, "is_relevant": <true/false>}]}"""
+
+_client: Optional["AsyncOpenAI"] = None
+
+def get_openai_client() -> "AsyncOpenAI":
     """
-    Use OpenAI to analyze job descriptions and filter for relevance based on search criteria
+    Return the shared async OpenAI client, creating it on first use
     """
-    if not jobs:
-        return []
-    
-    relevant_jobs = []
-    
-    # Prepare the search criteria as a string
-    criteria_string = f"""
+    global _client
+    if _client is None:
+        # Imported here since the SDK is slow to import and only needed once a job is scored
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            max_retries=0  # Retries are handled by the "openai" upstream policy
+        )
+    return _client
+
+def build_criteria_string(search_criteria: JobSearchRequest) -> str:
+    """
+    Render the search criteria as the text block used in scoring prompts
+    """
+    return f"""
     Position: {search_criteria.position}
     Experience: {search_criteria.experience}
     Salary: {search_criteria.salary}
@@ -24,89 +62,248 @@ async def filter_relevant_jobs(jobs: List[Dict[Any, Any]], search_criteria: JobS
     Location: {search_criteria.location}
     Skills: {search_criteria.skills}
     """
-    
-    for job in jobs:
-        # Skip jobs with no description
-        if not job.get("raw_description"):
+
+def build_batch_prompt(batch: List[JobRecord], criteria_string: str, usage: Optional[TokenUsage] = None) -> str:
+    """
+    Create the user message asking for a relevance score for every job in the batch.
+    Descriptions are compacted to PROMPT_DESCRIPTION_TOKEN_BUDGET tokens each.
+    """
+    criteria_tokens = set(tokenize(criteria_string))
+    listings = []
+    for job_id, job in enumerate(batch):
+        description = job.raw_description
+        if settings.PROMPT_COMPACTION_ENABLED:
+            description = compact_description(description, settings.PROMPT_DESCRIPTION_TOKEN_BUDGET, criteria_tokens)
+            if usage is not None:
+                usage.description_tokens_saved += estimate_tokens(job.raw_description) - estimate_tokens(description)
+        listings.append(f"""
+Job ID: {job_id}
+Job Title: {job.job_title}
+Company: {job.company}
+Location: {job.location}
+Job Type: {job.jobNature}
+Description: {description}
+""")
+
+    return f"""Search Criteria:
+{criteria_string}
+
+Job Listings:
+{"".join(listings)}"""
+
+def record_usage(usage: Optional[TokenUsage], response: Any):
+    """
+    Add the token counts reported for one completion to `usage` and to the token metrics
+    """
+    reported = getattr(response, "usage", None)
+    prompt_tokens = getattr(reported, "prompt_tokens", None) or 0
+    completion_tokens = getattr(reported, "completion_tokens", None) or 0
+    cached_tokens = getattr(getattr(reported, "prompt_tokens_details", None), "cached_tokens", None) or 0
+
+    metrics.inc("job_finder_llm_tokens_total", prompt_tokens, kind="prompt")
+    metrics.inc("job_finder_llm_tokens_total", completion_tokens, kind="completion")
+    metrics.inc("job_finder_llm_tokens_total", cached_tokens, kind="cached_prompt")
+
+    if usage is None:
+        return
+    usage.requests += 1
+    usage.prompt_tokens += prompt_tokens
+    usage.completion_tokens += completion_tokens
+    usage.cached_prompt_tokens += cached_tokens
+
+def parse_batch_scores(result_text: str, batch_size: int) -> Dict[int, Dict[str, Any]]:
+    """
+    Map each job ID in the model reply to its score, ignoring entries that
+    are malformed or refer to IDs outside the batch
+    """
+    # Try to extract the JSON part if there's any text before or after
+    json_match = re.search(r'[\{\[].*[\}\]]', result_text, re.DOTALL)
+    if not json_match:
+        return {}
+
+    try:
+        result_json = json.loads(json_match.group(0))
+    except ValueError:
+        return {}
+
+    if isinstance(result_json, dict):
+        # A single-job batch may come back as a bare score object
+        if "results" not in result_json and batch_size == 1:
+            result_json = {"results": [dict(result_json, id=0)]}
+        entries = result_json.get("results", [])
+    else:
+        entries = result_json
+
+    scores = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
             continue
-        
-        # Create a prompt for OpenAI
-        prompt = f"""
-        Task: Analyze if the job listing below is relevant to the given search criteria.
-        
-        Search Criteria:
-        {criteria_string}
-        
-        Job Listing:
-        Job Title: {job.get('job_title', '')}
-        Company: {job.get('company', '')}
-        Location: {job.get('location', '')}
-        Job Type: {job.get('jobNature', '')}
-        Description: {job.get('raw_description', '')}
-        
-        Instructions:
-        1. Analyze if this job matches the position, experience level, and skills required.
-        2. Check if the job location matches or is remote if that was specified.
-        3. Determine if the job nature (onsite/remote/hybrid) aligns with the criteria.
-        4. Provide a relevance score from 0 to 100, where:
-           - 0-30: Not relevant
-           - 31-70: Somewhat relevant
-           - 71-100: Highly relevant
-        
-        Please respond with ONLY a JSON object in this format:
-        {{"relevance_score": <score>, "is_relevant": <true/false>}}
-        """
-        
         try:
-            # Call OpenAI API
-            response = await openai.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a job matching assistant that analyzes job listings for relevance to search criteria."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1  # Low temperature for more deterministic results
+            job_id = int(entry.get("id"))
+            relevance_score = float(entry.get("relevance_score", 0))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= job_id < batch_size and job_id not in scores:
+            scores[job_id] = {
+                "relevance_score": relevance_score,
+                "is_relevant": bool(entry.get("is_relevant", False))
+            }
+    return scores
+
+async def _request_batch_scores(batch: List[JobRecord], criteria_string: str,
+                                usage: Optional[TokenUsage] = None, retry: bool = False) -> Dict[int, Dict[str, Any]]:
+    """
+    Send one chat completion for the batch and return the parsed per-job scores.
+    On a `retry` the jobs' compaction savings were already counted, so they aren't again.
+    """
+    with stage("prompt"):
+        prompt = build_batch_prompt(batch, criteria_string, None if retry else usage)
+    metrics.inc("job_finder_llm_calls_total", kind="chat")
+    with stage("llm_call"):
+        response = await get_upstream("openai").call(lambda: get_openai_client().chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1  # Low temperature for more deterministic results
+        ))
+    record_usage(usage, response)
+    result_text = (response.choices[0].message.content or "").strip()
+    return parse_batch_scores(result_text, len(batch))
+
+async def _score_batch(batch: List[JobRecord], criteria_string: str, semaphore: asyncio.Semaphore,
+                       usage: Optional[TokenUsage] = None, retry: bool = False) -> List[Dict[str, Any]]:
+    """
+    Score a batch of jobs, returning one result per job in batch order
+    """
+    try:
+        async with semaphore:
+            scores = await _request_batch_scores(batch, criteria_string, usage, retry)
+
+        # Jobs the model skipped or garbled are retried one at a time
+        missing = [job_id for job_id in range(len(batch)) if job_id not in scores]
+        if missing and len(batch) > 1:
+            retried = await asyncio.gather(
+                *[_score_batch([batch[job_id]], criteria_string, semaphore, usage, retry=True) for job_id in missing]
             )
-            
-            # Parse the response
-            result_text = response.choices[0].message.content.strip()
-            
-            # Try to extract the JSON part if there's any text before or after
-            import json
-            import re
-            
-            json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if json_match:
-                result_json = json.loads(json_match.group(0))
-            else:
-                # If no JSON found, default to not relevant
-                result_json = {"relevance_score": 0, "is_relevant": False}
-            
-            # Check if the job is relevant
-            if result_json.get("is_relevant", False):
-                # Remove raw description as it's no longer needed
-                if "raw_description" in job:
-                    del job["raw_description"]
-                
-                # Add relevance score
-                job["relevance_score"] = result_json.get("relevance_score", 0)
-                
-                relevant_jobs.append(job)
-                
-        except Exception as e:
-            print(f"Error with OpenAI analysis: {e}")
-            # If there's an error, add the job anyway but with a lower relevance score
-            if "raw_description" in job:
-                del job["raw_description"]
-            job["relevance_score"] = 50  # Neutral score
+            for job_id, result in zip(missing, retried):
+                scores[job_id] = result[0]
+
+        # If no score could be found, default to not relevant
+        return [scores.get(job_id, {"relevance_score": 0, "is_relevant": False, "error": True}) for job_id in range(len(batch))]
+
+    except Exception as e:
+        print(f"Error with OpenAI analysis: {e}")
+        # If there's an error, keep the jobs anyway but with a neutral relevance score
+        return [{"relevance_score": 50, "is_relevant": True, "error": True} for _ in batch]
+
+async def score_jobs(jobs: List[JobRecord], search_criteria: JobSearchRequest,
+                     semaphore: Optional[asyncio.Semaphore] = None,
+                     usage: Optional[TokenUsage] = None) -> AsyncIterator[Tuple[JobRecord, Dict[str, Any]]]:
+    """
+    Score jobs and yield `(job, result)` pairs as soon as each score is known.
+    Cached scores come first, then each batch as its completion returns. Jobs
+    without a description are skipped and the jobs themselves are not modified.
+    Tokens spent are added to `usage` when one is given. With SCORING_MODE set to
+    "embedding", scoring is delegated to embedding_service instead.
+    """
+    if settings.SCORING_MODE == "embedding":
+        # Imported here so numpy is only needed when embedding scoring is enabled
+        from app.services import embedding_service
+        async for job, result in embedding_service.score_jobs(jobs, search_criteria, semaphore, usage):
+            yield job, result
+        return
+
+    # Skip jobs with no description
+    candidates = [job for job in jobs if job.raw_description]
+    if not candidates:
+        return
+
+    criteria_string = build_criteria_string(search_criteria)
+
+    # Look up cached scores first and only send the misses to the model
+    cache_keys = [
+        make_score_key(job, criteria_string) if settings.SCORE_CACHE_ENABLED else None for job in candidates
+    ]
+    cached_results = await score_cache.get_many(cache_keys)
+    pending = []
+    for job, cache_key, cached in zip(candidates, cache_keys, cached_results):
+        if cached is not None:
+            yield job, cached
+        else:
+            pending.append((job, cache_key))
+
+    batch_size = max(1, settings.SCORING_BATCH_SIZE)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.SCORING_MAX_CONCURRENCY))
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    async def run_batch(batch):
+        return batch, await _score_batch([job for job, _ in batch], criteria_string, semaphore, usage)
+
+    tasks = [asyncio.ensure_future(run_batch(batch)) for batch in batches]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            batch, results = await next_done
+            # Fallback scores from failed calls are not worth remembering
+            await score_cache.set_many([
+                (cache_key, result) for (_, cache_key), result in zip(batch, results)
+                if cache_key and not result.get("error")
+            ])
+            for (job, _), result in zip(batch, results):
+                yield job, result
+    finally:
+        # Stop outstanding batches if the consumer goes away early
+        for task in tasks:
+            task.cancel()
+
+async def filter_relevant_jobs(jobs: List[JobRecord], search_criteria: JobSearchRequest,
+                               timeout: Optional[float] = None, usage: Optional[TokenUsage] = None,
+                               scored: Optional[List[JobRecord]] = None) -> List[JobRecord]:
+    """
+    Use OpenAI to analyze job descriptions and filter for relevance based on search criteria.
+    Jobs are scored in batches of SCORING_BATCH_SIZE with up to SCORING_MAX_CONCURRENCY
+    requests in flight at once. Scores already in the score cache are reused.
+    If `timeout` seconds pass first, only the jobs scored so far are returned.
+    Descriptions are released from every job once scoring is over. When a `scored` list
+    is given, every job that got a score is appended to it and only those jobs lose
+    their descriptions, so the caller can score the rest later.
+    """
+    if not jobs:
+        return []
+
+    # Scores arrive in completion order, so ties are broken by input order
+    positions = {id(job): index for index, job in enumerate(jobs)}
+
+    relevant_jobs = []
+    scores = score_jobs(jobs, search_criteria, usage=usage)
+
+    async def collect():
+        async for job, result in scores:
+            if scored is not None:
+                scored.append(job)
+            if not result["is_relevant"]:
+                continue
+
+            # Add relevance score
+            job.relevance_score = result["relevance_score"]
             relevant_jobs.append(job)
-    
+
+    try:
+        await asyncio.wait_for(collect(), timeout)
+    except asyncio.TimeoutError:
+        print(f"Relevance scoring ran out of time; keeping {len(relevant_jobs)} jobs scored so far")
+    finally:
+        # Close the generator now so its in-flight batches are cancelled right away,
+        # not whenever the garbage collector finalizes it
+        await scores.aclose()
+        # Raw descriptions are no longer needed, for kept and dropped jobs alike
+        for job in (jobs if scored is None else scored):
+            job.release_description()
+
     # Sort by relevance score (highest first)
-    relevant_jobs.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-    
-    # Remove relevance score from the final output
-    for job in relevant_jobs:
-        if "relevance_score" in job:
-            del job["relevance_score"]
-    
-    return relevant_jobs
\ No newline at end of file
+    with stage("sort"):
+        relevant_jobs.sort(key=lambda x: (-(x.relevance_score or 0), positions[id(x)]))
+
+    return relevant_jobs
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.models.job_models import JobRecord
+
+PageFetcher = Callable[[int], Awaitable[List[JobRecord]]]
+
+async def fetch_pages(fetch_page: PageFetcher, max_pages: int, concurrency: int,
+                      enough: Optional[Callable[[List[JobRecord]], bool]] = None) -> List[JobRecord]:
+    """
+    Fetch pages 1..max_pages with at most `concurrency` requests in flight.
+    `fetch_page` returns the normalized jobs of one page, so each page is
+    normalized as soon as it arrives. Paging stops early once a page comes
+    back empty or `enough` reports that the jobs collected so far suffice;
+    outstanding page requests are then cancelled. Jobs are returned in page order.
+    If any page fails the whole fetch raises, so a partial result isn't mistaken
+    for a complete one.
+    """
+    max_pages = max(1, max_pages)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(page: int):
+        async with semaphore:
+            return page, await fetch_page(page)
+
+    tasks = [asyncio.ensure_future(run(page)) for page in range(1, max_pages + 1)]
+    pages: Dict[int, List[JobRecord]] = {}
+    last_page = max_pages
+
+    def collected() -> List[JobRecord]:
+        return [job for page in sorted(pages) if page <= last_page for job in pages[page]]
+
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page, jobs = task.result()
+                if page > last_page:
+                    # Finished before an earlier empty page cancelled it
+                    continue
+                pages[page] = jobs
+                if not jobs:
+                    # Nothing past an empty page; drop those requests without waiting on them
+                    last_page = min(last_page, page - 1)
+                    for later in tasks[page:]:
+                        later.cancel()
+                    pending.difference_update(tasks[page:])
+
+            if all(page in pages for page in range(1, last_page + 1)):
+                break
+            if enough is not None and enough(collected()):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return collected()
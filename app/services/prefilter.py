@@ -0,0 +1,138 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, List, Dict, Any, Optional
+
+from app.core.config import settings
+from app.models.job_models import JobRecord, JobSearchRequest
+from app.services.structured_fields import SearchConstraints, filter_by_constraints
+
+# Words that carry no signal when matching job postings
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "our", "the", "to", "we", "with", "you", "your", "will", "this", "that", "job", "jobs", "role"
+}
+
+# BM25 parameters and how many times the title counts relative to the description
+BM25_K1 = 1.5
+BM25_B = 0.75
+TITLE_WEIGHT = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping things like c++, c#, node.js intact"""
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+def bm25_scores(query_tokens: List[str], documents: List[List[str]]) -> List[float]:
+    """
+    Score each tokenized document against the query with Okapi BM25
+    """
+    if not documents:
+        return []
+
+    terms = set(query_tokens)
+    doc_count = len(documents)
+    avg_length = sum(len(doc) for doc in documents) / doc_count or 1.0
+
+    frequencies = [Counter(doc) for doc in documents]
+    idf = {}
+    for term in terms:
+        df = sum(1 for counts in frequencies if term in counts)
+        idf[term] = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for doc, counts in zip(documents, frequencies):
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_length)
+        score = 0.0
+        for term in terms:
+            tf = counts.get(term)
+            if tf:
+                score += idf[term] * tf * (BM25_K1 + 1) / (tf + length_norm)
+        scores.append(score)
+    return scores
+
+def _is_remote(job: JobRecord) -> bool:
+    return "remote" in f"{job.jobNature} {job.location}".lower()
+
+def _rule_multiplier(job: JobRecord, search_request: JobSearchRequest, location_tokens: set) -> float:
+    """Cheap location and jobNature rules applied on top of text similarity"""
+    multiplier = 1.0
+    wanted_nature = (search_request.jobNature or "").lower()
+    job_nature = job.jobNature.lower()
+    remote = _is_remote(job)
+
+    if location_tokens and location_tokens & set(tokenize(job.location)):
+        multiplier *= 1.25
+    elif remote and "remote" in wanted_nature:
+        multiplier *= 1.25
+    elif location_tokens and not remote:
+        multiplier *= 0.75
+
+    # Only penalize a clear mismatch; "Not specified" and employment types stay neutral
+    if "remote" in wanted_nature and "onsite" in job_nature:
+        multiplier *= 0.5
+    elif "onsite" in wanted_nature and remote:
+        multiplier *= 0.5
+    return multiplier
+
+def local_relevance_scores(jobs: List[JobRecord], search_request: JobSearchRequest,
+                           weights: Optional[Dict[str, float]] = None) -> List[float]:
+    """
+    Rank jobs locally by BM25 similarity between the requested position/skills and
+    the job title/description, adjusted by location and jobNature rules and by the
+    per-source `weights` (keyed by JobListing.source), if given
+    """
+    weights = weights or {}
+    query_tokens = tokenize(f"{search_request.position} {search_request.skills}")
+    location_tokens = set(tokenize(search_request.location))
+    documents = [
+        tokenize(job.job_title) * TITLE_WEIGHT + tokenize(job.raw_description)
+        for job in jobs
+    ]
+    return [
+        score * _rule_multiplier(job, search_request, location_tokens) * weights.get(job.source, 1.0)
+        for job, score in zip(jobs, bm25_scores(query_tokens, documents))
+    ]
+
+def prefilter_jobs(jobs: List[JobRecord], search_request: JobSearchRequest, top_k: Optional[int] = None,
+                   weights: Optional[Dict[str, float]] = None) -> List[JobRecord]:
+    """
+    Keep only the `top_k` best local matches (PREFILTER_TOP_K by default) so the
+    LLM only sees plausible candidates. Jobs without a description are dropped,
+    since they can't be scored anyway, and so are jobs whose parsed salary or
+    experience rules them out.
+    """
+    candidates = filter_by_constraints([job for job in jobs if job.raw_description], search_request)
+    if not settings.PREFILTER_ENABLED or not candidates:
+        return candidates
+
+    top_k = settings.PREFILTER_TOP_K if top_k is None else top_k
+    scores = local_relevance_scores(candidates, search_request, weights)
+    ranked = sorted(range(len(candidates)), key=lambda index: scores[index], reverse=True)
+    return [
+        candidates[index] for index in ranked[:top_k]
+        if scores[index] > settings.PREFILTER_MIN_SCORE
+    ]
+
+def enough_candidates(search_request: Optional[JobSearchRequest], target: Optional[int] = None) -> Optional[Callable[[List[JobRecord]], bool]]:
+    """
+    Build a stop condition for paging: true once `target` jobs (PAGINATION_TARGET_CANDIDATES
+    by default) pass the pre-filter threshold. Returns None when there is nothing to check against.
+    """
+    if search_request is None or not settings.PREFILTER_ENABLED:
+        return None
+    target = settings.PAGINATION_TARGET_CANDIDATES if target is None else target
+    constraints = SearchConstraints(search_request)
+    check_constraints = settings.STRUCTURED_FILTER_ENABLED and constraints.active
+
+    def enough(jobs: List[JobRecord]) -> bool:
+        candidates = [
+            job for job in jobs if job.raw_description and (not check_constraints or constraints.allows(job))
+        ]
+        if len(candidates) < target:
+            return False
+        scores = local_relevance_scores(candidates, search_request)
+        return sum(1 for score in scores if score > settings.PREFILTER_MIN_SCORE) >= target
+
+    return enough
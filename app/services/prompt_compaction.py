@@ -0,0 +1,70 @@
+import re
+from typing import List, Set
+
+from app.services.prefilter import tokenize
+
+# Rough size of a token for English text; close enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Words that mark the parts of a posting the scorer actually needs
+SECTION_KEYWORDS = {
+    "requirement", "requirements", "required", "qualification", "qualifications", "skill", "skills",
+    "experience", "experienced", "years", "yrs", "must", "proficient", "proficiency", "knowledge",
+    "stack", "degree", "responsibilities", "remote", "onsite", "on-site", "hybrid", "salary"
+}
+
+_YEARS_RE = re.compile(r"\d+\s*\+?\s*(?:-\s*\d+\s*)?(?:years?|yrs?)", re.IGNORECASE)
+_SEGMENT_RE = re.compile(r"(?<=[.!?])\s+|\s*[\r\n•·]+\s*")
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of `text`"""
+    return -(-len(text or "") // CHARS_PER_TOKEN)
+
+def _segment_score(segment: str, criteria_tokens: Set[str]) -> float:
+    tokens = tokenize(segment)
+    if not tokens:
+        return 0.0
+    score = 2.0 * sum(1 for token in tokens if token in SECTION_KEYWORDS)
+    score += sum(1 for token in set(tokens) if token in criteria_tokens)
+    if _YEARS_RE.search(segment):
+        score += 3.0
+    return score
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut + " ..."
+
+def compact_description(description: str, token_budget: int, criteria_tokens: Set[str]) -> str:
+    """
+    Fit a job description into `token_budget` tokens. Short descriptions are returned
+    as-is; longer ones keep the sentences that mention requirements, skills, experience
+    or the search terms, in their original order, and fall back to the opening text.
+    """
+    text = re.sub(r"[ \t]+", " ", description or "").strip()
+    if token_budget <= 0 or estimate_tokens(text) <= token_budget:
+        return text
+
+    segments = [segment for segment in _SEGMENT_RE.split(text) if segment and segment.strip()]
+    max_chars = token_budget * CHARS_PER_TOKEN
+
+    # Highest scoring sentences first; the opening sentence usually says what the role is
+    ranked = sorted(
+        range(len(segments)),
+        key=lambda i: (-(_segment_score(segments[i], criteria_tokens) + (1.0 if i == 0 else 0.0)), i)
+    )
+
+    chosen: List[int] = []
+    used = 0
+    for i in ranked:
+        length = len(segments[i]) + 1
+        if used + length > max_chars:
+            continue
+        chosen.append(i)
+        used += length
+
+    if not chosen:
+        return _truncate(text, max_chars)
+
+    return " ".join(segments[i] for i in sorted(chosen))
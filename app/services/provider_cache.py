@@ -0,0 +1,129 @@
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.state_backend import get_state_backend, state_key
+from app.models.job_models import JobRecord, dump_jobs, load_jobs
+
+class ProviderCache:
+    """
+    TTL cache for provider result pages with single-flight request coalescing:
+    concurrent callers asking for the same key share one upstream request. With a
+    shared state backend, results fetched by other workers are reused before going out.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.shared_hits = 0
+        self._entries: "OrderedDict[Tuple[str, str, str, str], Tuple[float, List[JobRecord]]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str, str], asyncio.Task] = {}
+        self._waiters: Dict[Tuple[str, str, str, str], int] = {}
+
+    async def get_or_fetch(self, key: Tuple[str, str, str, str], ttl_seconds: int, fetch: Callable[[], Awaitable[List[JobRecord]]]) -> List[JobRecord]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_jobs(entry[1])
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, ttl_seconds, fetch))
+            self._in_flight[key] = task
+
+        # Shield the shared request so one cancelled caller doesn't cancel it for everyone,
+        # but cancel it once the last caller waiting on it has given up
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            jobs = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+                self._in_flight.pop(key, None)
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+        return _copy_jobs(jobs)
+
+    async def _fetch(self, key, ttl_seconds: int, fetch) -> List[JobRecord]:
+        try:
+            backend = get_state_backend() if ttl_seconds > 0 else None
+            shared_key = state_key("provider", *key)
+            if backend is not None:
+                jobs = await self._get_shared(backend, shared_key)
+                if jobs:
+                    self.shared_hits += 1
+                    self._remember(key, ttl_seconds, jobs)
+                    return jobs
+
+            jobs = await fetch()
+            # Failed searches raise and are never cached; an empty result is a real answer
+            if ttl_seconds > 0:
+                self._remember(key, ttl_seconds, jobs)
+                if backend is not None:
+                    await self._set_shared(backend, shared_key, ttl_seconds, jobs)
+            return jobs
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+    def _remember(self, key, ttl_seconds: int, jobs: List[JobRecord]):
+        self._entries[key] = (time.monotonic() + ttl_seconds, jobs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_shared(self, backend, shared_key: str) -> List[JobRecord]:
+        try:
+            value = await backend.get(shared_key)
+        except Exception as e:
+            print(f"Shared provider cache unavailable: {e}")
+            return []
+        return load_jobs(json.loads(value)) if value else []
+
+    async def _set_shared(self, backend, shared_key: str, ttl_seconds: int, jobs: List[JobRecord]):
+        try:
+            await backend.set(shared_key, json.dumps(dump_jobs(jobs)).encode("utf-8"), ttl_seconds)
+        except Exception as e:
+            print(f"Shared provider cache unavailable: {e}")
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "shared_hits": self.shared_hits,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight)
+        }
+
+def _copy_jobs(jobs: List[JobRecord]) -> List[JobRecord]:
+    # Callers update records during scoring, so each one gets its own shallow
+    # copies; the field strings themselves stay shared with the cache
+    return [copy.copy(job) for job in jobs]
+
+def _normalize(value: str) -> str:
+    return " ".join((value or "").lower().split())
+
+def make_search_key(provider: str, query: str, location: str, page: int) -> Tuple[str, str, str, str]:
+    """Cache key for one page of a provider search, insensitive to case and extra whitespace"""
+    return (provider, _normalize(query), _normalize(location), str(page))
+
+provider_cache = ProviderCache(max_entries=settings.PROVIDER_CACHE_MAX_ENTRIES)
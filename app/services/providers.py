@@ -0,0 +1,189 @@
+import importlib
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Type
+
+import httpx
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.metrics import stage
+from app.core.resilience import CircuitOpenError, get_upstream
+from app.models.job_models import JobRecord, JobSearchRequest
+from app.services.pagination import fetch_pages
+from app.services.prefilter import enough_candidates
+from app.services.provider_cache import provider_cache, make_search_key
+from app.services.structured_fields import parse_job_fields
+
+# Built-in providers and the modules that define them. Modules are only
+# imported when their provider is enabled in ENABLED_PROVIDERS.
+PROVIDER_MODULES = {
+    "linkedin": "app.services.linkedin_service",
+    "indeed": "app.services.indeed_service",
+    "jsearch": "app.services.jsearch_service",
+    "indeed_scraper": "app.services.indeed_scraper"
+}
+
+# Fields every provider fills in, with the value used when one is missing
+JOB_FIELD_DEFAULTS = {
+    "job_title": "",
+    "company": "",
+    "experience": "Not specified",
+    "jobNature": "Not specified",
+    "location": "",
+    "salary": "Not specified",
+    "apply_link": "",
+    "source": "",
+    "raw_description": ""
+}
+
+def normalize_job(**fields: Any) -> JobRecord:
+    """
+    Build a JobRecord in the shared schema. Missing or empty values fall back to
+    their defaults and everything else is coerced to a string. The few distinct
+    source and jobNature values are interned so all records share them, and salary
+    and experience are parsed into numeric ranges.
+    """
+    values = {}
+    for field, default in JOB_FIELD_DEFAULTS.items():
+        value = fields.get(field)
+        values[field] = default if value is None or value == "" else str(value).strip()
+    values["source"] = sys.intern(values["source"])
+    values["jobNature"] = sys.intern(values["jobNature"])
+    return parse_job_fields(JobRecord(**values))
+
+@dataclass
+class ProviderConfig:
+    """Per-provider settings, read from `<NAME>_*` attributes of Settings"""
+    name: str
+    url: str
+    host: str
+    timeout_seconds: float
+    max_pages: int
+    page_concurrency: int
+    cache_ttl_seconds: int
+    weight: float
+
+    @classmethod
+    def from_settings(cls, name: str) -> "ProviderConfig":
+        prefix = name.upper()
+        return cls(
+            name=name,
+            url=getattr(settings, f"{prefix}_API_URL", ""),
+            host=getattr(settings, f"{prefix}_API_HOST", ""),
+            timeout_seconds=getattr(settings, f"{prefix}_TIMEOUT_SECONDS", settings.PROVIDER_TIMEOUT_SECONDS),
+            max_pages=getattr(settings, f"{prefix}_MAX_PAGES", settings.PROVIDER_MAX_PAGES),
+            page_concurrency=getattr(settings, f"{prefix}_PAGE_CONCURRENCY", settings.PROVIDER_PAGE_CONCURRENCY),
+            cache_ttl_seconds=getattr(settings, f"{prefix}_CACHE_TTL_SECONDS", 0),
+            weight=getattr(settings, f"{prefix}_WEIGHT", 1.0)
+        )
+
+class JobProvider(ABC):
+    """
+    Common async adapter for a job source. Subclasses set `name` (registry key and
+    settings prefix) and `source` (shown in JobListing.source) and implement
+    `fetch_page`; paging, caching, request coalescing, rate limiting and retries
+    are shared.
+    """
+    name: str = ""
+    source: str = ""
+
+    def __init__(self, config: Optional[ProviderConfig] = None):
+        self.config = config or ProviderConfig.from_settings(self.name)
+        self.upstream = get_upstream(self.name)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request on the shared HTTP client under this provider's rate limit,
+        retry and circuit breaker policy; raises for error statuses
+        """
+        async def send() -> httpx.Response:
+            response = await get_http_client().request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return await self.upstream.call(send)
+
+    @abstractmethod
+    async def fetch_page(self, query: str, location: str, page: int) -> List[JobRecord]:
+        """
+        Fetch and normalize one page of results, or [] past the last page. Errors,
+        including exhausted retries and an open circuit, are raised, not returned as [].
+        """
+
+    async def search(self, query: str, location: str, search_request: Optional[JobSearchRequest] = None) -> List[JobRecord]:
+        """
+        Search this source. Up to `max_pages` pages are fetched concurrently; paging stops
+        early once enough jobs pass the pre-filter for `search_request`. Each page is cached
+        for `cache_ttl_seconds` by query and location, and concurrent searches asking for
+        the same page share one upstream request.
+        """
+        if not self.upstream.available():
+            # Fail fast so the source is reported missing instead of waiting out its timeout
+            raise CircuitOpenError(f"{self.source} is failing; skipped until its circuit resets")
+
+        with stage("provider", provider=self.name):
+            # Pages are cached one by one, so a search that stopped early still shares its
+            # pages with every search for the same query and location, whatever its depth
+            return await fetch_pages(
+                lambda page: self._fetch_cached_page(query, location, page),
+                max_pages=self.config.max_pages,
+                concurrency=self.config.page_concurrency,
+                enough=enough_candidates(search_request)
+            )
+
+    async def _fetch_cached_page(self, query: str, location: str, page: int) -> List[JobRecord]:
+        return await provider_cache.get_or_fetch(
+            make_search_key(self.name, query, location, page), self.config.cache_ttl_seconds,
+            lambda: self.fetch_page(query, location, page)
+        )
+
+    async def start(self):
+        """Acquire long-lived resources at app startup (nothing by default)"""
+
+    async def close(self):
+        """Release long-lived resources at app shutdown (nothing by default)"""
+
+    def make_job(self, **fields: Any) -> JobRecord:
+        """Normalize a job from this provider into the shared schema"""
+        return normalize_job(source=self.source, **fields)
+
+_registry: Dict[str, Type[JobProvider]] = {}
+_instances: Dict[str, JobProvider] = {}
+
+def register_provider(provider_class: Type[JobProvider]) -> Type[JobProvider]:
+    """Class decorator that makes a provider available by its `name`"""
+    if provider_class.__abstractmethods__:
+        raise TypeError(f"{provider_class.__name__} must implement {', '.join(sorted(provider_class.__abstractmethods__))}")
+    _registry[provider_class.name] = provider_class
+    return provider_class
+
+def get_provider(name: str) -> JobProvider:
+    """Return the shared instance of a provider, importing its module on first use"""
+    if name not in _instances:
+        if name not in _registry and name in PROVIDER_MODULES:
+            importlib.import_module(PROVIDER_MODULES[name])
+        if name not in _registry:
+            raise ValueError(f"Unknown job provider: {name}")
+        _instances[name] = _registry[name]()
+    return _instances[name]
+
+def get_enabled_providers() -> List[JobProvider]:
+    """Providers listed in ENABLED_PROVIDERS, in that order"""
+    names = [name.strip().lower() for name in settings.ENABLED_PROVIDERS.split(",") if name.strip()]
+    return [get_provider(name) for name in names]
+
+def source_weights() -> Dict[str, float]:
+    """Ranking weight per JobListing.source for the enabled providers"""
+    return {provider.source: provider.config.weight for provider in get_enabled_providers()}
+
+async def start_providers():
+    """Start every enabled provider (called from the FastAPI lifespan)"""
+    for provider in get_enabled_providers():
+        await provider.start()
+
+async def close_providers():
+    """Close every provider that was created"""
+    for provider in list(_instances.values()):
+        await provider.close()
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.state_backend import get_state_backend, state_key
+from app.models.job_models import JobRecord
+
+# Fields that identify the content of a job listing for scoring purposes
+SCORED_FIELDS = ("job_title", "company", "location", "jobNature", "raw_description")
+
+def _normalize(value: Any) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+# Reads from the on-disk tier go in chunks below SQLite's limit on query parameters
+_DISK_READ_CHUNK = 500
+
+def _scoring_settings() -> str:
+    """Settings that change what the model sees or which model answers"""
+    return f"{settings.OPENAI_MODEL}|{settings.PROMPT_COMPACTION_ENABLED}|{settings.PROMPT_DESCRIPTION_TOKEN_BUDGET}"
+
+def make_score_key(job: JobRecord, criteria_string: str) -> str:
+    """
+    Build a content-addressed cache key from the normalized job fields, the search
+    criteria and the scoring settings, so changing the model or prompt compaction
+    doesn't keep serving scores computed under the old ones
+    """
+    digest = hashlib.sha256()
+    digest.update(_scoring_settings().encode("utf-8"))
+    digest.update(b"\x1e")
+    for field in SCORED_FIELDS:
+        digest.update(_normalize(getattr(job, field)).encode("utf-8"))
+        digest.update(b"\x1f")
+    digest.update(_normalize(criteria_string).encode("utf-8"))
+    return digest.hexdigest()
+
+class ScoreCache:
+    """
+    Two-tier relevance score cache: an in-process LRU in front of an optional SQLite file.
+    Entries expire after `ttl_seconds` in both tiers. SQLite reads and writes are
+    batched per call and run in a thread, off the event loop. With a shared state
+    backend, get_many/set_many also consult it, so workers reuse each other's scores.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "key TEXT PRIMARY KEY, relevance_score REAL, is_relevant INTEGER, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def _get_local(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] > now:
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+        del self._entries[key]
+        return None
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Unexpired on-disk entries for `keys`, copied into the in-process tier"""
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _DISK_READ_CHUNK):
+                chunk = keys[start:start + _DISK_READ_CHUNK]
+                rows = self._db.execute(
+                    "SELECT key, relevance_score, is_relevant, expires_at FROM scores "
+                    f"WHERE key IN ({', '.join('?' * len(chunk))}) AND expires_at > ?",
+                    (*chunk, now)
+                ).fetchall()
+                for key, relevance_score, is_relevant, expires_at in rows:
+                    found[key] = {"relevance_score": relevance_score, "is_relevant": bool(is_relevant)}
+                    self._remember(key, found[key], expires_at)
+        return found
+
+    def _write_disk(self, rows: List[Tuple[str, float, int, float]]):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (key, relevance_score, is_relevant, expires_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            previous_writes = self._writes
+            self._writes += len(rows)
+            # Purge expired rows every so often instead of on every write
+            if self._writes // 500 != previous_writes // 500:
+                self._db.execute("DELETE FROM scores WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    async def get_many(self, keys: List[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up several keys (None entries are skipped) in the in-process tier, then the
+        local misses on disk in one query, then in the shared backend
+        """
+        now = time.time()
+        with self._lock:
+            results = [self._get_local(key, now) if key else None for key in keys]
+        missing = [i for i, key in enumerate(keys) if key and results[i] is None]
+
+        if self._db is not None and missing:
+            found = await asyncio.to_thread(self._read_disk, list({keys[i] for i in missing}))
+            for i in missing:
+                if keys[i] in found:
+                    results[i] = dict(found[keys[i]])
+                    self.disk_hits += 1
+            missing = [i for i in missing if results[i] is None]
+
+        backend = get_state_backend()
+        if backend is not None and missing:
+            try:
+                values = await backend.get_many([state_key("score", keys[i]) for i in missing])
+            except Exception as e:
+                print(f"Shared score cache unavailable: {e}")
+                values = [None] * len(missing)
+            expires_at = time.time() + self.ttl_seconds
+            for i, value in zip(missing, values):
+                if value is not None:
+                    results[i] = json.loads(value)
+                    with self._lock:
+                        self._remember(keys[i], results[i], expires_at)
+                    self.shared_hits += 1
+            missing = [i for i in missing if results[i] is None]
+
+        lookups = sum(1 for key in keys if key)
+        self.misses += len(missing)
+        self.hits += lookups - len(missing)
+        return results
+
+    async def set_many(self, items: List[Tuple[str, Dict[str, Any]]]):
+        if not items:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        values = {
+            key: {"relevance_score": result["relevance_score"], "is_relevant": result["is_relevant"]}
+            for key, result in items
+        }
+        with self._lock:
+            for key, value in values.items():
+                self._remember(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_disk, [
+                (key, value["relevance_score"], int(value["is_relevant"]), expires_at) for key, value in values.items()
+            ])
+
+        backend = get_state_backend()
+        if backend is None:
+            return
+        try:
+            await backend.set_many({
+                state_key("score", key): json.dumps(value).encode("utf-8") for key, value in values.items()
+            }, self.ttl_seconds)
+        except Exception as e:
+            print(f"Shared score cache unavailable: {e}")
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM scores")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "shared_hits": self.shared_hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "disk_enabled": self._db is not None
+        }
+
+score_cache = ScoreCache(
+    max_entries=settings.SCORE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SCORE_CACHE_TTL_SECONDS,
+    db_path=settings.SCORE_CACHE_DB_PATH
+)
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import math
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import count_jobs
+from app.core.state_backend import get_state_backend, state_key
+from app.models.job_models import JobRecord, JobSearchRequest, TokenUsage, dump_jobs, load_jobs
+from app.services.openai_service import filter_relevant_jobs
+
+# Request fields that only control paging, not which jobs match
+PAGING_FIELDS = {"limit", "cursor"}
+
+def make_cursor(session_id: str, offset: int) -> str:
+    return f"{session_id}.{offset}"
+
+def parse_cursor(cursor: str) -> Tuple[str, int]:
+    """Split a cursor into its session id and offset; raises ValueError if it is malformed"""
+    session_id, _, offset = cursor.rpartition(".")
+    if not session_id or not offset.isdigit():
+        raise ValueError(f"Malformed cursor: {cursor!r}")
+    return session_id, int(offset)
+
+class SearchSession:
+    """
+    One search's pre-filtered candidates, best local match first, and the pages served
+    from them so far. Candidates are scored lazily: a page only scores as many as it
+    needs to fill up with relevant jobs, capped per request so one page never costs
+    more LLM calls than a whole search used to.
+    """
+
+    def __init__(self, session_id: str, search_request: JobSearchRequest, candidates: List[JobRecord],
+                 missing_sources: List[str]):
+        self.id = session_id
+        self.search_request = search_request
+        self.candidates = candidates  # Not scored yet, best first
+        self.missing_sources = missing_sources
+        self.served: List[JobRecord] = []  # Jobs already handed out, in page order
+        self.pending: List[JobRecord] = []  # Relevant jobs scored but not served yet
+        self.scored = 0
+        self.relevant = 0
+        self._lock = asyncio.Lock()
+
+    def dumps(self) -> bytes:
+        return json.dumps({
+            "search_request": self.search_request.model_dump(),
+            "candidates": dump_jobs(self.candidates),
+            "missing_sources": self.missing_sources,
+            "served": dump_jobs(self.served),
+            "pending": dump_jobs(self.pending),
+            "scored": self.scored,
+            "relevant": self.relevant
+        }).encode("utf-8")
+
+    @classmethod
+    def loads(cls, session_id: str, value: bytes) -> "SearchSession":
+        data = json.loads(value)
+        session = cls(session_id, JobSearchRequest(**data["search_request"]), load_jobs(data["candidates"]),
+                      data["missing_sources"])
+        session.served = load_jobs(data["served"])
+        session.pending = load_jobs(data["pending"])
+        session.scored = data["scored"]
+        session.relevant = data["relevant"]
+        return session
+
+    def matches(self, search_request: JobSearchRequest) -> bool:
+        """Whether a request asks for the same search this session holds"""
+        return search_request.model_dump(exclude=PAGING_FIELDS) == self.search_request.model_dump(exclude=PAGING_FIELDS)
+
+    def has_more(self, offset: int) -> bool:
+        return offset < len(self.served) or bool(self.pending) or bool(self.candidates)
+
+    def _next_chunk_size(self, needed: int, budget: int) -> int:
+        """Candidates to score at once to find `needed` relevant jobs, going by the relevance rate so far"""
+        rate = self.relevant / self.scored if self.scored else 0.5
+        batch_size = max(1, settings.SCORING_BATCH_SIZE)
+        size = math.ceil(needed / max(rate, 0.25) / batch_size) * batch_size
+        return min(size, budget, len(self.candidates))
+
+    async def page(self, offset: int, limit: int, timeout: Optional[float] = None,
+                   usage: Optional[TokenUsage] = None) -> List[JobRecord]:
+        """
+        Jobs `offset` to `offset + limit` in relevance order, scoring further candidates
+        only if the jobs scored so far don't fill the page. Relevance order holds within
+        the jobs scored so far; a later page may hold a higher score found further down.
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            deadline = None if timeout is None else loop.time() + timeout
+            budget = max(settings.PREFILTER_TOP_K, limit)
+            needed = offset + limit - len(self.served)
+
+            while len(self.pending) < needed and self.candidates and budget > 0:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                size = self._next_chunk_size(needed - len(self.pending), budget)
+                chunk = self.candidates[:size]
+                del self.candidates[:size]
+                scored: List[JobRecord] = []
+                try:
+                    relevant = await filter_relevant_jobs(chunk, self.search_request, timeout=remaining,
+                                                          usage=usage, scored=scored)
+                finally:
+                    # Jobs the deadline cut off go back to the front, descriptions intact,
+                    # for the next page; jobs without a description can never be scored
+                    done = {id(job) for job in scored}
+                    unscored = [job for job in chunk if id(job) not in done and job.raw_description]
+                    self.candidates[:0] = unscored
+                self.scored += len(scored)
+                budget -= len(scored)
+                count_jobs("scoring", len(relevant), dropped=len(scored) - len(relevant))
+                self.relevant += len(relevant)
+                self.pending.extend(relevant)
+                if len(unscored) == len(chunk):
+                    break  # Out of time before anything was scored
+
+            if needed > 0:
+                # Stable, so equal scores stay in pre-filter order
+                self.pending.sort(key=lambda job: -(job.relevance_score or 0))
+                self.served.extend(self.pending[:needed])
+                del self.pending[:needed]
+            return self.served[offset:offset + limit]
+
+class SearchSessionStore:
+    """
+    Search sessions that expire `ttl_seconds` after their last use. Sessions live in an
+    in-process LRU, or in the shared state backend when there is one so a cursor can be
+    resumed by any worker; there, concurrent requests for one session may both score.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.created = 0
+        self.resumed = 0
+        self.expired = 0
+        self._entries: "OrderedDict[str, Tuple[float, SearchSession]]" = OrderedDict()
+
+    async def create(self, search_request: JobSearchRequest, candidates: List[JobRecord],
+                     missing_sources: List[str]) -> SearchSession:
+        session = SearchSession(secrets.token_urlsafe(12), search_request, candidates, missing_sources)
+        await self.save(session)
+        self.created += 1
+        return session
+
+    async def get(self, session_id: str) -> Optional[SearchSession]:
+        backend = get_state_backend()
+        if backend is not None:
+            value = await backend.get(state_key("session", session_id))
+            if value is None:
+                self.expired += 1
+                return None
+            self.resumed += 1
+            return SearchSession.loads(session_id, value)
+
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[session_id]
+            self.expired += 1
+            return None
+        self._remember(entry[1])
+        self.resumed += 1
+        return entry[1]
+
+    async def save(self, session: SearchSession):
+        """Store the session after a page was served; a no-op beyond the TTL refresh in process"""
+        backend = get_state_backend()
+        if backend is not None:
+            await backend.set(state_key("session", session.id), session.dumps(), self.ttl_seconds)
+        else:
+            self._remember(session)
+
+    def _remember(self, session: SearchSession):
+        self._entries[session.id] = (time.monotonic() + self.ttl_seconds, session)
+        self._entries.move_to_end(session.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "resumed": self.resumed,
+            "expired": self.expired,
+            "entries": len(self._entries)
+        }
+
+search_sessions = SearchSessionStore(
+    max_entries=settings.SEARCH_SESSION_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_SESSION_TTL_SECONDS
+)
@@ -0,0 +1,223 @@
+import re
+from typing import List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import count_jobs
+from app.models.job_models import JobRecord, JobSearchRequest
+
+class SalaryRange(NamedTuple):
+    min: Optional[float]
+    max: Optional[float]
+    currency: Optional[str]  # ISO code
+    period: Optional[str]  # hour, day, week, month or year
+
+class ExperienceRange(NamedTuple):
+    min_years: Optional[float]
+    max_years: Optional[float]  # None for open-ended requirements like "3+ years"
+
+# Checked in order, so codes win over the bare "$" that CA$ or A$ also contain
+CURRENCY_PATTERNS = [
+    ("PKR", re.compile(r"\bpkr\b|\brs\.?(?=[\s\d])|₨")),
+    ("INR", re.compile(r"\binr\b|₹")),
+    ("AED", re.compile(r"\baed\b")),
+    ("SAR", re.compile(r"\bsar\b")),
+    ("CAD", re.compile(r"\bcad\b|ca\$")),
+    ("AUD", re.compile(r"\baud\b|a\$")),
+    ("GBP", re.compile(r"\bgbp\b|£")),
+    ("EUR", re.compile(r"\beur\b|€")),
+    ("USD", re.compile(r"\busd\b|\$")),
+]
+
+PERIOD_PATTERNS = [
+    ("hour", re.compile(r"\b(hour|hourly|hr)\b|/\s*h(ou)?r")),
+    ("day", re.compile(r"\b(day|daily)\b|/\s*day")),
+    ("week", re.compile(r"\b(week|weekly|wk)\b|/\s*wk")),
+    ("month", re.compile(r"\b(month|monthly|mo)\b|/\s*mo|\bp\.?m\.?(?=\s|$)")),
+    ("year", re.compile(r"\b(year|yearly|annual|annually|annum|yr)\b|/\s*yr|\bp\.?a\.?(?=\s|$)")),
+]
+PERIODS_PER_YEAR = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+# Amounts like 70,000 / 1,20,000 / 85.5k / 2 lakh
+_AMOUNT_RE = re.compile(r"(\d{1,3}(?:,\d{2,3})+|\d+(?:\.\d+)?)\s*(k|m|million|lakhs?|lacs?)?\b")
+AMOUNT_MULTIPLIERS = {"k": 1e3, "m": 1e6, "million": 1e6, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5}
+# Numbers in salary text that are not pay, like "401k match"
+_NON_SALARY_RE = re.compile(r"\b(?:401|403|457)\s*\(?[kb]\)?")
+# What may sit between the two ends of a range: "-", "to", and a currency like "- $" or "pkr to rs."
+_RANGE_GAP_RE = re.compile(r"\s*(?:[^\w\s]{1,3}|[a-z]{2,3}\.?)?\s*(?:-|–|—|to)\s*(?:[^\w\s]{1,3}|[a-z]{2,3}\.?)?\s*")
+_PERIOD_AFTER_RE = re.compile(r"\s*(?:per|a|an|each)?\s*(?:" + "|".join(
+    pattern.pattern for _, pattern in PERIOD_PATTERNS) + ")")
+# Words a salary made up of nothing but numbers may still contain
+_QUALIFIER_RE = re.compile(r"\b(?:up\s*to|upto|max(?:imum)?|from|min(?:imum)?|starting|at least|to)\b")
+
+# "2 years", "3+ yrs", "2-5 years", "1 to 3 years", "36 months"
+_EXPERIENCE_PATTERN = (r"(\d+(?:\.\d+)?)\s*(\+|plus)?\s*(?:(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*\+?)?\s*"
+                       r"(years?|yrs?|months?|mos?)\b")
+_EXPERIENCE_RE = re.compile(_EXPERIENCE_PATTERN)
+# In descriptions the duration must be followed closely by "experience", so a
+# "5 years in business" line about the company doesn't count
+_DESCRIPTION_EXPERIENCE_RE = re.compile(_EXPERIENCE_PATTERN + r"[^.\n]{0,40}?experience")
+_MINIMUM_RE = re.compile(r"\b(at least|minimum|min\.?|more than|over)\s*$")
+_ENTRY_LEVEL_RE = re.compile(r"\b(fresh(er|\s+graduates?)?|entry[\s-]level|no (prior )?experience)\b")
+
+def _next_to_currency(text: str, start: int, end: int) -> bool:
+    window = text[max(0, start - 5):start] + " " + text[end:end + 5]
+    return any(pattern.search(window) for _, pattern in CURRENCY_PATTERNS)
+
+def _salary_amounts(text: str) -> List[float]:
+    """
+    Amounts in salary text that are pay: ones next to a currency or a period, and the
+    other end of a range with one. A range like "70-90k" applies its unit to both ends.
+    Text made of nothing but amounts, like "50000 - 70000", counts in full.
+    """
+    matches = list(_AMOUNT_RE.finditer(text))
+    amounts = [float(match.group(1).replace(",", "")) * AMOUNT_MULTIPLIERS.get(match.group(2) or "", 1.0)
+               for match in matches]
+    paid = [_next_to_currency(text, match.start(), match.end()) or bool(_PERIOD_AFTER_RE.match(text, match.end()))
+            for match in matches]
+    for i in range(len(matches) - 1):
+        low, high = matches[i], matches[i + 1]
+        if not _RANGE_GAP_RE.fullmatch(text, low.end(), high.start()):
+            continue
+        low_number, high_number = (float(match.group(1).replace(",", "")) for match in (low, high))
+        if low.group(2) is None and high.group(2) is not None and low_number <= high_number:
+            amounts[i] = low_number * AMOUNT_MULTIPLIERS[high.group(2)]
+        paid[i] = paid[i + 1] = paid[i] or paid[i + 1]
+
+    if not any(paid):
+        bare = _QUALIFIER_RE.sub(" ", _AMOUNT_RE.sub(" ", text))
+        if re.search(r"[a-z]", bare):
+            return []
+        paid = [True] * len(matches)
+    return [amount for amount, is_paid in zip(amounts, paid) if is_paid and amount > 0]
+
+def parse_salary(text: str) -> Optional[SalaryRange]:
+    """
+    Parse a free-form salary such as "70,000 PKR to 120,000 PKR", "$50K - $70K a year"
+    or "Up to Rs 90,000 per month". Returns None when no amount is found.
+    """
+    text = _NON_SALARY_RE.sub(" ", (text or "").lower())
+    amounts = _salary_amounts(text)
+    if not amounts:
+        return None
+
+    currency = next((code for code, pattern in CURRENCY_PATTERNS if pattern.search(text)), None)
+    period = next((name for name, pattern in PERIOD_PATTERNS if pattern.search(text)), None)
+    if len(amounts) == 1:
+        if re.search(r"\b(up\s*to|upto|max(imum)?)\b", text):
+            return SalaryRange(None, amounts[0], currency, period)
+        if re.search(r"\b(from|min(imum)?|starting)\b|\d\s*k?\s*\+", text):
+            return SalaryRange(amounts[0], None, currency, period)
+        return SalaryRange(amounts[0], amounts[0], currency, period)
+    low, high = sorted(amounts[:2])
+    return SalaryRange(low, high, currency, period)
+
+def _experience_from_match(match: re.Match, text: str) -> ExperienceRange:
+    low, plus, high, unit = match.group(1), match.group(2), match.group(3), match.group(4)
+    scale = 1 / 12 if unit.startswith("mo") else 1.0
+    low_years = float(low) * scale
+    if high:
+        return ExperienceRange(low_years, float(high) * scale)
+    if plus or _MINIMUM_RE.search(text[:match.start()]):
+        return ExperienceRange(low_years, None)
+    return ExperienceRange(low_years, low_years)
+
+def experience_phrase(text: str) -> str:
+    """
+    The "N years of experience" phrase in free text such as a job snippet, with a
+    leading "minimum" or "at least" kept, or "" if there is none
+    """
+    text = (text or "").lower()
+    match = _DESCRIPTION_EXPERIENCE_RE.search(text)
+    if match is None:
+        return ""
+    minimum = _MINIMUM_RE.search(text[:match.start()])
+    return text[minimum.start() if minimum else match.start():match.end()].strip()
+
+def parse_experience(text: str, description: str = "") -> Optional[ExperienceRange]:
+    """
+    Parse years of experience from a field like "2-5 years", "3+ yrs" or "36 months",
+    falling back to an "N years of experience" phrase in `description`. A duration tied to
+    "experience" wins over an earlier one, so a field holding a whole snippet isn't
+    read by its first number.
+    """
+    text = (text or "").lower()
+    match = _DESCRIPTION_EXPERIENCE_RE.search(text) or _EXPERIENCE_RE.search(text)
+    if match:
+        return _experience_from_match(match, text)
+    if _ENTRY_LEVEL_RE.search(text):
+        return ExperienceRange(0.0, 1.0)
+    description = (description or "").lower()
+    match = _DESCRIPTION_EXPERIENCE_RE.search(description)
+    if match:
+        return _experience_from_match(match, description)
+    return None
+
+def parse_job_fields(job: JobRecord) -> JobRecord:
+    """Fill in a job's numeric salary and experience fields from its text fields"""
+    salary = parse_salary(job.salary)
+    if salary is not None:
+        job.salary_min, job.salary_max, job.salary_currency, job.salary_period = salary
+    experience = parse_experience(job.experience, job.raw_description)
+    if experience is not None:
+        job.experience_min_years, job.experience_max_years = experience
+    return job
+
+def _yearly(amount: Optional[float], period: Optional[str]) -> Optional[float]:
+    return None if amount is None else amount * PERIODS_PER_YEAR[period]
+
+class SearchConstraints:
+    """
+    Salary and experience limits parsed from a search request. Only clear mismatches
+    fail: jobs with unknown values, other currencies or incomparable periods pass.
+    """
+
+    def __init__(self, search_request: JobSearchRequest):
+        self.salary = parse_salary(search_request.salary)
+        self.experience = parse_experience(search_request.experience)
+        self.default_period = settings.SALARY_DEFAULT_PERIOD.lower() or None
+        if self.default_period not in PERIODS_PER_YEAR:
+            self.default_period = None
+
+    @property
+    def active(self) -> bool:
+        return (self.salary is not None and self.salary.min is not None) or self.experience is not None
+
+    def _salary_too_low(self, job: JobRecord) -> bool:
+        if self.salary is None or self.salary.min is None:
+            return False
+        offered = job.salary_max if job.salary_max is not None else job.salary_min
+        if offered is None or job.salary_currency != self.salary.currency:
+            return False
+        wanted_period = self.salary.period or self.default_period
+        offered_period = job.salary_period or self.default_period
+        if wanted_period is None and offered_period is None:
+            # Neither names a period, so take both in the same one
+            wanted_period = offered_period = "year"
+        elif wanted_period is None or offered_period is None:
+            return False
+        wanted = _yearly(self.salary.min, wanted_period) * (1 - settings.SALARY_FILTER_TOLERANCE)
+        return _yearly(offered, offered_period) < wanted
+
+    def _experience_too_high(self, job: JobRecord) -> bool:
+        if self.experience is None or job.experience_min_years is None:
+            return False
+        if self.experience.max_years is None:
+            return False
+        return job.experience_min_years > self.experience.max_years + settings.EXPERIENCE_FILTER_TOLERANCE_YEARS
+
+    def allows(self, job: JobRecord) -> bool:
+        return not self._salary_too_low(job) and not self._experience_too_high(job)
+
+def filter_by_constraints(jobs: List[JobRecord], search_request: JobSearchRequest) -> List[JobRecord]:
+    """
+    Drop jobs that clearly pay less or ask for more experience than the request allows,
+    before they reach ranking or the LLM
+    """
+    if not settings.STRUCTURED_FILTER_ENABLED or not jobs:
+        return jobs
+    constraints = SearchConstraints(search_request)
+    if not constraints.active:
+        return jobs
+    kept = [job for job in jobs if constraints.allows(job)]
+    count_jobs("constraints", len(kept), dropped=len(jobs) - len(kept))
+    return kept
@@ -0,0 +1,59 @@
+"""
+Compare chat-completion scoring with embedding scoring on a fixture corpus
+against a local fake server: wall time, upstream calls, and how many
+labeled-relevant jobs each mode finds.
+
+    python -m benchmarks.bench_embedding_scoring --size 200 --latency 0.3 --rerank 5
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.core.config import settings
+from app.models.job_models import TokenUsage
+from app.services import embedding_service, openai_service
+from benchmarks.corpus import SEARCH_REQUEST, is_expected_relevant, make_corpus
+from benchmarks.fake_openai import create_fake_openai_app
+from benchmarks.servers import run_server
+
+async def run_mode(mode: str, size: int):
+    settings.SCORING_MODE = mode
+    openai_service._client = None
+    jobs = make_corpus(size)
+    usage = TokenUsage()
+    start = time.perf_counter()
+    relevant = await openai_service.filter_relevant_jobs(jobs, SEARCH_REQUEST, usage=usage)
+    elapsed = time.perf_counter() - start
+    return elapsed, usage, sum(is_expected_relevant(job) for job in relevant), len(relevant)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Fixed seconds per upstream call")
+    parser.add_argument("--rerank", type=int, default=5, help="Top jobs rescored by the chat model")
+    # The hashing fake gives lower similarities than real embedding models
+    parser.add_argument("--min-similarity", type=float, default=0.15)
+    args = parser.parse_args()
+
+    app = create_fake_openai_app(args.latency, per_job_latency=0.01)
+    with run_server(app) as base_url, tempfile.TemporaryDirectory() as cache_dir:
+        settings.OPENAI_BASE_URL = f"{base_url}/v1"
+        settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "fake-key"
+        settings.SCORE_CACHE_ENABLED = False
+        settings.EMBEDDING_BACKEND = "openai"
+        settings.EMBEDDING_RERANK_TOP_N = args.rerank
+        settings.EMBEDDING_MIN_SIMILARITY = args.min_similarity
+        embedding_service.embedding_cache = embedding_service.EmbeddingCache(cache_dir)
+
+        labeled = sum(is_expected_relevant(job) for job in make_corpus(args.size))
+        print(f"corpus: {args.size} jobs, {labeled} labeled relevant")
+
+        for label, mode in (("chat", "chat"), ("embedding", "embedding"), ("embedding (cached)", "embedding")):
+            calls_before = app.state.calls
+            elapsed, usage, found, kept = asyncio.run(run_mode(mode, args.size))
+            print(f"{label:<19} {elapsed:6.2f}s  {app.state.calls - calls_before:>3} calls  "
+                  f"{usage.prompt_tokens:>7} prompt tokens  {found}/{labeled} labeled relevant found ({kept} kept)")
+
+if __name__ == "__main__":
+    main()
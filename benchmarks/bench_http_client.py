@@ -0,0 +1,51 @@
+"""
+Measure connection reuse of the shared provider HTTP client against a local
+stub upstream that counts new TCP connections.
+
+    python -m benchmarks.bench_http_client --requests 50
+"""
+import argparse
+import asyncio
+import time
+
+from app.core import http_client
+from app.services.providers import get_provider
+from benchmarks.stub_upstream import ConnectionCountingServer, run_counting_server
+
+PROVIDER_NAMES = ("linkedin", "indeed", "jsearch")
+
+async def run_searches(total: int, shared: bool) -> float:
+    start = time.perf_counter()
+    for i in range(total):
+        if not shared:
+            # Emulates the old behaviour of a fresh client per request
+            await http_client.close_http_client()
+        await get_provider(PROVIDER_NAMES[i % 3]).fetch_page("python developer", "Lahore", 1)
+    elapsed = time.perf_counter() - start
+    await http_client.close_http_client()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    upstream = ConnectionCountingServer({"data": [], "hits": []}, latency=args.latency)
+    with run_counting_server(upstream) as base_url:
+        for name in PROVIDER_NAMES:
+            get_provider(name).config.url = f"{base_url}/{name}"
+            # Measure connection reuse, not the RapidAPI rate limit
+            get_provider(name).upstream.bucket.rate = 0
+
+        results = {}
+        for label, shared in (("per-request client", False), ("shared client", True)):
+            before = upstream.connections
+            elapsed = asyncio.run(run_searches(args.requests, shared))
+            results[label] = (elapsed, upstream.connections - before)
+
+    for label, (elapsed, connections) in results.items():
+        print(f"{label:20s} {elapsed:6.2f}s  {connections:4d} new connections for {args.requests} requests")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare answering searches from the local job index with searching the providers
+live. Stub LinkedIn, Indeed and JSearch endpoints are ingested once for every
+corpus title and city; the same searches are then timed both ways.
+
+    python -m benchmarks.bench_job_index --provider-latency 0.2
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+from app.core import http_client
+from app.services.dedup import deduplicate_jobs
+from app.services.ingestion import ingest_search
+from app.services.job_index import get_job_index
+from app.services.providers import get_provider
+from benchmarks.corpus import CITIES, RELEVANT_TITLES
+from benchmarks.load_test import percentile
+from benchmarks.servers import run_server
+from benchmarks.stub_providers import create_stub_providers_app
+
+PROVIDER_NAMES = ("linkedin", "indeed", "jsearch")
+
+async def search_live(query: str, location: str) -> int:
+    results = await asyncio.gather(*[get_provider(name).search(query, location) for name in PROVIDER_NAMES])
+    return len(deduplicate_jobs([job for jobs in results for job in jobs]))
+
+async def run(searches: List[Tuple[str, str]], calls: dict) -> dict:
+    start = time.perf_counter()
+    for query, location in searches:
+        await ingest_search(query, location)
+    ingest_seconds = time.perf_counter() - start
+    ingest_calls = sum(calls.values())
+
+    timings = {"live": [], "index": []}
+    found = {"live": 0, "index": 0}
+    for query, location in searches:
+        start = time.perf_counter()
+        found["live"] += await search_live(query, location)
+        timings["live"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        jobs = await get_job_index().lookup(query, location)
+        timings["index"].append((time.perf_counter() - start) * 1000)
+        found["index"] += len(jobs or [])
+
+    await http_client.close_http_client()
+    return {
+        "stats": await get_job_index().stats(),
+        "ingest_seconds": ingest_seconds,
+        "ingest_calls": ingest_calls,
+        "live_calls": sum(calls.values()) - ingest_calls,
+        "timings": timings,
+        "found": found,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider-latency", type=float, default=0.2)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--pool-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    providers_app = create_stub_providers_app(latency=args.provider_latency, pages=args.pages,
+                                              pool_size=args.pool_size)
+    searches = [(title, city) for title in RELEVANT_TITLES for city in CITIES]
+
+    with run_server(providers_app) as base_url:
+        for name in PROVIDER_NAMES:
+            provider = get_provider(name)
+            provider.config.url = f"{base_url}/{name}"
+            # Time the upstream round trips, not the RapidAPI rate limit or the response cache
+            provider.upstream.bucket.rate = 0
+            provider.config.cache_ttl_seconds = 0
+        results = asyncio.run(run(searches, providers_app.state.calls))
+
+    print(f"ingested {len(searches)} searches in {results['ingest_seconds']:.2f}s "
+          f"with {results['ingest_calls']} upstream calls: {results['stats']}")
+    for label in ("live", "index"):
+        timings = sorted(results["timings"][label])
+        print(f"{label:6s} p50 {percentile(timings, 0.5):8.2f} ms  p95 {percentile(timings, 0.95):8.2f} ms  "
+              f"{results['found'][label] / len(searches):6.1f} jobs per search")
+    print(f"upstream calls per search: live {results['live_calls'] / len(searches):.1f}, index 0")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure the memory held by a large batch of jobs as plain dicts versus
+JobRecords, right after normalization and again once descriptions are
+dropped after scoring.
+
+    python -m benchmarks.bench_job_records --size 20000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from app.services.providers import JOB_FIELD_DEFAULTS, normalize_job
+from benchmarks.corpus import make_corpus
+
+def _fresh(text: str) -> str:
+    # Copy the string so every job owns its text, as it would after parsing a response
+    return "".join(list(text))
+
+def build_dicts(rows):
+    return [{field: _fresh(value) for field, value in row.items()} for row in rows]
+
+def release_dicts(jobs):
+    for job in jobs:
+        del job["raw_description"]
+
+def build_records(rows):
+    return [normalize_job(**{field: _fresh(value) for field, value in row.items()}) for row in rows]
+
+def release_records(jobs):
+    for job in jobs:
+        job.release_description()
+
+def measure(rows, build, release):
+    """Return bytes retained by the built jobs before and after releasing descriptions"""
+    gc.collect()
+    tracemalloc.start()
+    jobs = build(rows)
+    built, _ = tracemalloc.get_traced_memory()
+    release(jobs)
+    gc.collect()
+    released, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, released
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Raw field values as providers hand them over, before normalization
+    rows = [{field: getattr(job, field) for field in JOB_FIELD_DEFAULTS} for job in make_corpus(args.size)]
+
+    dict_built, dict_released = measure(rows, build_dicts, release_dicts)
+    record_built, record_released = measure(rows, build_records, release_records)
+
+    mib = 2 ** 20
+    print(f"jobs: {args.size}")
+    print(f"dicts:      {dict_built / mib:6.1f} MiB normalized, {dict_released / mib:6.1f} MiB after scoring")
+    print(f"JobRecords: {record_built / mib:6.1f} MiB normalized, {record_released / mib:6.1f} MiB after scoring")
+    print(f"per scored job: {dict_released / args.size:.0f} B -> {record_released / args.size:.0f} B")
+
+if __name__ == "__main__":
+    main()
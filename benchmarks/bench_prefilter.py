@@ -0,0 +1,38 @@
+"""
+Benchmark the local pre-filter on a fixture corpus: time per search, how many
+jobs still reach the LLM, and how many labeled-relevant jobs survive.
+
+    python -m benchmarks.bench_prefilter --size 300 --top-k 30
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.services.prefilter import prefilter_jobs
+from benchmarks.corpus import SEARCH_REQUEST, is_expected_relevant, make_corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--top-k", type=int, default=settings.PREFILTER_TOP_K)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    jobs = make_corpus(args.size)
+    relevant_total = sum(is_expected_relevant(job) for job in jobs)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        kept = prefilter_jobs(jobs, SEARCH_REQUEST, top_k=args.top_k)
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    relevant_kept = sum(is_expected_relevant(job) for job in kept)
+    batch_size = max(1, settings.SCORING_BATCH_SIZE)
+    print(f"corpus: {len(jobs)} jobs, {relevant_total} labeled relevant")
+    print(f"pre-filter time: {elapsed * 1000:.2f} ms per search")
+    print(f"jobs sent to LLM: {len(jobs)} -> {len(kept)} ({len(jobs) / max(1, len(kept)):.1f}x fewer)")
+    print(f"LLM calls at batch size {batch_size}: {-(-len(jobs) // batch_size)} -> {-(-len(kept) // batch_size)}")
+    print(f"labeled-relevant jobs kept: {relevant_kept}/{min(relevant_total, args.top_k)} possible")
+
+if __name__ == "__main__":
+    main()
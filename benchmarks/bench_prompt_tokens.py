@@ -0,0 +1,51 @@
+"""
+Compare prompt tokens spent scoring a fixture corpus with full descriptions
+versus descriptions compacted to PROMPT_DESCRIPTION_TOKEN_BUDGET, against a
+local fake completion server that reports usage and, past OpenAI's
+1024-token minimum, prompt cache hits.
+
+    python -m benchmarks.bench_prompt_tokens --size 60 --budget 120
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.models.job_models import TokenUsage
+from app.services import openai_service
+from benchmarks.corpus import SEARCH_REQUEST, make_corpus
+from benchmarks.fake_openai import create_fake_openai_app
+from benchmarks.servers import run_server
+
+async def score_corpus(size: int, compaction: bool) -> TokenUsage:
+    settings.PROMPT_COMPACTION_ENABLED = compaction
+    openai_service._client = None
+    usage = TokenUsage()
+    await openai_service.filter_relevant_jobs(make_corpus(size), SEARCH_REQUEST, usage=usage)
+    return usage
+
+def report(label: str, usage: TokenUsage):
+    print(f"{label:<10} {usage.requests:>3} requests  {usage.prompt_tokens:>7} prompt tokens  "
+          f"{usage.cached_prompt_tokens:>6} cached  {usage.description_tokens_saved:>6} saved by compaction")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=60)
+    parser.add_argument("--budget", type=int, default=settings.PROMPT_DESCRIPTION_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    app = create_fake_openai_app(latency=0.0, per_job_latency=0.0)
+    with run_server(app) as base_url:
+        settings.OPENAI_BASE_URL = f"{base_url}/v1"
+        settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "fake-key"
+        settings.SCORE_CACHE_ENABLED = False
+        settings.PROMPT_DESCRIPTION_TOKEN_BUDGET = args.budget
+
+        full = asyncio.run(score_corpus(args.size, compaction=False))
+        compacted = asyncio.run(score_corpus(args.size, compaction=True))
+
+    report("full", full)
+    report("compacted", compacted)
+    print(f"prompt tokens: {full.prompt_tokens / max(1, compacted.prompt_tokens):.2f}x fewer with a {args.budget} token budget")
+
+if __name__ == "__main__":
+    main()
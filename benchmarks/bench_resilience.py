@@ -0,0 +1,84 @@
+"""
+Exercise the upstream rate limit, retry and circuit breaker policy against
+local stub upstreams:
+
+- a throttled upstream that answers 429 with Retry-After before recovering
+- a dead upstream (503 after a delay) searched repeatedly, with and without the breaker
+- a burst of concurrent calls under a token bucket
+
+    python -m benchmarks.bench_resilience
+"""
+import argparse
+import asyncio
+import time
+
+from app.core import http_client
+from app.core.config import settings
+from app.core.resilience import CircuitBreaker
+from app.services.providers import get_provider
+from benchmarks.stub_upstream import ConnectionCountingServer, run_counting_server
+
+BODY = {"data": [{"job_title": "Full Stack Developer", "company_name": "Acme", "job_url": "https://example.com/1",
+                  "job_description": "React and Node.js"}]}
+
+async def fetch_once(provider):
+    start = time.perf_counter()
+    jobs = await provider.fetch_page("full stack", "Lahore", 1)
+    await http_client.close_http_client()
+    return len(jobs), time.perf_counter() - start
+
+async def search_repeatedly(provider, searches: int, timeout: float):
+    durations = []
+    for _ in range(searches):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(provider.search("full stack", f"Lahore {len(durations)}"), timeout)
+        except Exception:
+            pass
+        durations.append(time.perf_counter() - start)
+    await http_client.close_http_client()
+    return durations
+
+async def burst(provider, calls: int):
+    start = time.perf_counter()
+    await asyncio.gather(*[provider.fetch_page("full stack", "Lahore", 1) for _ in range(calls)])
+    await http_client.close_http_client()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--searches", type=int, default=10)
+    parser.add_argument("--dead-latency", type=float, default=0.5, help="Seconds before the dead upstream answers 503")
+    args = parser.parse_args()
+
+    settings.RETRY_BASE_DELAY = 0.1
+    provider = get_provider("linkedin")
+    provider.config.max_pages = 1
+
+    throttled = ConnectionCountingServer(BODY, fail_status=429, fail_first=2, retry_after="1")
+    with run_counting_server(throttled) as base_url:
+        provider.config.url = base_url
+        found, elapsed = asyncio.run(fetch_once(provider))
+    print(f"throttled upstream: {found} job(s) after {throttled.requests} requests in {elapsed:.2f}s "
+          f"(429 with Retry-After: 1 twice)")
+
+    for label, threshold in (("no breaker", 0), ("breaker", settings.CIRCUIT_FAILURE_THRESHOLD)):
+        provider.upstream.breaker = CircuitBreaker(threshold, settings.CIRCUIT_RESET_SECONDS)
+        dead = ConnectionCountingServer(BODY, latency=args.dead_latency, fail_first=-1)
+        with run_counting_server(dead) as base_url:
+            provider.config.url = base_url
+            durations = asyncio.run(search_repeatedly(provider, args.searches, timeout=5.0))
+        print(f"dead upstream, {label:<10}: {sum(durations):5.2f}s for {args.searches} searches, "
+              f"last search {durations[-1] * 1000:6.1f} ms, {dead.requests} upstream requests")
+
+    provider.upstream.breaker = CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+    provider.upstream.bucket.rate, provider.upstream.bucket.burst = 10, 5
+    provider.upstream.bucket._tokens = 5
+    healthy = ConnectionCountingServer(BODY)
+    with run_counting_server(healthy) as base_url:
+        provider.config.url = base_url
+        elapsed = asyncio.run(burst(provider, 25))
+    print(f"rate limit 10/s, burst 5: 25 concurrent calls took {elapsed:.2f}s ({25 / elapsed:.1f} calls/s)")
+
+if __name__ == "__main__":
+    main()
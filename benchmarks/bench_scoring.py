@@ -0,0 +1,79 @@
+"""
+Compare serial per-job scoring with batched, concurrent scoring against a
+local fake completion server.
+
+    python -m benchmarks.bench_scoring --jobs 30 --latency 0.5
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.models.job_models import JobSearchRequest
+from app.services import openai_service
+from app.services.providers import normalize_job
+from benchmarks.fake_openai import create_fake_openai_app
+from benchmarks.servers import run_server
+
+SEARCH_REQUEST = JobSearchRequest(
+    position="Full Stack Engineer",
+    experience="2 years",
+    salary="70,000 PKR to 120,000 PKR",
+    jobNature="onsite",
+    location="Peshawar, Pakistan",
+    skills="full stack, MERN, Node.js, Express.js, React.js, Next.js, Firebase, TailwindCSS, CSS Frameworks, Tokens handling"
+)
+
+def make_jobs(count: int):
+    return [
+        normalize_job(
+            job_title=f"Full Stack Developer {i}",
+            company=f"Company {i}",
+            experience="2 years",
+            jobNature="onsite",
+            location="Peshawar, Pakistan",
+            apply_link=f"https://example.com/jobs/{i}",
+            source="LinkedIn",
+            raw_description="We are looking for a MERN stack developer with React and Node.js experience. " * 5
+        )
+        for i in range(count)
+    ]
+
+async def time_scoring(jobs_count: int, batch_size: int, concurrency: int) -> float:
+    settings.SCORING_BATCH_SIZE = batch_size
+    settings.SCORING_MAX_CONCURRENCY = concurrency
+    # Each asyncio.run gets its own loop, so start from a fresh client
+    openai_service._client = None
+    start = time.perf_counter()
+    await openai_service.filter_relevant_jobs(make_jobs(jobs_count), SEARCH_REQUEST)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.5, help="Fixed seconds per completion")
+    parser.add_argument("--per-job-latency", type=float, default=0.01, help="Extra seconds per job in a prompt")
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    app = create_fake_openai_app(args.latency, args.per_job_latency)
+    with run_server(app) as base_url:
+        settings.OPENAI_BASE_URL = f"{base_url}/v1"
+        settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "fake-key"
+        # Both runs score the same jobs, so the score cache would hide the second one
+        settings.SCORE_CACHE_ENABLED = False
+
+        serial = asyncio.run(time_scoring(args.jobs, 1, 1))
+        serial_calls = app.state.calls
+
+        batched = asyncio.run(time_scoring(args.jobs, args.batch_size, args.concurrency))
+        batched_calls = app.state.calls - serial_calls
+
+    print(f"jobs={args.jobs} latency={args.latency}s")
+    print(f"serial   (batch=1, concurrency=1): {serial:6.2f}s  {serial_calls} completions")
+    print(f"batched  (batch={args.batch_size}, concurrency={args.concurrency}): {batched:6.2f}s  {batched_calls} completions")
+    print(f"speedup: {serial / batched:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark Indeed results-page parsing over saved HTML fixtures, offline.
+Compares the lxml single-pass extractor with the previous BeautifulSoup
+html.parser approach (when beautifulsoup4 is installed).
+
+    python -m benchmarks.bench_scraper_parsing --pages 200
+"""
+import argparse
+import glob
+import os
+import time
+
+from app.services.indeed_scraper import parse_job_cards
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "indeed_search*.html")
+BASE_URL = "https://pk.indeed.com"
+
+def parse_with_beautifulsoup(html, max_results=15):
+    """The previous extractor: html.parser over the whole page plus a find per field"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.find_all("div", class_="job_seen_beacon") or soup.find_all("div", class_="jobsearch-SerpJobCard")
+    jobs = []
+    for card in cards[:max_results]:
+        job = {}
+        for field, selectors in (
+            ("job_title", (("h2", "jobTitle"), ("a", "jobtitle"))),
+            ("company", (("span", "companyName"), ("span", "company"))),
+            ("location", (("div", "companyLocation"), ("span", "location"))),
+            ("salary", (("div", "metadata salary-snippet-container"), ("span", "salaryText"))),
+            ("snippet", (("div", "job-snippet"), ("div", "summary")))
+        ):
+            element = card.find(selectors[0][0], class_=selectors[0][1]) or card.find(selectors[1][0], class_=selectors[1][1])
+            job[field] = element.text.strip() if element else "N/A"
+        job["remote"] = any("remote" in span.text.lower() for span in card.find_all("span", class_="remote"))
+        link = card.find("a", class_="jcs-JobTitle") or card.find("a", class_="jobtitle")
+        job["apply_link"] = link.get("href") if link else "N/A"
+        jobs.append(job)
+    return jobs
+
+def timed(label, pages, parse):
+    start = time.perf_counter()
+    results = parse()
+    elapsed = time.perf_counter() - start
+    jobs = sum(len(result) for result in results)
+    print(f"{label:32s} {elapsed:7.3f}s  {len(pages) / elapsed:8.1f} pages/s  {jobs} jobs")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200, help="Pages to parse (fixtures are repeated)")
+    args = parser.parse_args()
+
+    fixtures = [open(path, encoding="utf-8").read() for path in sorted(glob.glob(FIXTURES))]
+    pages = [fixtures[i % len(fixtures)] for i in range(args.pages)]
+    print(f"{len(fixtures)} fixture(s), {args.pages} pages, {sum(map(len, pages)) / 1e6:.1f} MB of HTML")
+
+    try:
+        import bs4  # noqa: F401
+        timed("beautifulsoup html.parser", pages, lambda: [parse_with_beautifulsoup(page) for page in pages])
+    except ImportError:
+        print("beautifulsoup4 not installed; skipping the previous extractor")
+
+    timed("lxml single pass", pages, lambda: [parse_job_cards(page, BASE_URL, 15) for page in pages])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure cold start: each run imports app.main in a fresh interpreter, runs the
+FastAPI lifespan startup and serves one request, reporting the time for each
+step, peak memory and which optional heavy packages got imported along the way.
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Packages only some configurations need; none should load at startup by default
+HEAVY_MODULES = ("openai", "numpy", "redis", "selenium", "lxml")
+
+CHILD = """
+import asyncio, json, resource, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def start():
+    import httpx
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+            (await client.get("/")).raise_for_status()
+        return ready, time.perf_counter()
+
+ready, served = asyncio.run(start())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [name for name in %r if name in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+def run_once() -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    run_once()  # Warm the OS file cache and the bytecode cache
+    runs = [run_once() for _ in range(args.runs)]
+    for key in ("import_ms", "startup_ms", "first_request_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key}: median {statistics.median(values):.1f}, min {min(values):.1f}, max {max(values):.1f}")
+    print(f"peak_rss_mb: median {statistics.median(run['peak_rss_mb'] for run in runs):.1f}")
+    print(f"heavy modules loaded: {', '.join(runs[-1]['heavy_modules']) or 'none'}")
+
+if __name__ == "__main__":
+    main()
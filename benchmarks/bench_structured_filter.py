@@ -0,0 +1,59 @@
+"""
+Benchmark salary and experience parsing and the structured filter: parse time per
+job, how many jobs the filter drops before ranking, and how many labeled-relevant
+jobs are dropped with them. Corpus jobs get a varied salary and experience first.
+
+    python -m benchmarks.bench_structured_filter --size 300
+"""
+import argparse
+import random
+import time
+
+from app.services.prefilter import prefilter_jobs
+from app.services.structured_fields import filter_by_constraints, parse_job_fields
+from benchmarks.corpus import SEARCH_REQUEST, is_expected_relevant, make_corpus
+
+SALARIES = ["40,000 PKR to 60,000 PKR", "Rs. 80,000 - 1,20,000 a month", "Up to Rs 50,000 per month",
+            "150000 PKR", "$50K - $70K a year", "Not specified", "Competitive", "2 lakh PKR monthly"]
+EXPERIENCE = ["1 year", "2-3 years", "3+ years", "5-7 years", "36 months", "Fresh graduates welcome",
+              "Not specified", "10 years"]
+
+def vary_fields(jobs, seed: int = 7):
+    rng = random.Random(seed)
+    for job in jobs:
+        job.salary = rng.choice(SALARIES)
+        job.experience = rng.choice(EXPERIENCE)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    jobs = make_corpus(args.size)
+    vary_fields(jobs)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for job in jobs:
+            parse_job_fields(job)
+    parse_time = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        kept = filter_by_constraints(jobs, SEARCH_REQUEST)
+    filter_time = (time.perf_counter() - start) / args.repeat
+
+    relevant_total = sum(is_expected_relevant(job) for job in jobs)
+    relevant_kept = sum(is_expected_relevant(job) for job in kept)
+    print(f"corpus: {len(jobs)} jobs, {relevant_total} labeled relevant")
+    print(f"search: salary {SEARCH_REQUEST.salary!r}, experience {SEARCH_REQUEST.experience!r}")
+    print(f"parse time: {parse_time / len(jobs) * 1e6:.1f} us per job")
+    print(f"filter time: {filter_time * 1000:.3f} ms per search")
+    print(f"jobs dropped before ranking: {len(jobs) - len(kept)}/{len(jobs)}")
+    print(f"of which relevant by title, but paying too little or asking too much: {relevant_total - relevant_kept}/{relevant_total}")
+    relevant_prefiltered = [job for job in prefilter_jobs(jobs, SEARCH_REQUEST) if is_expected_relevant(job)]
+    print(f"labeled-relevant jobs reaching the LLM: {len(relevant_prefiltered)}")
+
+if __name__ == "__main__":
+    main()
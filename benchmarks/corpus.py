@@ -0,0 +1,58 @@
+import random
+from typing import List
+
+from app.models.job_models import JobRecord, JobSearchRequest
+from app.services.providers import normalize_job
+
+# The search every corpus is built around
+SEARCH_REQUEST = JobSearchRequest(
+    position="Full Stack Engineer",
+    experience="2 years",
+    salary="70,000 PKR to 120,000 PKR",
+    jobNature="onsite",
+    location="Peshawar, Pakistan",
+    skills="full stack, MERN, Node.js, Express.js, React.js, Next.js, Firebase, TailwindCSS, CSS Frameworks, Tokens handling"
+)
+
+RELEVANT_TITLES = ["Full Stack Engineer", "Full Stack Developer", "MERN Stack Developer", "React Developer", "Node.js Engineer"]
+OTHER_TITLES = ["Accountant", "Registered Nurse", "Sales Executive", "HR Officer", "Civil Engineer",
+                "Graphic Designer", "Data Entry Operator", "Warehouse Supervisor", "Teacher", "Electrician"]
+RELEVANT_SKILLS = ["React.js", "Node.js", "Express.js", "MongoDB", "Next.js", "Firebase", "TailwindCSS", "REST APIs", "JWT tokens"]
+OTHER_SKILLS = ["bookkeeping", "patient care", "cold calling", "payroll", "AutoCAD", "Photoshop",
+                "MS Excel", "inventory", "lesson planning", "wiring"]
+CITIES = ["Peshawar, Pakistan", "Lahore, Pakistan", "Karachi, Pakistan", "Islamabad, Pakistan", "Remote"]
+SOURCES = ["LinkedIn", "Indeed", "JSearch"]
+FILLER = ("You will work with a collaborative team in a fast paced environment. We offer competitive "
+          "benefits, health insurance, annual leave and opportunities for growth. ")
+
+def is_expected_relevant(job: JobRecord) -> bool:
+    """Recall label: corpus jobs are relevant exactly when they have a relevant title"""
+    return job.job_title in RELEVANT_TITLES
+
+def make_corpus(size: int = 300, relevant_share: float = 0.2, seed: int = 7) -> List[JobRecord]:
+    """
+    Build a deterministic corpus of normalized job records; see `is_expected_relevant`
+    for the label used in recall measurements.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(size):
+        relevant = rng.random() < relevant_share
+        title = rng.choice(RELEVANT_TITLES if relevant else OTHER_TITLES)
+        skills = rng.sample(RELEVANT_SKILLS if relevant else OTHER_SKILLS, 4)
+        description = (
+            f"We are hiring a {title}. Requirements: {rng.randint(1, 6)}+ years of experience with "
+            f"{', '.join(skills)}. " + FILLER * rng.randint(2, 12)
+        )
+        jobs.append(normalize_job(
+            job_title=title,
+            company=f"Company {rng.randint(1, size // 3 + 1)}",
+            experience=f"{rng.randint(1, 6)} years",
+            jobNature=rng.choice(["onsite", "onsite", "remote", "hybrid", "Not specified"]),
+            location=rng.choice(CITIES),
+            salary="Not specified",
+            apply_link=f"https://example.com/jobs/{i}",
+            source=rng.choice(SOURCES),
+            raw_description=description
+        ))
+    return jobs
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+from fastapi import FastAPI, Request, Response
+
+def create_fake_openai_app(latency: float = 0.5, per_job_latency: float = 0.01, failure_rate: float = 0.0) -> FastAPI:
+    """
+    Build a minimal OpenAI-compatible chat completion server.
+    Every job in the prompt is scored, and the reply takes
+    `latency + per_job_latency * jobs` seconds to simulate model time.
+    Usage is reported at ~4 characters per token. Like OpenAI's prompt cache,
+    the longest prefix shared with an earlier prompt counts as cached, in
+    128-token steps, but only once it reaches 1024 tokens.
+    Embeddings requests get deterministic hashing embeddings. A `failure_rate`
+    share of calls fails with a 503 after the latency.
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    rng = random.Random(5)
+    app.state.seen_prompts = []
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+
+        prompt = body["messages"][-1]["content"]
+        job_ids = [int(job_id) for job_id in re.findall(r"Job ID: (\d+)", prompt)]
+
+        await asyncio.sleep(latency + per_job_latency * len(job_ids))
+        if rng.random() < failure_rate:
+            return Response(status_code=503)
+
+        full_prompt = "".join(message["content"] for message in body["messages"])
+        prompt_tokens = len(full_prompt) // 4
+        shared = max((len(os.path.commonprefix([full_prompt, seen])) for seen in app.state.seen_prompts), default=0)
+        cached_tokens = shared // 4 // 128 * 128 if shared // 4 >= 1024 else 0
+        app.state.seen_prompts.append(full_prompt)
+
+        results = [
+            {"id": job_id, "relevance_score": 90 - job_id, "is_relevant": True}
+            for job_id in job_ids
+        ]
+        return {
+            "id": f"chatcmpl-{app.state.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps({"results": results})},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": 10 * len(job_ids),
+                "total_tokens": prompt_tokens + 10 * len(job_ids),
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        # Imported here so the chat-only benchmarks don't need numpy
+        from app.services.embedding_service import hashing_embeddings
+
+        body = await request.json()
+        app.state.calls += 1
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+
+        await asyncio.sleep(latency + per_job_latency * len(texts) / 10)
+        if rng.random() < failure_rate:
+            return Response(status_code=503)
+
+        vectors = hashing_embeddings(texts)
+        prompt_tokens = sum(len(text) for text in texts) // 4
+        return {
+            "object": "list",
+            "model": body.get("model", "fake"),
+            "data": [
+                {"object": "embedding", "index": index, "embedding": vector.tolist()}
+                for index, vector in enumerate(vectors)
+            ],
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+
+    return app
@@ -0,0 +1,260 @@
+"""
+Load-test /api/v1/jobs/search end to end. app.main:app runs under uvicorn in a
+subprocess, pointed at local stubs for the LinkedIn, Indeed, JSearch and OpenAI
+endpoints. Reports latency percentiles, throughput and upstream calls. Results
+can be saved as JSON and compared against an earlier run, and a regression makes
+the command exit non-zero.
+
+    python -m benchmarks.load_test --requests 200 --concurrency 20 --output results/baseline.json
+    python -m benchmarks.load_test --requests 200 --concurrency 20 --compare results/baseline.json
+    python -m benchmarks.load_test --env SCORING_MODE=embedding --env EMBEDDING_BACKEND=openai
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.corpus import CITIES, RELEVANT_TITLES, SEARCH_REQUEST
+from benchmarks.fake_openai import create_fake_openai_app
+from benchmarks.servers import free_port, run_server
+from benchmarks.stub_providers import create_stub_providers_app
+
+# Metrics compared between runs, and whether higher values are better
+COMPARED_METRICS = {
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "rps": True,
+    "error_rate": False,
+    "upstream_calls_per_request.total": False,
+}
+
+def percentile(sorted_values: List[float], share: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(share * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+def search_bodies(distinct: int) -> List[Dict[str, str]]:
+    """`distinct` different searches built around the corpus search request"""
+    base = SEARCH_REQUEST.model_dump()
+    bodies = []
+    for i in range(max(1, distinct)):
+        title = RELEVANT_TITLES[i % len(RELEVANT_TITLES)]
+        city = CITIES[(i // len(RELEVANT_TITLES)) % len(CITIES)]
+        round_tag = i // (len(RELEVANT_TITLES) * len(CITIES))
+        bodies.append(dict(base, position=f"{title} {round_tag}" if round_tag else title, location=city))
+    return bodies
+
+def app_environment(args, providers_url: str, openai_url: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "ENABLED_PROVIDERS": "linkedin,indeed,jsearch",
+        "LINKEDIN_API_URL": f"{providers_url}/linkedin",
+        "INDEED_API_URL": f"{providers_url}/indeed",
+        "JSEARCH_API_URL": f"{providers_url}/jsearch",
+        "RAPIDAPI_KEY": "load-test",
+        "OPENAI_BASE_URL": f"{openai_url}/v1",
+        "OPENAI_API_KEY": "load-test",
+    })
+    if not args.rate_limits:
+        env.update({"RAPIDAPI_RATE_LIMIT_PER_SECOND": "0", "OPENAI_RATE_LIMIT_PER_SECOND": "0"})
+    if not args.caches:
+        env.update({
+            "SCORE_CACHE_ENABLED": "false",
+            "LINKEDIN_CACHE_TTL_SECONDS": "0",
+            "INDEED_CACHE_TTL_SECONDS": "0",
+            "JSEARCH_CACHE_TTL_SECONDS": "0",
+        })
+    for pair in args.env:
+        key, _, value = pair.partition("=")
+        env[key] = value
+    return env
+
+def start_app(env: Dict[str, str], port: int, show_logs: bool = False) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        # The app prints upstream errors and retries, which would drown out the report
+        stdout=None if show_logs else subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The app exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The app did not start within 30s")
+
+async def run_load(base_url: str, bodies: List[Dict[str, str]], total: int, concurrency: int,
+                   timeout: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_request = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal next_request
+        while next_request < total:
+            body = bodies[next_request % len(bodies)]
+            next_request += 1
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{base_url}/api/v1/jobs/search", json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        duration = time.perf_counter() - start
+
+    latencies.sort()
+    errors = total - statuses.get("200", 0)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": statuses,
+        "duration_seconds": round(duration, 3),
+        "rps": round(total / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 1),
+            "p95": round(percentile(latencies, 0.95), 1),
+            "p99": round(percentile(latencies, 0.99), 1),
+            "mean": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+            "max": round(latencies[-1], 1) if latencies else 0.0,
+        },
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _lookup(results: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = results
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print current results next to the baseline and return the metrics that regressed"""
+    regressions = []
+    print(f"\ncompared with {baseline.get('label', '?')} ({baseline.get('git_commit', '?')}):")
+    for path, higher_is_better in COMPARED_METRICS.items():
+        before = _lookup(baseline["results"], path)
+        after = _lookup(current["results"], path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else (0.0 if after == before else float("inf"))
+        worse = -change if higher_is_better else change
+        # Error rates start at 0, so they regress on any absolute increase
+        regressed = worse > tolerance if before else after > before
+        if regressed:
+            regressions.append(path)
+        print(f"  {path:<36} {before:>10} -> {after:>10}  {change * 100:+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5, help="Requests sent before measuring")
+    parser.add_argument("--distinct-queries", type=int, default=25, help="Different searches cycled through")
+    parser.add_argument("--provider-latency", type=float, default=0.2)
+    parser.add_argument("--provider-failure-rate", type=float, default=0.0)
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--openai-failure-rate", type=float, default=0.0)
+    parser.add_argument("--caches", action="store_true", help="Keep the provider and score caches enabled")
+    parser.add_argument("--rate-limits", action="store_true", help="Keep the configured upstream rate limits")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Extra app settings")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--app-logs", action="store_true", help="Show the app's output")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    providers_app = create_stub_providers_app(latency=args.provider_latency, failure_rate=args.provider_failure_rate)
+    openai_app = create_fake_openai_app(latency=args.openai_latency, per_job_latency=0.01,
+                                        failure_rate=args.openai_failure_rate)
+    bodies = search_bodies(args.distinct_queries)
+
+    with run_server(providers_app) as providers_url, run_server(openai_app) as openai_url:
+        port = free_port()
+        process = start_app(app_environment(args, providers_url, openai_url), port, args.app_logs)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            if args.warmup:
+                asyncio.run(run_load(base_url, bodies, args.warmup, min(args.warmup, args.concurrency), args.timeout))
+
+            calls_before = dict(providers_app.state.calls, openai=openai_app.state.calls)
+            results = asyncio.run(run_load(base_url, bodies, args.requests, args.concurrency, args.timeout))
+            calls_after = dict(providers_app.state.calls, openai=openai_app.state.calls)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    upstream_calls = {name: calls_after[name] - calls_before[name] for name in calls_after}
+    upstream_calls["total"] = sum(upstream_calls.values())
+    results["upstream_calls"] = upstream_calls
+    results["upstream_calls_per_request"] = {
+        name: round(calls / args.requests, 2) for name, calls in upstream_calls.items()
+    }
+
+    report = {
+        "label": args.label or git_commit(),
+        "git_commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "label")},
+        "results": results,
+    }
+
+    latency = results["latency_ms"]
+    print(f"{results['requests']} requests at concurrency {args.concurrency} in {results['duration_seconds']}s: "
+          f"{results['rps']} req/s, {results['errors']} errors {results['statuses']}")
+    print(f"latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  "
+          f"mean {latency['mean']}  max {latency['max']}")
+    print("upstream calls per request: " + ", ".join(
+        f"{name} {value}" for name, value in results["upstream_calls_per_request"].items()
+    ))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
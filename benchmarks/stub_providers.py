@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.corpus import make_corpus
+
+def _page_offset(provider: str, query: str, page: int, pool_size: int) -> int:
+    digest = hashlib.md5(f"{provider}|{query}|{page}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "little") % pool_size
+
+def _linkedin_job(job) -> Dict[str, Any]:
+    return {
+        "job_title": job.job_title,
+        "company_name": job.company,
+        "work_type": job.jobNature,
+        "location": job.location,
+        "salary": job.salary,
+        "job_url": job.apply_link,
+        "job_description": job.raw_description
+    }
+
+def _indeed_job(job) -> Dict[str, Any]:
+    return {"hit": {
+        "title": job.job_title,
+        "company": {"name": job.company},
+        "experience": job.experience,
+        "workType": job.jobNature,
+        "location": {"displayName": job.location},
+        "compensation": job.salary,
+        "viewJobLink": job.apply_link,
+        "description": job.raw_description
+    }}
+
+def _jsearch_job(job) -> Dict[str, Any]:
+    city, _, country = job.location.partition(", ")
+    return {
+        "job_title": job.job_title,
+        "employer_name": job.company,
+        "job_employment_type": job.jobNature,
+        "job_city": city,
+        "job_country": country,
+        "job_apply_link": job.apply_link,
+        "job_description": job.raw_description
+    }
+
+def create_stub_providers_app(latency: float = 0.2, jitter: float = 0.05, failure_rate: float = 0.0,
+                              jobs_per_page: int = 10, pages: int = 3, pool_size: int = 500,
+                              seed: int = 11) -> FastAPI:
+    """
+    Build one server imitating the LinkedIn (POST /linkedin), Indeed (GET /indeed) and
+    JSearch (GET /jsearch) RapidAPI endpoints. Each page holds `jobs_per_page` jobs
+    drawn deterministically from a shared corpus, so providers overlap like real ones;
+    pages past `pages` are empty. Replies take `latency` ± `jitter` seconds and fail
+    with a 503 at `failure_rate`. Calls per provider are counted in app.state.calls.
+    """
+    app = FastAPI()
+    app.state.calls = {"linkedin": 0, "indeed": 0, "jsearch": 0}
+    pool = make_corpus(pool_size, seed=seed)
+    rng = random.Random(seed)
+
+    async def respond(provider: str, query: str, page: int):
+        app.state.calls[provider] += 1
+        await asyncio.sleep(max(0.0, latency + rng.uniform(-jitter, jitter)))
+        if rng.random() < failure_rate:
+            return None
+        if page > pages:
+            return []
+        offset = _page_offset(provider, query, page, len(pool))
+        return [pool[(offset + i) % len(pool)] for i in range(jobs_per_page)]
+
+    def unavailable() -> Response:
+        return Response(status_code=503, headers={"Retry-After": "0"})
+
+    @app.post("/linkedin")
+    async def linkedin(request: Request):
+        body = await request.json()
+        jobs = await respond("linkedin", f"{body.get('search_terms')}|{body.get('location')}", int(body.get("page", 1)))
+        return unavailable() if jobs is None else {"data": [_linkedin_job(job) for job in jobs]}
+
+    @app.get("/indeed")
+    async def indeed(query: str = "", location: str = "", page: int = 1):
+        jobs = await respond("indeed", f"{query}|{location}", page)
+        return unavailable() if jobs is None else {"hits": [_indeed_job(job) for job in jobs]}
+
+    @app.get("/jsearch")
+    async def jsearch(query: str = "", page: int = 1):
+        jobs = await respond("jsearch", query, page)
+        return unavailable() if jobs is None else {"data": [_jsearch_job(job) for job in jobs]}
+
+    return app
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from benchmarks.servers import free_port
+
+class ConnectionCountingServer:
+    """
+    A tiny HTTP/1.1 keep-alive server that answers every request with the same
+    JSON body and counts how many TCP connections clients opened. The first
+    `fail_first` requests (all of them if negative) get `fail_status` instead,
+    with a Retry-After header when `retry_after` is set.
+    """
+
+    def __init__(self, body: dict, latency: float = 0.0, fail_status: int = 503,
+                 fail_first: int = 0, retry_after: Optional[str] = None):
+        self.payload = json.dumps(body).encode("utf-8")
+        self.latency = latency
+        self.fail_status = fail_status
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.connections = 0
+        self.requests = 0
+
+    def _response(self) -> bytes:
+        if self.fail_first < 0 or self.requests <= self.fail_first:
+            extra = f"Retry-After: {self.retry_after}\r\n" if self.retry_after else ""
+            return (f"HTTP/1.1 {self.fail_status} Error\r\n{extra}Content-Length: 0\r\n\r\n").encode("latin-1")
+        return (
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(self.payload)}\r\n\r\n".encode("latin-1")
+            + self.payload
+        )
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = head.decode("latin-1").lower()
+                length = 0
+                for line in headers.split("\r\n"):
+                    if line.startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                writer.write(self._response())
+                await writer.drain()
+                if "connection: close" in headers:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+@contextmanager
+def run_counting_server(server: ConnectionCountingServer):
+    """Serve `server` on a background event loop and yield its base URL"""
+    port = free_port()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    stopping = asyncio.Event()
+
+    async def serve():
+        tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", port)
+        started.set()
+        async with tcp_server:
+            await stopping.wait()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        loop.call_soon_threadsafe(stopping.set)
+        thread.join()
@@ -0,0 +1,43 @@
+import pytest
+
+from app.models.job_models import JobRecord
+from app.services.dedup import DedupIndex, deduplicate_jobs, normalize_link
+
+def make_job(location: str, apply_link: str, title: str = "Senior Python Developer", company: str = "Acme Corp",
+             source: str = "LinkedIn") -> JobRecord:
+    return JobRecord(job_title=title, company=company, experience="N/A", jobNature="Full-time",
+                     location=location, salary="Not specified", apply_link=apply_link, source=source)
+
+@pytest.mark.parametrize("first, second, merged", [
+    # Same posting from two providers
+    (make_job("Lahore, Pakistan", "https://linkedin.com/jobs/1"),
+     make_job("Lahore", "https://indeed.com/viewjob?jk=9", source="Indeed"), True),
+    (make_job("Lahore", "https://linkedin.com/jobs/1"),
+     make_job("Lahore", "https://indeed.com/viewjob?jk=9", title="SENIOR PYTHON DEVELOPER -", source="Indeed"), True),
+    (make_job("Lahore", "https://linkedin.com/jobs/1"),
+     make_job("N/A", "https://indeed.com/viewjob?jk=9", source="Indeed"), True),
+    (make_job("Lahore", "https://www.linkedin.com/jobs/1/?utm_source=x"),
+     make_job("Islamabad", "https://linkedin.com/jobs/1"), True),
+    # One company hiring for the same title in several places
+    (make_job("Lahore", "https://linkedin.com/jobs/1"), make_job("Islamabad", "https://linkedin.com/jobs/2"), False),
+    (make_job("Remote", "https://linkedin.com/jobs/1"), make_job("Berlin", "https://linkedin.com/jobs/2"), False),
+    # Same title at another company
+    (make_job("Lahore", "https://linkedin.com/jobs/1"),
+     make_job("Lahore", "https://linkedin.com/jobs/2", company="Globex"), False),
+    # Without a company only the link can match
+    (make_job("Lahore", "https://linkedin.com/jobs/1", company="N/A"),
+     make_job("Lahore", "https://linkedin.com/jobs/2", company="N/A"), False),
+])
+def test_dedup_index(first, second, merged):
+    index = DedupIndex()
+    assert index.add(first) is None
+    assert (index.add(second) is first) is merged
+
+def test_deduplicate_jobs_keeps_every_city():
+    jobs = [make_job(city, f"https://linkedin.com/jobs/{i}") for i, city in enumerate(["Lahore", "Islamabad", "Remote"])]
+    jobs.append(make_job("Lahore", "https://indeed.com/viewjob?jk=9", source="Indeed"))
+    assert deduplicate_jobs(jobs) == jobs[:3]
+
+def test_normalize_link_drops_only_tracking_params():
+    assert normalize_link("http://www.Indeed.com/viewjob/?jk=abc&utm_source=x&trk=y#top") == \
+        "https://indeed.com/viewjob?jk=abc"
@@ -0,0 +1,45 @@
+import asyncio
+import os
+
+import numpy as np
+
+from app.services.embedding_service import EmbeddingCache
+
+def vectors(count: int, dimensions: int = 4, offset: int = 0) -> np.ndarray:
+    return np.arange(offset, offset + count * dimensions, dtype=np.float32).reshape(count, dimensions)
+
+def test_vectors_survive_a_restart(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    asyncio.run(cache.put_many(["a", "b"], vectors(2)))
+
+    reopened = EmbeddingCache(str(tmp_path))
+    found = asyncio.run(reopened.get_many(["b", "missing", "a"]))
+    np.testing.assert_array_equal(found[0], vectors(2)[1])
+    assert found[1] is None
+    np.testing.assert_array_equal(found[2], vectors(2)[0])
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+def test_a_second_process_sees_rows_appended_by_the_first(tmp_path):
+    first, second = EmbeddingCache(str(tmp_path)), EmbeddingCache(str(tmp_path))
+    asyncio.run(first.put_many(["a"], vectors(1)))
+    asyncio.run(second.put_many(["b"], vectors(1, offset=100)))
+    assert all(vector is not None for vector in asyncio.run(first.get_many(["a", "b"])))
+    assert all(vector is not None for vector in asyncio.run(second.get_many(["a", "b"])))
+
+def test_cache_starts_over_once_full(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=3)
+    asyncio.run(cache.put_many(["a", "b", "c"], vectors(3)))
+    asyncio.run(cache.put_many(["d"], vectors(1, offset=50)))
+
+    assert cache.stats()["entries"] == 1
+    assert os.path.getsize(tmp_path / "vectors.f32") <= 3 * 4 * 4
+    found = asyncio.run(EmbeddingCache(str(tmp_path), max_entries=3).get_many(["a", "d"]))
+    assert found[0] is None
+    np.testing.assert_array_equal(found[1], vectors(1, offset=50)[0])
+
+def test_a_new_model_replaces_vectors_of_other_dimensions():
+    cache = EmbeddingCache()
+    asyncio.run(cache.put_many(["a"], vectors(1, dimensions=4)))
+    asyncio.run(cache.put_many(["b"], vectors(1, dimensions=8)))
+    found = asyncio.run(cache.get_many(["a", "b"]))
+    assert found[0] is None and found[1].shape == (8,)
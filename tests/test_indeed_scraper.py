@@ -0,0 +1,45 @@
+import threading
+import time
+
+from app.services import indeed_scraper
+from app.services.indeed_scraper import DriverPool, IndeedScraperProvider
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+def test_waiter_launches_a_browser_once_a_failed_launch_frees_its_slot(monkeypatch):
+    launches = []
+
+    def setup_driver():
+        launches.append(threading.current_thread().name)
+        if len(launches) == 1:
+            time.sleep(0.2)  # The first launch fails while a second caller is waiting
+            return None
+        return FakeDriver()
+
+    monkeypatch.setattr(indeed_scraper, "setup_driver", setup_driver)
+    pool = DriverPool(1, wait_seconds=5)
+    results = {}
+    first = threading.Thread(target=lambda: results.update(first=pool.acquire()), name="first")
+    first.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    second = pool.acquire()
+    first.join()
+
+    assert results["first"] is None
+    assert isinstance(second, FakeDriver)
+    assert time.monotonic() - started < 2
+    assert pool._created == 1
+
+def test_acquire_gives_up_after_its_wait(monkeypatch):
+    monkeypatch.setattr(indeed_scraper, "setup_driver", FakeDriver)
+    pool = DriverPool(1, wait_seconds=0.2)
+    assert isinstance(pool.acquire(), FakeDriver)
+    started = time.monotonic()
+    assert pool.acquire() is None
+    assert 0.2 <= time.monotonic() - started < 1.5
+
+def test_scraper_has_its_own_source():
+    assert IndeedScraperProvider.source != "Indeed"
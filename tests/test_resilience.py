@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.resilience import CircuitOpenError, Upstream
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://upstream.test/jobs")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+@pytest.fixture
+def upstream(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_RESET_SECONDS", 0.05)
+    return Upstream("test", rate=0, burst=1)
+
+def call(upstream: Upstream, error: Exception):
+    async def request():
+        raise error
+    with pytest.raises(type(error)):
+        asyncio.run(upstream.call(request))
+
+def test_non_retryable_error_does_not_reset_failures(upstream):
+    call(upstream, http_error(503))
+    call(upstream, http_error(404))
+    assert upstream.breaker.failures == 1
+    call(upstream, http_error(503))
+    assert upstream.breaker.state == "open"
+
+def test_non_retryable_error_in_a_half_open_trial_keeps_the_circuit_open(upstream):
+    call(upstream, http_error(503))
+    call(upstream, http_error(503))
+    with pytest.raises(CircuitOpenError):
+        call(upstream, http_error(503))
+    asyncio.run(asyncio.sleep(0.06))
+
+    call(upstream, ValueError("bug in the caller"))
+    assert upstream.breaker.state == "half_open"
+    assert upstream.breaker.failures == 2
+    # The trial slot was given back, so the next call is the new trial
+    call(upstream, http_error(503))
+    assert upstream.breaker.state == "open"
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.config import settings
+from app.models.job_models import JobRecord
+from app.services.score_cache import ScoreCache, make_score_key
+
+def make_job(index: int) -> JobRecord:
+    return JobRecord(job_title=f"Python Developer {index}", company="Acme", experience="N/A", jobNature="Remote",
+                     location="Lahore", salary="Not specified", apply_link=f"https://example.com/jobs/{index}",
+                     source="LinkedIn", raw_description="Build APIs with FastAPI")
+
+def test_key_changes_with_the_scoring_settings(monkeypatch):
+    job = make_job(0)
+    key = make_score_key(job, "python")
+    assert make_score_key(make_job(0), "Python ") == key
+    changes = {
+        "OPENAI_MODEL": "gpt-4o-mini",
+        "PROMPT_COMPACTION_ENABLED": not settings.PROMPT_COMPACTION_ENABLED,
+        "PROMPT_DESCRIPTION_TOKEN_BUDGET": settings.PROMPT_DESCRIPTION_TOKEN_BUDGET + 1
+    }
+    for name, value in changes.items():
+        with monkeypatch.context() as patch:
+            patch.setattr(settings, name, value)
+            assert make_score_key(job, "python") != key
+
+def test_disk_tier_serves_scores_after_the_memory_tier_is_lost(tmp_path):
+    path = str(tmp_path / "scores.db")
+    keys = [make_score_key(make_job(index), "python") for index in range(3)]
+    writer = ScoreCache(max_entries=10, ttl_seconds=60, db_path=path)
+    asyncio.run(writer.set_many([
+        (key, {"relevance_score": 80.0 + index, "is_relevant": True}) for index, key in enumerate(keys[:2])
+    ]))
+
+    reader = ScoreCache(max_entries=10, ttl_seconds=60, db_path=path)
+    results = asyncio.run(reader.get_many([keys[0], None, keys[1], keys[2]]))
+    assert results == [{"relevance_score": 80.0, "is_relevant": True}, None,
+                       {"relevance_score": 81.0, "is_relevant": True}, None]
+    assert (reader.hits, reader.misses, reader.disk_hits) == (2, 1, 2)
+
+    # Now in memory, so no disk read is needed
+    asyncio.run(reader.get_many([keys[0]]))
+    assert (reader.hits, reader.disk_hits) == (3, 2)
+
+def test_expired_scores_are_misses(tmp_path):
+    cache = ScoreCache(max_entries=10, ttl_seconds=-1, db_path=str(tmp_path / "scores.db"))
+    key = make_score_key(make_job(0), "python")
+    asyncio.run(cache.set_many([(key, {"relevance_score": 90.0, "is_relevant": True})]))
+    assert asyncio.run(cache.get_many([key])) == [None]
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.job_models import JobRecord, JobSearchRequest, dump_jobs, load_jobs
+from app.services import search_sessions
+from app.services.search_sessions import SearchSession
+
+def make_job(index: int, **values) -> JobRecord:
+    return JobRecord(
+        job_title=f"Python Developer {index}", company=f"Company {index}", experience="2 years",
+        jobNature="Remote", location="Lahore", salary="PKR 200,000 per month",
+        apply_link=f"https://example.com/jobs/{index}", source="LinkedIn",
+        raw_description=f"Build APIs with FastAPI ({index})", **values
+    )
+
+def make_session() -> SearchSession:
+    search_request = JobSearchRequest(position="Python Developer", experience="2 years", salary="",
+                                      jobNature="Remote", location="Lahore", skills="FastAPI", limit=2)
+    session = SearchSession("abc123", search_request, [make_job(0), make_job(1)], ["Indeed"])
+    session.served = [make_job(2, relevance_score=91.0, salary_min=200000.0, salary_max=200000.0,
+                               salary_currency="PKR", salary_period="month", experience_min_years=2.0)]
+    session.pending = [make_job(3, relevance_score=75.5)]
+    session.scored = 4
+    session.relevant = 2
+    return session
+
+def test_session_round_trips_through_dumps_and_loads():
+    session = make_session()
+    loaded = SearchSession.loads(session.id, session.dumps())
+
+    assert loaded.id == session.id
+    assert loaded.search_request == session.search_request
+    assert loaded.candidates == session.candidates
+    assert loaded.served == session.served
+    assert loaded.pending == session.pending
+    assert loaded.missing_sources == session.missing_sources
+    assert (loaded.scored, loaded.relevant) == (session.scored, session.relevant)
+    assert loaded.dumps() == session.dumps()
+
+def test_loaded_session_keeps_paging_where_it_left_off():
+    loaded = SearchSession.loads("abc123", make_session().dumps())
+    assert loaded.matches(loaded.search_request.model_copy(update={"cursor": "abc123.1", "limit": 5}))
+    assert loaded.has_more(1)
+
+def test_load_jobs_reads_rows_by_field_name():
+    row = dump_jobs([make_job(0, relevance_score=80.0)])[0]
+    # A row from before a field was added, and one with a field that no longer exists
+    del row["raw_description"]
+    row["removed_field"] = "ignored"
+
+    job = load_jobs([row])[0]
+    assert job.raw_description == ""
+    assert job.relevance_score == 80.0
+    assert job.apply_link == "https://example.com/jobs/0"
+
+class FakeScorer:
+    """
+    Stands in for filter_relevant_jobs: jobs with an even index are relevant (unless
+    `relevant` is off), scored higher the earlier they are. Only the first `per_call`
+    jobs of a chunk get a score, as if the deadline cut scoring short.
+    """
+
+    def __init__(self, per_call=None, relevant=True):
+        self.per_call = per_call
+        self.relevant = relevant
+        self.chunks = []
+
+    async def __call__(self, jobs, search_request, timeout=None, usage=None, scored=None):
+        self.chunks.append([job.apply_link for job in jobs])
+        relevant = []
+        for job in jobs[:self.per_call]:
+            index = int(job.apply_link.rsplit("/", 1)[1])
+            scored.append(job)
+            job.release_description()
+            if self.relevant and index % 2 == 0:
+                job.relevance_score = 100.0 - index
+                relevant.append(job)
+        return relevant
+
+    @property
+    def scored(self):
+        return sum(len(chunk) if self.per_call is None else min(len(chunk), self.per_call) for chunk in self.chunks)
+
+@pytest.fixture
+def scorer(monkeypatch):
+    monkeypatch.setattr(settings, "SCORING_BATCH_SIZE", 4)
+    monkeypatch.setattr(settings, "PREFILTER_TOP_K", 12)
+    fake = FakeScorer()
+    monkeypatch.setattr(search_sessions, "filter_relevant_jobs", fake)
+    return fake
+
+def new_session(count: int) -> SearchSession:
+    return SearchSession("abc123", make_session().search_request, [make_job(index) for index in range(count)], [])
+
+def indexes(jobs):
+    return [int(job.apply_link.rsplit("/", 1)[1]) for job in jobs]
+
+def test_pages_follow_on_across_offsets(scorer):
+    session = new_session(40)
+    first = asyncio.run(session.page(0, 3))
+    second = asyncio.run(session.page(3, 3))
+    assert indexes(first) == [0, 2, 4]
+    assert indexes(second) == [6, 8, 10]
+    # Going back serves the same page without scoring again
+    scored = scorer.scored
+    assert indexes(asyncio.run(session.page(0, 3))) == [0, 2, 4]
+    assert scorer.scored == scored
+    assert session.has_more(6)
+
+def test_chunks_are_sized_by_the_relevance_rate(scorer):
+    session = new_session(40)
+    asyncio.run(session.page(0, 3))
+    # No rate yet, so half are taken to be relevant: 3 / 0.5 rounded up to whole batches of 4
+    assert len(scorer.chunks[0]) == 8
+    assert session.scored == 8 and session.relevant == 4
+    assert len(session.pending) == 1
+
+@pytest.mark.parametrize("limit", [5, 20])
+def test_scoring_per_request_stays_within_the_budget(scorer, limit):
+    # Nothing relevant, so only the budget stops the request; the rest is left for later
+    scorer.relevant = False
+    session = new_session(100)
+    assert asyncio.run(session.page(0, limit)) == []
+    assert session.scored == scorer.scored == max(settings.PREFILTER_TOP_K, limit)
+    assert session.has_more(0)
+
+    asyncio.run(session.page(0, limit))
+    assert session.scored == 2 * max(settings.PREFILTER_TOP_K, limit)
+
+def test_jobs_the_deadline_cut_off_go_back_to_the_front(scorer):
+    scorer.per_call = 3
+    session = new_session(20)
+    page = asyncio.run(session.page(0, 10))
+
+    # Every call scored three jobs, so the loop kept going until the budget ran out
+    assert session.scored == scorer.scored == settings.PREFILTER_TOP_K
+    assert indexes(session.candidates) == list(range(settings.PREFILTER_TOP_K, 20))
+    assert all(job.raw_description for job in session.candidates)
+    assert indexes(page) == [0, 2, 4, 6, 8, 10]
+
+def test_scoring_stops_when_nothing_got_a_score(scorer):
+    scorer.per_call = 0
+    session = new_session(20)
+    assert asyncio.run(session.page(0, 5)) == []
+    assert len(scorer.chunks) == 1
+    assert session.scored == 0
+    assert indexes(session.candidates) == list(range(20))
+    assert all(job.raw_description for job in session.candidates)
+
+def test_has_more_ends_with_the_candidates(scorer):
+    session = new_session(6)
+    page = asyncio.run(session.page(0, 10))
+    assert indexes(page) == [0, 2, 4]
+    assert not session.candidates and not session.pending
+    assert not session.has_more(3)
+    assert session.has_more(2)
@@ -0,0 +1,53 @@
+import pytest
+
+from app.core.state_backend import _advance_bucket
+
+RATE = 10.0  # One token every 0.1s
+BURST = 5.0
+
+def reserve(tat, now):
+    return _advance_bucket(tat, now, RATE, BURST)
+
+def test_burst_is_served_without_waiting_then_callers_queue():
+    tat, waits = None, []
+    for _ in range(8):
+        tat, wait = reserve(tat, 0.0)
+        waits.append(wait)
+    assert waits == pytest.approx([0, 0, 0, 0, 0, 0.1, 0.2, 0.3])
+
+def test_steady_rate_never_waits():
+    tat = None
+    for step in range(50):
+        tat, wait = reserve(tat, step / RATE)
+        assert wait == 0
+
+def test_faster_than_rate_waits_grow_by_the_difference():
+    tat, waits = None, []
+    # Two calls per interval: the burst absorbs the excess for a while, then each
+    # call waits 0.05s longer than the one before
+    for step in range(12):
+        tat, wait = reserve(tat, step * 0.05)
+        waits.append(wait)
+    assert waits == pytest.approx([0] * 9 + [0.05, 0.1, 0.15])
+
+def test_idle_bucket_refills():
+    tat = None
+    for _ in range(5):
+        tat, _ = reserve(tat, 0.0)
+    assert reserve(tat, 0.0)[1] > 0
+    tat, wait = reserve(tat, 10.0)
+    assert wait == 0
+
+def test_pause_holds_back_the_next_caller_for_the_pause():
+    tat, wait = _advance_bucket(None, 0.0, RATE, BURST, pause=2.0)
+    assert wait == 0
+    tat, wait = reserve(tat, 0.0)
+    assert wait == pytest.approx(2.0)
+    assert reserve(tat, 2.0)[1] == pytest.approx(0.1)
+
+def test_pause_does_not_shorten_an_existing_backlog():
+    tat = None
+    for _ in range(30):
+        tat, _ = reserve(tat, 0.0)
+    paused, _ = _advance_bucket(tat, 0.0, RATE, BURST, pause=0.5)
+    assert paused == tat
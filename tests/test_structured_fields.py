@@ -0,0 +1,112 @@
+import pytest
+
+from app.core.config import settings
+from app.models.job_models import JobRecord, JobSearchRequest
+from app.services.structured_fields import (ExperienceRange, SalaryRange, SearchConstraints, experience_phrase,
+                                            parse_experience, parse_job_fields, parse_salary)
+
+@pytest.mark.parametrize("text, expected", [
+    ("70,000 PKR to 120,000 PKR", SalaryRange(70000, 120000, "PKR", None)),
+    ("$50K - $70K a year", SalaryRange(50000, 70000, "USD", "year")),
+    ("Up to Rs 90,000 per month", SalaryRange(None, 90000, "PKR", "month")),
+    ("From $60,000", SalaryRange(60000, None, "USD", None)),
+    ("80k+", SalaryRange(80000, None, None, None)),
+    ("$25/hr", SalaryRange(25, 25, "USD", "hour")),
+    ("£30k–£40k per annum", SalaryRange(30000, 40000, "GBP", "year")),
+    ("Rs. 1,20,000 - 2 lakh", SalaryRange(120000, 200000, "PKR", None)),
+    ("Salary: 50,000 - 80,000 PKR monthly", SalaryRange(50000, 80000, "PKR", "month")),
+    # The unit on the upper end applies to both
+    ("70-90k per month", SalaryRange(70000, 90000, None, "month")),
+    ("₹8-12 lakhs per annum", SalaryRange(800000, 1200000, "INR", "year")),
+    # Numbers alone are taken as the salary
+    ("100000", SalaryRange(100000, 100000, None, None)),
+    ("50000 - 70000", SalaryRange(50000, 70000, None, None)),
+    # Only the amount next to a currency counts
+    ("3 years experience, $90k", SalaryRange(90000, 90000, "USD", None)),
+    ("$120k base, 401k match", SalaryRange(120000, 120000, "USD", None)),
+    ("Competitive, 401k match", None),
+    ("Competitive, 401(k) and 403b", None),
+    ("Competitive salary, 5 days a week", None),
+    ("Negotiable", None),
+    ("Not specified", None),
+    ("", None),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+@pytest.mark.parametrize("text, description, expected", [
+    ("2 years", "", ExperienceRange(2, 2)),
+    ("3+ yrs", "", ExperienceRange(3, None)),
+    ("2-5 years", "", ExperienceRange(2, 5)),
+    ("1 to 3 years", "", ExperienceRange(1, 3)),
+    ("36 months", "", ExperienceRange(3, 3)),
+    ("Minimum 4 years", "", ExperienceRange(4, None)),
+    ("Fresh graduates welcome", "", ExperienceRange(0, 1)),
+    ("Entry-level", "", ExperienceRange(0, 1)),
+    ("N/A", "You need 5+ years of professional experience with Django.", ExperienceRange(5, None)),
+    # A duration not followed closely by "experience" is about something else
+    ("N/A", "We have been in business for 10 years.", None),
+    # Free text in the field itself: the duration tied to "experience" wins
+    ("Serving clients for 15 years. We need a React developer with 2 years of experience.", "",
+     ExperienceRange(2, 2)),
+    ("", "", None),
+])
+def test_parse_experience(text, description, expected):
+    assert parse_experience(text, description) == expected
+
+@pytest.mark.parametrize("snippet, expected", [
+    ("Serving clients for 15 years. We need a React developer with 2 years of experience.", "2 years of experience"),
+    ("Minimum 3 years of relevant experience required.", "minimum 3 years of relevant experience"),
+    ("Join our team of 50 engineers.", ""),
+])
+def test_experience_phrase(snippet, expected):
+    assert experience_phrase(snippet) == expected
+
+def make_request(salary: str = "", experience: str = "") -> JobSearchRequest:
+    return JobSearchRequest(position="Python Developer", experience=experience, salary=salary,
+                            jobNature="Remote", location="Lahore", skills="")
+
+def make_job(salary: str = "Not specified", experience: str = "N/A") -> JobRecord:
+    return parse_job_fields(JobRecord(
+        job_title="Python Developer", company="Acme", experience=experience, jobNature="Remote",
+        location="Lahore", salary=salary, apply_link="https://example.com/jobs/1", source="LinkedIn"
+    ))
+
+@pytest.fixture(autouse=True)
+def constraint_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SALARY_FILTER_TOLERANCE", 0.1)
+    monkeypatch.setattr(settings, "SALARY_DEFAULT_PERIOD", "")
+    monkeypatch.setattr(settings, "EXPERIENCE_FILTER_TOLERANCE_YEARS", 1.0)
+
+@pytest.mark.parametrize("wanted_salary, wanted_experience, job_salary, job_experience, allowed", [
+    # No constraints in the request
+    ("", "", "PKR 10,000 per month", "10 years", True),
+    # Salary: the job's upper end is compared with the requested minimum, less the tolerance
+    ("PKR 100,000 per month", "", "PKR 50,000 - 70,000 per month", "N/A", False),
+    ("PKR 100,000 per month", "", "PKR 80,000 - 120,000 per month", "N/A", True),
+    ("PKR 100,000 per month", "", "PKR 92,000 per month", "N/A", True),
+    ("PKR 100,000 per month", "", "PKR 85,000 per month", "N/A", False),
+    # Periods are converted to yearly amounts before comparing
+    ("$120k a year", "", "$60/hr", "N/A", True),
+    ("$120k a year", "", "$30/hr", "N/A", False),
+    # Unknown salaries, other currencies and a missing period on one side never fail a job
+    ("PKR 100,000 per month", "", "Not specified", "N/A", True),
+    ("PKR 100,000 per month", "", "$500 per month", "N/A", True),
+    ("PKR 100,000 per month", "", "PKR 50,000", "N/A", True),
+    ("PKR 100,000", "", "PKR 50,000", "N/A", False),
+    # An "up to" request has no minimum to enforce
+    ("Up to PKR 100,000 per month", "", "PKR 10,000 per month", "N/A", True),
+    # Experience: the job's minimum may exceed the requested maximum by the tolerance
+    ("", "2 years", "Not specified", "3 years", True),
+    ("", "2 years", "Not specified", "4-6 years", False),
+    ("", "1-3 years", "Not specified", "5+ years", False),
+    ("", "3+ years", "Not specified", "10 years", True),
+    ("", "2 years", "Not specified", "N/A", True),
+    ("", "2 years", "Not specified",
+     "Serving clients for 15 years. We need a React developer with 2 years of experience.", True),
+    # Both constraints must hold
+    ("PKR 100,000 per month", "2 years", "PKR 150,000 per month", "6 years", False),
+])
+def test_search_constraints_allows(wanted_salary, wanted_experience, job_salary, job_experience, allowed):
+    constraints = SearchConstraints(make_request(wanted_salary, wanted_experience))
+    assert constraints.allows(make_job(job_salary, job_experience)) is allowed